@@ -29,7 +29,7 @@ from app.models import (
     user_shifts_m, notification_m, menu_m, role_right_m, shift_roster_m,
     week_day_m, job_description_m, subscription_plans_m, add_on_m,
     organization_add_on_m, payment_m, attendance_punch_m, leavetype_m,
-    attendance_summary_m, leaveconfig_m, leave_balance_m, test_report_m
+    attendance_summary_m, attendance_day_m, month_close_m, job_posting_counter_m, seed_version_m, email_outbox_m, leaveconfig_m, leave_balance_m, test_report_m
 )
 
 target_metadata = Base.metadata
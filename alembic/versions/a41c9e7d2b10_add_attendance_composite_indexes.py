@@ -0,0 +1,61 @@
+"""add attendance composite indexes
+
+Revision ID: a41c9e7d2b10
+Revises: f760e2dd300b
+Create Date: 2026-10-18 14:05:12.406311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41c9e7d2b10'
+down_revision: Union[str, Sequence[str], None] = 'f760e2dd300b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table → (index name, columns). Punch / permission / holiday tables are
+# created by metadata.create_all on some installs, so they are only indexed
+# when present.
+COMPOSITE_INDEXES = {
+    'attendance_punches': ('idx_attendance_punch_bio_date', ['bio_id', 'punch_date', 'punch_time']),
+    'leave_master': ('idx_leave_master_user_status_dates', ['user_id', 'status', 'start_date', 'end_date']),
+    'permissions': ('idx_permission_user_date_status', ['user_id', 'date', 'status']),
+    'holidays': ('idx_holiday_date', ['date']),
+}
+
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = _existing_tables()
+
+    for table, (name, columns) in COMPOSITE_INDEXES.items():
+        if table in tables:
+            op.create_index(name, table, columns, unique=False)
+
+    # Keep the latest summary per (user_id, month) before enforcing uniqueness
+    op.execute(
+        "DELETE FROM attendances WHERE id NOT IN ("
+        " SELECT keep_id FROM ("
+        "  SELECT MAX(id) AS keep_id FROM attendances GROUP BY user_id, month"
+        " ) AS keep_rows"
+        ")"
+    )
+    op.create_unique_constraint('uq_attendance_user_month', 'attendances', ['user_id', 'month'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_attendance_user_month', 'attendances', type_='unique')
+
+    tables = _existing_tables()
+    for table, (name, _) in COMPOSITE_INDEXES.items():
+        if table in tables:
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,31 @@
+"""add candidate skills fulltext index
+
+Revision ID: b7d3f5a1c268
+Revises: a4c9e2f7b813
+Create Date: 2026-10-18 20:41:09.733512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3f5a1c268'
+down_revision: Union[str, Sequence[str], None] = 'a4c9e2f7b813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Candidate search: MATCH(skills) AGAINST(...) needs a FULLTEXT index (MySQL only;
+    # other databases use the in-process index)
+    if op.get_bind().dialect.name == 'mysql':
+        op.create_index('ft_candidates_skills', 'candidates', ['skills'], unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'mysql':
+        op.drop_index('ft_candidates_skills', table_name='candidates')
@@ -0,0 +1,39 @@
+"""add job posting filter indexes
+
+Revision ID: c2e6a9d4f710
+Revises: b7d3f5a1c268
+Create Date: 2026-10-18 21:32:47.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e6a9d4f710'
+down_revision: Union[str, Sequence[str], None] = 'b7d3f5a1c268'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# GET /job-postings/filters: organization first, then the equality filter,
+# salary last for the min_salary range
+JOB_POSTING_INDEXES = {
+    'idx_job_postings_org_location': ['organization_id', 'location'],
+    'idx_job_postings_org_type_salary': ['organization_id', 'job_type', 'salary'],
+    'idx_job_postings_org_branch_salary': ['organization_id', 'branch_id', 'salary'],
+    'idx_job_postings_org_role_location': ['organization_id', 'job_description_id', 'location'],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, columns in JOB_POSTING_INDEXES.items():
+        op.create_index(name, 'job_postings', columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in JOB_POSTING_INDEXES:
+        op.drop_index(name, table_name='job_postings')
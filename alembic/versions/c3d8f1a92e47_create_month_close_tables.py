@@ -0,0 +1,69 @@
+"""create month close tables
+
+Revision ID: c3d8f1a92e47
+Revises: a41c9e7d2b10
+Create Date: 2026-10-18 15:32:08.771054
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d8f1a92e47'
+down_revision: Union[str, Sequence[str], None] = 'a41c9e7d2b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('month_close_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('organization_id', sa.Integer(), nullable=True),
+    sa.Column('branch_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('total_users', sa.Integer(), nullable=True),
+    sa.Column('processed_users', sa.Integer(), nullable=True),
+    sa.Column('total_shards', sa.Integer(), nullable=True),
+    sa.Column('completed_shards', sa.Integer(), nullable=True),
+    sa.Column('workers', sa.Integer(), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('created_by', sa.String(length=100), nullable=True),
+    sa.ForeignKeyConstraint(['branch_id'], ['branches.id'], ),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_month_close_jobs_id'), 'month_close_jobs', ['id'], unique=False)
+    op.create_table('month_close_shards',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('shard_no', sa.Integer(), nullable=False),
+    sa.Column('user_ids', sa.JSON(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=True),
+    sa.Column('attendance_seconds', sa.Float(), nullable=True),
+    sa.Column('payroll_seconds', sa.Float(), nullable=True),
+    sa.Column('payrolls_generated', sa.Integer(), nullable=True),
+    sa.Column('worker_pid', sa.Integer(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['month_close_jobs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_month_close_shards_id'), 'month_close_shards', ['id'], unique=False)
+    op.create_index('idx_month_close_shard_job_status', 'month_close_shards', ['job_id', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_month_close_shard_job_status', table_name='month_close_shards')
+    op.drop_index(op.f('ix_month_close_shards_id'), table_name='month_close_shards')
+    op.drop_table('month_close_shards')
+    op.drop_index(op.f('ix_month_close_jobs_id'), table_name='month_close_jobs')
+    op.drop_table('month_close_jobs')
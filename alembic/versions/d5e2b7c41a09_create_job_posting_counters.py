@@ -0,0 +1,49 @@
+"""create job posting counters
+
+Revision ID: d5e2b7c41a09
+Revises: c3d8f1a92e47
+Create Date: 2026-10-18 17:12:40.208915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e2b7c41a09'
+down_revision: Union[str, Sequence[str], None] = 'c3d8f1a92e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('job_posting_counters',
+    sa.Column('job_posting_id', sa.Integer(), nullable=False),
+    sa.Column('total_candidates', sa.Integer(), nullable=False),
+    sa.Column('pending', sa.Integer(), nullable=False),
+    sa.Column('accepted', sa.Integer(), nullable=False),
+    sa.Column('rejected', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.ForeignKeyConstraint(['job_posting_id'], ['job_postings.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('job_posting_id')
+    )
+
+    # Backfill: one row per posting, candidates counted once
+    op.execute("""
+        INSERT INTO job_posting_counters (job_posting_id, total_candidates, pending, accepted, rejected)
+        SELECT jp.id,
+               COUNT(c.id),
+               COALESCE(SUM(CASE WHEN c.status = 'Pending' THEN 1 ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN c.status = 'Accepted' THEN 1 ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN c.status = 'Rejected' THEN 1 ELSE 0 END), 0)
+        FROM job_postings jp
+        LEFT JOIN candidates c ON c.job_posting_id = jp.id
+        GROUP BY jp.id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('job_posting_counters')
@@ -0,0 +1,53 @@
+"""add attendance punch unique key
+
+Revision ID: d9a3b6e5c1f4
+Revises: c2e6a9d4f710
+Create Date: 2026-10-19 10:12:38.540917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a3b6e5c1f4'
+down_revision: Union[str, Sequence[str], None] = 'c2e6a9d4f710'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Bulk ingest inserts with IGNORE / ON CONFLICT DO NOTHING against this key;
+# it replaces the non-unique index on the same columns
+PUNCH_KEY = ['bio_id', 'punch_date', 'punch_time']
+
+
+def _has_punch_table():
+    # Created by metadata.create_all on some installs
+    return 'attendance_punches' in sa.inspect(op.get_bind()).get_table_names()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _has_punch_table():
+        return
+
+    # Keep the first punch per key before enforcing uniqueness
+    op.execute(
+        "DELETE FROM attendance_punches WHERE id NOT IN ("
+        " SELECT keep_id FROM ("
+        "  SELECT MIN(id) AS keep_id FROM attendance_punches GROUP BY bio_id, punch_date, punch_time"
+        " ) AS keep_rows"
+        ")"
+    )
+    op.create_unique_constraint('uq_attendance_punch_bio_date_time', 'attendance_punches', PUNCH_KEY)
+    op.drop_index('idx_attendance_punch_bio_date', table_name='attendance_punches')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _has_punch_table():
+        return
+
+    op.create_index('idx_attendance_punch_bio_date', 'attendance_punches', PUNCH_KEY, unique=False)
+    op.drop_constraint('uq_attendance_punch_bio_date_time', 'attendance_punches', type_='unique')
@@ -0,0 +1,52 @@
+"""create attendance_days table
+
+Revision ID: f760e2dd300b
+Revises: 13d2d7cea878
+Create Date: 2026-10-18 10:12:40.118205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f760e2dd300b'
+down_revision: Union[str, Sequence[str], None] = '13d2d7cea878'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('attendance_days',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('present_days', sa.Integer(), nullable=True),
+    sa.Column('absent_days', sa.Integer(), nullable=True),
+    sa.Column('half_days', sa.Integer(), nullable=True),
+    sa.Column('holidays', sa.Integer(), nullable=True),
+    sa.Column('sundays', sa.Integer(), nullable=True),
+    sa.Column('leaves', sa.Integer(), nullable=True),
+    sa.Column('permissions', sa.Integer(), nullable=True),
+    sa.Column('total_work_minutes', sa.Integer(), nullable=True),
+    sa.Column('overtime_minutes', sa.Integer(), nullable=True),
+    sa.Column('late_minutes', sa.Integer(), nullable=True),
+    sa.Column('early_exit_minutes', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'date', name='uq_attendance_day_user_date')
+    )
+    op.create_index(op.f('ix_attendance_days_id'), 'attendance_days', ['id'], unique=False)
+    op.create_index('idx_attendance_day_user_month', 'attendance_days', ['user_id', 'month'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_attendance_day_user_month', table_name='attendance_days')
+    op.drop_index(op.f('ix_attendance_days_id'), table_name='attendance_days')
+    op.drop_table('attendance_days')
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime, date as DateType, time as TimeType
-from typing import Optional
+from typing import Any, List, Optional
 
 
 # ----------- Base Schema -----------
@@ -41,3 +41,24 @@ class AttendancePunchResponse(BaseModel):
     modified_at: Optional[datetime]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# ----------- Bulk Ingest Schemas -----------
+class PunchRejectedRow(BaseModel):
+    line: int
+    reason: str
+    row: Optional[Any] = None
+
+
+class PunchBulkIngestResponse(BaseModel):
+    rows_read: int
+    inserted: int
+    duplicates: int
+    already_exists: int
+    rejected: int
+    rejected_rows: List[PunchRejectedRow] = []
+    batches: int
+    summaries_refreshed: int
+    bulk_path: Optional[str] = None
+    elapsed_seconds: float
+    rows_per_sec: float
@@ -86,3 +86,16 @@ class AttendanceSummaryResponse(BaseModel):
     modified_by: Optional[str]
 
     model_config = {"from_attributes": True}
+
+
+# ---------------------------
+# Bulk Generate Response Schema
+# ---------------------------
+class AttendanceBulkGenerateResponse(BaseModel):
+    month: date
+    organization_id: Optional[int] = None
+    branch_id: Optional[int] = None
+
+    processed: int
+    created: int
+    updated: int
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, ConfigDict, EmailStr
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from typing import Dict, Literal, Optional, List
 from datetime import date, datetime
 
 
@@ -110,3 +110,52 @@ class CandidateResponse(CandidateBase):
     modified_by: Optional[str]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# ============================================================
+# DIRECT-TO-S3 RESUME UPLOAD
+# ============================================================
+class ResumeUploadRequest(BaseModel):
+    file_type: str  # pdf / jpg / png
+
+
+class ResumeUploadResponse(BaseModel):
+    url: str
+    fields: Dict[str, str]
+    key: str
+    upload_token: str
+    expires_in: int
+    max_bytes: int
+
+
+class ResumeConfirmRequest(BaseModel):
+    upload_token: str
+
+
+# ============================================================
+# BULK STATUS
+# ============================================================
+class CandidateBulkStatusRequest(BaseModel):
+    candidate_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    status: Literal["Accepted", "Rejected"]
+
+
+class CandidateBulkStatusResponse(BaseModel):
+    updated: int
+    unchanged: int
+    not_found: List[int]
+    emails_queued: int
+
+
+# ============================================================
+# SEARCH
+# ============================================================
+class CandidateSearchHit(CandidateResponse):
+    score: float = 0.0
+
+
+class CandidateSearchResponse(BaseModel):
+    total: int
+    backend: str
+    facets: Dict[str, Dict[str, int]]
+    results: List[CandidateSearchHit]
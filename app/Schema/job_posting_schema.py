@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import date, datetime
-from typing import Optional
+from typing import ClassVar, Optional, Tuple
 from enum import Enum
 
 
@@ -57,6 +57,36 @@ class JobPostingUpdate(BaseModel):
     approval_status: Optional[ApprovalStatus] = None
 
 
+# ---------------------------
+# RELATED (nested in responses)
+# ---------------------------
+class JobDescriptionBrief(BaseModel):
+    id: int
+    title: Optional[str] = None
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class BranchBrief(BaseModel):
+    id: int
+    name: str
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class OrganizationBrief(BaseModel):
+    id: int
+    name: str
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
 # ---------------------------
 # RESPONSE
 # ---------------------------
@@ -68,6 +98,13 @@ class JobPostingResponse(JobPostingBase):
     created_at: Optional[datetime]
     updated_at: Optional[datetime]
 
+    job_description: Optional[JobDescriptionBrief] = None
+    branch: Optional[BranchBrief] = None
+    organization: Optional[OrganizationBrief] = None
+
+    # Relationships above, loaded with the query (app/utils/query_loading.py)
+    eager_load: ClassVar[Tuple[str, ...]] = ("job_description", "branch", "organization")
+
     model_config = {
         "from_attributes": True
     }
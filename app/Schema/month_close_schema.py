@@ -0,0 +1,42 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import List, Optional
+
+
+# ---------------------------
+# Shard Report Schema
+# ---------------------------
+class MonthCloseShardReport(BaseModel):
+    shard_no: int
+    status: str
+    users: int
+    attempts: int
+
+    attendance_seconds: Optional[float] = None
+    payroll_seconds: Optional[float] = None
+    payrolls_generated: int = 0
+
+    worker_pid: Optional[int] = None
+    error: Optional[str] = None
+
+
+# ---------------------------
+# Job Report Schema
+# ---------------------------
+class MonthCloseJobResponse(BaseModel):
+    job_id: int
+    month: date
+    organization_id: Optional[int] = None
+    branch_id: Optional[int] = None
+
+    status: str
+    workers: int
+
+    total_users: int
+    processed_users: int
+    total_shards: int
+    completed_shards: int
+    progress: float
+    elapsed_seconds: Optional[float] = None
+
+    shards: List[MonthCloseShardReport] = []
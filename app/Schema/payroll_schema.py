@@ -57,3 +57,15 @@ class PayrollResponse(BaseModel):
     modified_by: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# ---------------- Bulk Attendance Payroll Response ----------------
+class PayrollAttendanceBulkResponse(BaseModel):
+    month: str
+    organization_id: Optional[int] = None
+    branch_id: Optional[int] = None
+
+    processed: int
+    created: int
+    updated: int
+    skipped: int
@@ -1,7 +1,7 @@
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
-from fastapi_mail import ConnectionConfig
 from pydantic import EmailStr, ConfigDict
 
 load_dotenv()
@@ -52,16 +52,31 @@ class Settings(BaseSettings):
 
 settings = Settings()
 
-# Email config
-mail_conf = ConnectionConfig(
-    MAIL_USERNAME=settings.EMAIL_USERNAME,
-    MAIL_PASSWORD=settings.EMAIL_PASSWORD,
-    MAIL_FROM=settings.EMAIL_FROM,
-    MAIL_PORT=settings.EMAIL_PORT,
-    MAIL_SERVER=settings.EMAIL_HOST,
-    MAIL_STARTTLS=True,
-    MAIL_SSL_TLS=False,
-    USE_CREDENTIALS=True,
-    VALIDATE_CERTS=True
-)
+
+# -------------------------------
+# EMAIL CONFIG (built on first use)
+# -------------------------------
+@lru_cache(maxsize=None)
+def get_mail_conf():
+    # fastapi_mail pulls in aiosmtplib / jinja2 → only pay for it when mail is sent
+    from fastapi_mail import ConnectionConfig
+
+    return ConnectionConfig(
+        MAIL_USERNAME=settings.EMAIL_USERNAME,
+        MAIL_PASSWORD=settings.EMAIL_PASSWORD,
+        MAIL_FROM=settings.EMAIL_FROM,
+        MAIL_PORT=settings.EMAIL_PORT,
+        MAIL_SERVER=settings.EMAIL_HOST,
+        MAIL_STARTTLS=True,
+        MAIL_SSL_TLS=False,
+        USE_CREDENTIALS=True,
+        VALIDATE_CERTS=True
+    )
+
+
+def __getattr__(name):
+    # `from app.config import mail_conf` keeps working, built lazily
+    if name == "mail_conf":
+        return get_mail_conf()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
  
\ No newline at end of file
@@ -1,6 +1,10 @@
 import os
-from sqlalchemy import create_engine
+import threading
+import time as clock
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,10 +13,131 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL is not set")
 
+# ======================================================
+# CONNECTION POOL SETTINGS (per process / uvicorn worker)
+# ======================================================
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))        # seconds waiting for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))      # below MySQL wait_timeout
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "False").lower() == "true"
+
+
+class PoolMetrics:
+    """Counters fed by pool events; read through snapshot()."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.overflow_checkouts = 0   # checkouts served beyond pool_size
+            self.invalidations = 0
+            self.timeouts = 0
+            self.waits = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.peak_in_use = 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def record_checkout(self, pool):
+        in_use = pool.checkedout() if hasattr(pool, "checkedout") else 0
+        overflow = pool.overflow() if hasattr(pool, "overflow") else 0
+        with self._lock:
+            self.checkouts += 1
+            self.peak_in_use = max(self.peak_in_use, in_use)
+            if overflow > 0:
+                self.overflow_checkouts += 1
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "pid": os.getpid(),
+                "pool_class": type(pool).__name__,
+                "pool_size": pool.size() if hasattr(pool, "size") else None,
+                "max_overflow": getattr(pool, "_max_overflow", None),
+                "in_use": pool.checkedout() if hasattr(pool, "checkedout") else None,
+                "idle": pool.checkedin() if hasattr(pool, "checkedin") else None,
+                "overflow": max(pool.overflow(), 0) if hasattr(pool, "overflow") else None,
+                "peak_in_use": self.peak_in_use,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "overflow_checkouts": self.overflow_checkouts,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_ms_total": round(self.wait_seconds_total * 1000, 3),
+                "wait_ms_avg": round(self.wait_seconds_total * 1000 / self.waits, 3) if self.waits else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            }
+
+
+def _timed_pool_class(base, metrics: PoolMetrics):
+    """
+    Pool subclass timing how long each checkout waits for a connection.
+    A class per engine, so pools recreated by dispose() keep reporting.
+    """
+    def _do_get(self):
+        began = clock.perf_counter()
+        try:
+            connection = base._do_get(self)
+        except PoolTimeoutError:
+            metrics.record_wait(clock.perf_counter() - began, timed_out=True)
+            raise
+        metrics.record_wait(clock.perf_counter() - began)
+        return connection
+
+    return type(f"Timed{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def pool_options(url: str, metrics: PoolMetrics, base_pool_class) -> dict:
+    # SQLite keeps SQLAlchemy's own pool choice (file vs :memory:)
+    if url.startswith("sqlite"):
+        return {"pool_pre_ping": DB_POOL_PRE_PING}
+    return {
+        "poolclass": _timed_pool_class(base_pool_class, metrics),
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def instrument_pool(sync_engine, metrics: PoolMetrics):
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        with metrics._lock:
+            metrics.connects += 1
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.record_checkout(sync_engine.pool)
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        with metrics._lock:
+            metrics.invalidations += 1
+
+
+pool_metrics = PoolMetrics("sync")
+
 engine = create_engine(
     DATABASE_URL,
-    pool_pre_ping=True,
+    **pool_options(DATABASE_URL, pool_metrics, QueuePool),
 )
+instrument_pool(engine, pool_metrics)
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -29,3 +154,180 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ======================================================
+# READ REPLICA (reporting / list-everything endpoints)
+# ======================================================
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+READ_REPLICA_MAX_LAG = int(os.getenv("READ_REPLICA_MAX_LAG", 30))            # seconds of tolerated staleness
+READ_REPLICA_CHECK_INTERVAL = int(os.getenv("READ_REPLICA_CHECK_INTERVAL", 5))  # seconds between health checks
+READ_REPLICA_CONNECT_TIMEOUT = int(os.getenv("READ_REPLICA_CONNECT_TIMEOUT", 2))  # seconds
+
+# Replication delay in seconds (NULL / no row → not a replica or not measurable)
+REPLICA_LAG_QUERIES = {
+    "mysql": "SHOW REPLICA STATUS",
+    "postgresql": "SELECT EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())",
+}
+
+read_pool_metrics = PoolMetrics("read")
+read_engine = None
+if READ_DATABASE_URL:
+    read_engine = create_engine(
+        READ_DATABASE_URL,
+        **pool_options(READ_DATABASE_URL, read_pool_metrics, QueuePool),
+        # A down replica must fail fast: the health probe runs on a request
+        connect_args=(
+            {} if READ_DATABASE_URL.startswith("sqlite")
+            else {"connect_timeout": READ_REPLICA_CONNECT_TIMEOUT}
+        ),
+    )
+    instrument_pool(read_engine, read_pool_metrics)
+
+_replica_state = {"checked_at": None, "available": False, "probing": False, "lag": None, "error": None}
+_replica_lock = threading.Lock()
+
+
+def replica_lag(connection):
+    query = REPLICA_LAG_QUERIES.get(connection.dialect.name)
+    if query is None:
+        return None
+    try:
+        result = connection.exec_driver_sql(query)
+        if connection.dialect.name == "mysql":
+            row = result.mappings().first()
+            if row is None:
+                return None
+            lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+            # NULL on a replica → replication stopped, staleness unbounded
+            return float("inf") if lag is None else lag
+        return result.scalar()
+    except Exception:
+        # e.g. missing REPLICATION CLIENT privilege: reachable, lag unknown
+        return None
+
+
+def _probe_replica():
+    try:
+        with read_engine.connect() as connection:
+            lag = replica_lag(connection)
+        available = lag is None or float(lag) <= READ_REPLICA_MAX_LAG
+        _replica_state.update(lag=lag, error=None)
+    except Exception as e:
+        available = False
+        _replica_state.update(lag=None, error=repr(e)[:500])
+    return available
+
+
+def replica_available() -> bool:
+    """
+    Replica reachable and not lagging more than READ_REPLICA_MAX_LAG.
+    Checked at most every READ_REPLICA_CHECK_INTERVAL seconds per process.
+
+    The lock only decides which request probes: that one connects (bounded
+    by READ_REPLICA_CONNECT_TIMEOUT), every other request meanwhile gets the
+    last known state instead of queueing behind a slow or dead replica.
+    """
+    if read_engine is None:
+        return False
+
+    with _replica_lock:
+        checked_at = _replica_state["checked_at"]
+        fresh = checked_at is not None and clock.monotonic() - checked_at < READ_REPLICA_CHECK_INTERVAL
+        if fresh or _replica_state["probing"]:
+            return _replica_state["available"]
+        _replica_state["probing"] = True
+
+    available = False
+    try:
+        available = _probe_replica()
+    finally:
+        with _replica_lock:
+            _replica_state.update(checked_at=clock.monotonic(), available=available, probing=False)
+    return available
+
+
+def _reject_writes(session, flush_context, instances):
+    if session.new or session.dirty or session.deleted:
+        raise RuntimeError("Read-only session (get_read_db): use get_db for writes")
+
+
+# ✅ Read-only counterpart of get_db — replica when healthy, else primary
+def get_read_db():
+    db = SessionLocal(bind=read_engine) if replica_available() else SessionLocal()
+    event.listen(db, "before_flush", _reject_writes)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# ======================================================
+# ASYNC ENGINE (for `async def` routes)
+# ======================================================
+# Same database, asyncio driver: mysql+pymysql → mysql+aiomysql, ...
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    scheme, rest = url.split("://", 1)
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+_async_engine = None
+_AsyncSessionLocal = None
+async_pool_metrics = PoolMetrics("async")
+
+
+def get_async_engine():
+    """Created on first use, so sync-only processes (CLI, workers) never need the async stack."""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        # Imported here: sqlalchemy.ext.asyncio requires greenlet at import time
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+        _async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            **pool_options(ASYNC_DATABASE_URL, async_pool_metrics, AsyncAdaptedQueuePool),
+        )
+        instrument_pool(_async_engine.sync_engine, async_pool_metrics)
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=_async_engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False,  # no implicit lazy refresh after commit
+        )
+    return _async_engine
+
+
+# ✅ Async counterpart of get_db — use ONLY in `async def` routes
+async def get_async_db():
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
+
+
+# ======================================================
+# POOL TELEMETRY
+# ======================================================
+def pool_status() -> dict:
+    """Pool counters of THIS process (each uvicorn worker has its own pools)."""
+    status = {"sync": pool_metrics.snapshot(engine.pool)}
+    if read_engine is not None:
+        status["read"] = read_pool_metrics.snapshot(read_engine.pool)
+        status["read"]["replica"] = {
+            "available": _replica_state["available"],
+            "lag_seconds": _replica_state["lag"],
+            "error": _replica_state["error"],
+        }
+    if _async_engine is not None:
+        status["async"] = async_pool_metrics.snapshot(_async_engine.sync_engine.pool)
+    return status
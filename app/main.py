@@ -8,15 +8,15 @@ from app.models import (user_m,role_m,organization_m,branch_m,menu_m,role_right_
     video_m,category_m,enrollment_m,Progress_m,QuizCheckpoint_m,QuizHistory_m,shift_m,user_shifts_m,shift_change_request_m,
     shift_roster_m,shift_roster_detail_m,attendance_punch_m,leavemaster_m,holiday_m,permission_m,
     salary_structure_m,formula_m,payroll_m,payroll_attendance_m,job_posting_m,job_description_m,candidate_m,
-    candidate_documents_m,notification_m,test_report_m,attendance_summary_m,leavetype_m,leaveconfig_m,leave_balance_m)
+    candidate_documents_m,notification_m,test_report_m,attendance_summary_m,attendance_day_m,month_close_m,job_posting_counter_m,seed_version_m,email_outbox_m,leavetype_m,leaveconfig_m,leave_balance_m)
 
 from app.routes import (auth_routes,role_routes,organization_routes,branch_routes,
     menu_routes,role_right_routes,department_routes,categorys_routes,course_routes,video_routes,
     enrollment_routes,progress_routes,quiz_checkpoint_routes,quiz_history_routes,shift_routes,shift_change_request_routes,
-    user_shifts_routes,shift_roster_routes,shift_roster_detail_routes,shift_summery_routes,attendance_punch_routes,
+    user_shifts_routes,shift_roster_routes,shift_roster_detail_routes,shift_summery_routes,attendance_punch_routes,attendance_punch_bulk_routes,
     leavemaster_routes,holiday_routes,permission_routes,salary_structure_routes,formula_routes,payroll_routes,
     payroll_attendance_routes,job_posting_routes,job_description_routes,candidate_routes,candidates_documents_routes,subscription_routes,
-    notification_routes,test_report_routes,attendance_summary_routes,leavetype_routes,leave_config_routes,leave_balance_routes)
+    notification_routes,test_report_routes,attendance_summary_routes,month_close_routes,metrics_routes,leavetype_routes,leave_config_routes,leave_balance_routes)
 
 from app.routes.admin_dashboard import user_routes
 from app.seeders.role_seeder import seed_roles
@@ -24,6 +24,7 @@ from app.seeders.menu_seeder import seed_menus
 from app.seeders.role_right_seeder import seed_role_rights
 from app.seeders.week_day_seeders import seed_weekdays
 from app.seeders.super_admin import seed_super_admin
+from app.seeders.startup_seeder import run_startup_seeding
 
 app = FastAPI(title="HRMS + LMS Backend")
 
@@ -31,6 +32,12 @@ app = FastAPI(title="HRMS + LMS Backend")
 def root():
     return {"status": "ok", "message": "FastAPI is running"}
 
+# Routers are registered eagerly on purpose: FastAPI matches requests and
+# builds the OpenAPI schema from the registered routes, so a router imported
+# on first use would 404 until then. The import cost is in the clients the
+# route modules used to build at import time (boto3, fastapi_mail), which are
+# lazy now (app.s3_helper.get_s3_client, app.config.get_mail_conf);
+# `python -m benchmarks.startup_profile` shows what is left.
 app.include_router(auth_routes.router)
 app.include_router(user_routes.router)
 app.include_router(role_routes.router)
@@ -58,6 +65,7 @@ app.include_router(notification_routes.router)
 app.include_router(shift_routes.router)
 app.include_router(shift_change_request_routes.router)
 app.include_router(attendance_punch_routes.router)
+app.include_router(attendance_punch_bulk_routes.router)
 app.include_router(attendance_summary_routes.router)
 app.include_router(leavetype_routes.router)
 app.include_router(leave_config_routes.router)
@@ -75,14 +83,18 @@ app.include_router(salary_structure_routes.router)
 app.include_router(formula_routes.router)
 app.include_router(payroll_routes.router)
 app.include_router(payroll_attendance_routes.router)
+app.include_router(month_close_routes.router)
+app.include_router(metrics_routes.router)
 app.include_router(test_report_routes.router)
 
 @app.on_event("startup")
 def on_startup():
-    Base.metadata.create_all(bind=engine)
-
-    seed_roles()
-    seed_menus()
-    seed_role_rights()
-    seed_super_admin()
-    seed_weekdays()
+    # Skipped once the database carries the current SEED_VERSION
+    run_startup_seeding(
+        lambda: Base.metadata.create_all(bind=engine),
+        seed_roles,
+        seed_menus,
+        seed_role_rights,
+        seed_super_admin,
+        seed_weekdays,
+    )
@@ -13,10 +13,15 @@ from app.models.payroll_m import Payroll
 from app.models.formula_m import Formula
 from app.models.permission_m import Permission
 from app.models.attendance_summary_m import Attendance
+from app.models.attendance_day_m import AttendanceDay
 from app.models.payroll_attendance_m import PayrollAttendance
+from app.models.month_close_m import MonthCloseJob, MonthCloseShard
+from app.models.seed_version_m import SeedVersion
+from app.models.email_outbox_m import EmailOutbox
 from app.models.candidate_documents_m import CandidateDocument
 from app.models.candidate_m import Candidate
 from app.models.job_posting_m import JobPosting
+from app.models.job_posting_counter_m import JobPostingCounter
 from app.models.job_description_m import JobDescription
 from app.models.leavemaster_m import LeaveMaster
 from app.models.shift_change_request_m import ShiftChangeRequest
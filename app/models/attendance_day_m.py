@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey, DateTime, func, UniqueConstraint, Index
+from app.database import Base
+
+
+class AttendanceDay(Base):
+    """
+    Contribution of ONE day to the monthly Attendance summary.
+    Kept so a change on a single date can update the summary by delta.
+    """
+    __tablename__ = "attendance_days"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    date = Column(Date, nullable=False)
+    month = Column(Date, nullable=False)  # first day of the month
+
+    present_days = Column(Integer, default=0)
+    absent_days = Column(Integer, default=0)
+    half_days = Column(Integer, default=0)
+    holidays = Column(Integer, default=0)
+    sundays = Column(Integer, default=0)
+    leaves = Column(Integer, default=0)
+    permissions = Column(Integer, default=0)
+
+    total_work_minutes = Column(Integer, default=0)
+    overtime_minutes = Column(Integer, default=0)
+    late_minutes = Column(Integer, default=0)
+    early_exit_minutes = Column(Integer, default=0)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_onupdate=func.now(), nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "date", name="uq_attendance_day_user_date"),
+        Index("idx_attendance_day_user_month", "user_id", "month"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Date, String, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, Date, String, ForeignKey, DateTime, func, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -35,3 +35,8 @@ class Attendance(Base):
     modified_by = Column(String(100), nullable=True)
 
     user = relationship("User", back_populates="monthly_attendance")
+
+    # One summary per user-month (target of the native upsert)
+    __table_args__ = (
+        UniqueConstraint("user_id", "month", name="uq_attendance_user_month"),
+    )
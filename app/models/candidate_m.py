@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, DateTime, func, Text
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, DateTime, func, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -62,3 +62,9 @@ class Candidate(Base):
     # Relationships
     job_posting = relationship("JobPosting", back_populates="candidates")
     documents = relationship("CandidateDocument", back_populates="candidate", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Candidate search (MySQL MATCH ... AGAINST); other databases use the
+        # in-process index, as in migration b7d3f5a1c268
+        Index("ft_candidates_skills", "skills", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, func
+from app.database import Base
+
+
+class EmailOutbox(Base):
+    """Outbound email, written in the same transaction as the change that triggers it."""
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # e.g. "candidate:12:status:0:pending:accepted:accepted_email.html"
+    # → one email per candidate status transition (see candidate_status_keys)
+    dedupe_key = Column(String(191), nullable=True, unique=True)
+    candidate_id = Column(Integer, ForeignKey("candidates.id", ondelete="SET NULL"), nullable=True)
+
+    to_email = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    html_body = Column(Text, nullable=False)
+
+    status = Column(String(20), nullable=False, default="pending")
+    # pending / sending / sent / failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_at = Column(DateTime(timezone=True), nullable=True)  # claimed by a worker
+    last_error = Column(Text, nullable=True)
+
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("idx_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
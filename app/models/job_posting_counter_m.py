@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, func
+from app.database import Base
+
+
+class JobPostingCounter(Base):
+    """
+    Materialized candidate counts per job posting (dashboard read model).
+    Maintained by Candidate ORM events in app/utils/job_dashboard_utils.py.
+    """
+    __tablename__ = "job_posting_counters"
+
+    job_posting_id = Column(Integer, ForeignKey("job_postings.id", ondelete="CASCADE"), primary_key=True)
+
+    total_candidates = Column(Integer, nullable=False, default=0)
+    pending = Column(Integer, nullable=False, default=0)
+    accepted = Column(Integer, nullable=False, default=0)
+    rejected = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, DateTime, func, Enum
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, DateTime, func, Enum, Index
 from sqlalchemy.orm import relationship
 from enum import Enum as PyEnum
 from app.database import Base
@@ -55,3 +55,11 @@ class JobPosting(Base):
     candidates = relationship("Candidate", back_populates="job_posting")
     organization = relationship("Organization", back_populates="job_postings")
     branch = relationship("Branch", back_populates="job_postings")
+
+    # Filter endpoint: org + location / job type / branch / role, salary as range
+    __table_args__ = (
+        Index("idx_job_postings_org_location", "organization_id", "location"),
+        Index("idx_job_postings_org_type_salary", "organization_id", "job_type", "salary"),
+        Index("idx_job_postings_org_branch_salary", "organization_id", "branch_id", "salary"),
+        Index("idx_job_postings_org_role_location", "organization_id", "job_description_id", "location"),
+    )
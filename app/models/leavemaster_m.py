@@ -1,6 +1,6 @@
 # app/models/leave_m.py
 
-from sqlalchemy import Column, Integer, String, Date, Boolean, ForeignKey, DateTime, Float
+from sqlalchemy import Column, Integer, String, Date, Boolean, ForeignKey, DateTime, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -42,4 +42,9 @@ class LeaveMaster(Base):
 
     # Relationships
     user = relationship("User", back_populates="leave_records")
-    leave_type = relationship("LeaveType") 
+    leave_type = relationship("LeaveType")
+
+    # Attendance lookups: user + status + date overlap
+    __table_args__ = (
+        Index("idx_leave_master_user_status_dates", "user_id", "status", "start_date", "end_date"),
+    )
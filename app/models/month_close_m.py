@@ -0,0 +1,61 @@
+from sqlalchemy import JSON, Column, Integer, String, Date, Float, Text, ForeignKey, DateTime, func, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+class MonthCloseJob(Base):
+    """One month-close run (attendance summaries → payroll) for an org / branch."""
+    __tablename__ = "month_close_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    month = Column(Date, nullable=False)  # first day of the month
+    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=True)
+    branch_id = Column(Integer, ForeignKey("branches.id"), nullable=True)
+
+    status = Column(String(20), default="pending")
+    # pending / running / completed / failed
+
+    total_users = Column(Integer, default=0)
+    processed_users = Column(Integer, default=0)
+    total_shards = Column(Integer, default=0)
+    completed_shards = Column(Integer, default=0)
+    workers = Column(Integer, default=1)
+
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_by = Column(String(100), nullable=True)
+
+    shards = relationship("MonthCloseShard", back_populates="job", order_by="MonthCloseShard.shard_no")
+
+
+class MonthCloseShard(Base):
+    """A slice of users processed by one worker; the unit of resume."""
+    __tablename__ = "month_close_shards"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    job_id = Column(Integer, ForeignKey("month_close_jobs.id"), nullable=False)
+    shard_no = Column(Integer, nullable=False)
+    user_ids = Column(JSON, nullable=False)
+
+    status = Column(String(20), default="pending")
+    # pending / running / done / failed
+    attempts = Column(Integer, default=0)
+
+    attendance_seconds = Column(Float, nullable=True)
+    payroll_seconds = Column(Float, nullable=True)
+    payrolls_generated = Column(Integer, default=0)
+    worker_pid = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    job = relationship("MonthCloseJob", back_populates="shards")
+
+    __table_args__ = (
+        Index("idx_month_close_shard_job_status", "job_id", "status"),
+    )
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, func
+from app.database import Base
+
+
+class SeedVersion(Base):
+    """Marker of the startup seeding applied to this database."""
+    __tablename__ = "seed_versions"
+
+    name = Column(String(50), primary_key=True)  # e.g. "startup"
+    version = Column(Integer, nullable=False)
+
+    seconds = Column(Float, nullable=True)       # duration of the seeding run
+    applied_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,52 @@
+# app/routes/attendance_punch_bulk_routes.py
+
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.database import get_db
+from app.models.user_m import User
+from app.schema.attendance_punch_schema import PunchBulkIngestResponse
+from app.utils.punch_ingest_utils import (
+    DEFAULT_BATCH_SIZE,
+    detect_format,
+    ingest_punches,
+)
+from app.dependencies import get_current_user
+from app.permission_dependencies import require_create_permission
+
+ATTENDANCE_MENU_ID = 44
+
+router = APIRouter(prefix="/attendance-punch", tags=["Attendance Punch"])
+
+
+# ----------------------------------------------------
+# BULK INGEST DEVICE DUMP (CSV / NDJSON)
+# ----------------------------------------------------
+@router.post(
+    "/bulk",
+    response_model=PunchBulkIngestResponse,
+    dependencies=[Depends(require_create_permission(ATTENDANCE_MENU_ID))]
+)
+def bulk_ingest_punches(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv | ndjson (defaults to file extension)"),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=50000),
+    refresh_summaries: bool = Query(True),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    try:
+        fmt = detect_format(file.filename, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # UploadFile is spooled to disk past 1MB → streamed, never read whole
+    return ingest_punches(
+        db,
+        file.file,
+        fmt=fmt,
+        batch_size=batch_size,
+        created_by=current_user.first_name,
+        refresh_summaries=refresh_summaries,
+    )
@@ -1,18 +1,27 @@
 from fastapi import (
-    APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks
+    APIRouter, Depends, HTTPException, Response, UploadFile, File, Form
 )
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import date, datetime
 from typing import Optional, List
 
-from app.database import get_db
+from app.database import get_db, get_async_db, get_read_db
+from app.utils.pagination import PageParams, paginate
+from app.utils.candidate_search import CandidateSearchParams, search_candidates
 from app.models.candidate_m import Candidate
 from app.models.job_posting_m import JobPosting
 from app.models.user_m import User
-from app.schema.candidate_schema import CandidateResponse
-from app.s3_helper import upload_file_to_s3
-from app.utils.email_ses import send_email_ses
-from app.utils.email_templates_utils import render_email
+from app.schema.candidate_schema import (
+    CandidateBulkStatusRequest, CandidateBulkStatusResponse, CandidateResponse, CandidateSearchHit,
+    CandidateSearchResponse, ResumeConfirmRequest, ResumeUploadRequest, ResumeUploadResponse
+)
+from app.services import s3_upload_service
+from app.services.resume_upload_service import resume_upload_service
+from app.services.email_outbox_service import candidate_status_keys, enqueue_email, normalize_status
+from app.utils.candidate_status_utils import STATUS_EMAILS, bulk_update_candidate_status, render_status_email
 from app.permission_dependencies import (
     require_view_permission,
     require_edit_permission
@@ -20,6 +29,34 @@ from app.permission_dependencies import (
 
 router = APIRouter(prefix="/candidates", tags=["Candidates"])
 MENU_ID = 61
+
+
+# ============================================================
+# 0️⃣ DIRECT-TO-S3 RESUME UPLOAD (presigned POST)
+# ============================================================
+@router.post("/resume-upload", response_model=ResumeUploadResponse)
+def create_resume_upload(payload: ResumeUploadRequest):
+    """Short-lived upload policy; send the returned upload_token to apply / confirm."""
+    return resume_upload_service.create_upload(payload.file_type)
+
+
+@router.post("/{candidate_id}/resume/confirm", response_model=CandidateResponse)
+async def confirm_resume_upload(
+    candidate_id: int,
+    payload: ResumeConfirmRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_edit_permission(MENU_ID))
+):
+    candidate = await db.get(Candidate, candidate_id)
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+
+    # boto3 head / copy / delete → worker thread, no file bytes involved
+    candidate.resume_url = await run_in_threadpool(resume_upload_service.confirm_upload, payload.upload_token)
+    await db.commit()
+    await db.refresh(candidate)
+    return candidate
+
 # ============================================================
 # 1️⃣ APPLY CANDIDATE (CREATE)
 # ============================================================
@@ -65,9 +102,10 @@ async def apply_candidate(
     pincode: Optional[str] = Form(None),
 
     resume: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db)
+    resume_upload_token: Optional[str] = Form(None),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    job = db.query(JobPosting).filter(JobPosting.id == job_posting_id).first()
+    job = await db.scalar(select(JobPosting.id).where(JobPosting.id == job_posting_id))
     if not job:
         raise HTTPException(status_code=404, detail="Job posting not found")
 
@@ -83,7 +121,13 @@ async def apply_candidate(
     # Safe last_ctc conversion
     last_ctc_value = int(last_ctc) if last_ctc not in ["", None, "null"] else None
 
-    resume_url = upload_file_to_s3(resume, "candidate_resumes") if resume else None
+    # Either uploaded directly to S3 beforehand (token) or streamed through us
+    if resume_upload_token:
+        resume_url = await run_in_threadpool(resume_upload_service.confirm_upload, resume_upload_token)
+    elif resume:
+        resume_url = await s3_upload_service.upload_file(resume, "candidate_resumes")
+    else:
+        resume_url = None
 
     candidate = Candidate(
         first_name=first_name,
@@ -123,8 +167,8 @@ async def apply_candidate(
     )
 
     db.add(candidate)
-    db.commit()
-    db.refresh(candidate)
+    await db.commit()
+    await db.refresh(candidate)
     return candidate
 
 
@@ -133,18 +177,42 @@ async def apply_candidate(
 # ============================================================
 @router.get("/", response_model=List[CandidateResponse])
 def get_all_candidates(
-    db: Session = Depends(get_db),
+    response: Response,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_view_permission(MENU_ID))
 ):
-    if current_user.role.name == "super_admin":
-        return db.query(Candidate).all()
-
-    return (
-        db.query(Candidate)
-        .join(JobPosting)
-        .filter(JobPosting.organization_id == current_user.organization_id)
-        .all()
-    )
+    query = db.query(Candidate)
+
+    if current_user.role.name != "super_admin":
+        query = query.join(JobPosting).filter(
+            JobPosting.organization_id == current_user.organization_id
+        )
+
+    return paginate(query, Candidate.id, page, response, CandidateResponse)
+
+
+# ============================================================
+# 2️⃣.1 SEARCH (skills keywords + facets)
+# ============================================================
+@router.get("/search", response_model=CandidateSearchResponse)
+def search_candidates_route(
+    params: CandidateSearchParams = Depends(),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_view_permission(MENU_ID))
+):
+    organization_id = None if current_user.role.name == "super_admin" else current_user.organization_id
+    result = search_candidates(db, params, organization_id)
+
+    # Hits re-read from the database, in rank order
+    rows = {c.id: c for c in db.query(Candidate).filter(Candidate.id.in_(result.ids))}
+    results = [
+        CandidateSearchHit.model_validate(rows[candidate_id]).model_copy(update={"score": score})
+        for candidate_id, score in zip(result.ids, result.scores)
+        if candidate_id in rows
+    ]
+
+    return {"total": result.total, "backend": result.backend, "facets": result.facets, "results": results}
 
 
 # ============================================================
@@ -212,22 +280,26 @@ async def update_candidate(
 
     resume: Optional[UploadFile] = File(None),
 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_edit_permission(MENU_ID))
 ):
-    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+    fields = {
+        field: value for field, value in locals().items()
+        if field not in ["candidate_id", "resume", "db", "current_user"] and value is not None
+    }
+
+    candidate = await db.get(Candidate, candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
 
     if resume:
-        candidate.resume_url = upload_file_to_s3(resume, "candidate_resumes")
+        candidate.resume_url = await s3_upload_service.upload_file(resume, "candidate_resumes")
 
-    for field, value in locals().items():
-        if field not in ["candidate_id", "resume", "db", "current_user"] and value is not None:
-            setattr(candidate, field, value)
+    for field, value in fields.items():
+        setattr(candidate, field, value)
 
-    db.commit()
-    db.refresh(candidate)
+    await db.commit()
+    await db.refresh(candidate)
     return candidate
 
 
@@ -256,27 +328,54 @@ def delete_candidate(
 async def update_candidate_status(
     candidate_id: int,
     new_status: str,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_edit_permission(MENU_ID))
 ):
-    if new_status not in ["Accepted", "Rejected"]:
+    if new_status not in STATUS_EMAILS:
         raise HTTPException(status_code=400, detail="Invalid status")
 
-    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+    candidate = await db.get(Candidate, candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
 
+    # Same status again (e.g. a retried request) → not a transition, no email
+    if normalize_status(candidate.status) == normalize_status(new_status):
+        return candidate
+
+    previous_status = candidate.status
     candidate.status = new_status
-    db.commit()
-    db.refresh(candidate)
 
-    subject = "🎉 You are selected!" if new_status == "Accepted" else "Application Update"
-    template = "accepted_email.html" if new_status == "Accepted" else "rejected_email.html"
+    subject, template = STATUS_EMAILS[new_status]
+    html_body = render_status_email(candidate, new_status)
 
-    html_body = render_email(template, {
-        "candidate_name": f"{candidate.first_name} {candidate.last_name}"
-    })
+    # Keyed on this transition: concurrent copies of it queue one email
+    keys = await db.run_sync(candidate_status_keys, [(candidate.id, previous_status, new_status, template)])
 
-    background_tasks.add_task(send_email_ses, subject, html_body, candidate.email)
+    # Queued in the same commit as the status; sent by the outbox worker
+    await db.run_sync(
+        enqueue_email,
+        candidate.email,
+        subject,
+        html_body,
+        dedupe_key=keys[candidate.id],
+        candidate_id=candidate.id,
+    )
+
+    await db.commit()
+    await db.refresh(candidate)
     return candidate
+
+
+# ============================================================
+# 8️⃣ BULK STATUS + EMAILS
+# ============================================================
+@router.post("/status/bulk", response_model=CandidateBulkStatusResponse)
+async def bulk_update_candidates_status(
+    payload: CandidateBulkStatusRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_edit_permission(MENU_ID))
+):
+    """One UPDATE for all candidates, templates rendered once, emails queued as one batch."""
+    result = await db.run_sync(bulk_update_candidate_status, payload.candidate_ids, payload.status)
+    await db.commit()
+    return result
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.utils.pagination import PageParams, paginate
+from app.utils.job_dashboard_utils import job_dashboard_rows
+from app.utils.job_posting_cache import JobFilterKey, filter_key, job_filter_cache, matching_locations
+from app.utils.query_loading import get_for_response, with_loaders
 from app.models.job_posting_m import JobPosting, JobType
-from app.models.candidate_m import Candidate
 from app.models.user_m import User
 
 from app.schema.job_posting_schema import (
@@ -78,9 +81,8 @@ def create_job_posting(
 
     db.add(job)
     db.commit()
-    db.refresh(job)
 
-    return JobPostingResponse.model_validate(job)
+    return JobPostingResponse.model_validate(get_for_response(db, JobPosting, job.id, JobPostingResponse))
 
 
 # ------------------------------------------------------
@@ -88,6 +90,8 @@ def create_job_posting(
 # ------------------------------------------------------
 @router.get("/", response_model=List[JobPostingResponse])
 def get_all_job_postings(
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_view_permission(MENU_ID))
 ):
@@ -98,8 +102,8 @@ def get_all_job_postings(
             JobPosting.organization_id == current_user.organization_id
         )
 
-    postings = query.order_by(JobPosting.created_at.desc()).all()
-    return [JobPostingResponse.model_validate(p) for p in postings]
+    # Newest first (id follows created_at)
+    return paginate(query, JobPosting.id, page, response, JobPostingResponse, descending=True)
 
 
 
@@ -131,9 +135,8 @@ def update_job_posting(
     posting.updated_at = datetime.utcnow()
 
     db.commit()
-    db.refresh(posting)
 
-    return JobPostingResponse.model_validate(posting)
+    return JobPostingResponse.model_validate(get_for_response(db, JobPosting, posting.id, JobPostingResponse))
 
 
 # ------------------------------------------------------
@@ -175,29 +178,40 @@ def filter_job_postings(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_view_permission(MENU_ID))
 ):
+    organization_id = None
+    if current_user.role.name != "super_admin":
+        organization_id = current_user.organization_id
+
+    key = filter_key(organization_id, location, job_type, role_id, branch_id, min_salary)
+    return job_filter_cache.get_or_load(db, key, _filtered_job_postings)
+
+
+def _filtered_job_postings(db: Session, key: JobFilterKey) -> List[JobPostingResponse]:
     query = db.query(JobPosting)
 
-    if current_user.role.name != "super_admin":
-        query = query.filter(
-            JobPosting.organization_id == current_user.organization_id
-        )
+    if key.organization_id is not None:
+        query = query.filter(JobPosting.organization_id == key.organization_id)
 
-    if location:
-        query = query.filter(JobPosting.location.ilike(f"%{location}%"))
+    if key.location:
+        # "contains", resolved to exact values so the index is used
+        locations = matching_locations(db, key.organization_id, key.location)
+        if not locations:
+            return []
+        query = query.filter(JobPosting.location.in_(locations))
 
-    if job_type:
-        query = query.filter(JobPosting.job_type == job_type)
+    if key.job_type:
+        query = query.filter(JobPosting.job_type == key.job_type)
 
-    if role_id:
-        query = query.filter(JobPosting.job_description_id == role_id)
+    if key.role_id:
+        query = query.filter(JobPosting.job_description_id == key.role_id)
 
-    if branch_id:
-        query = query.filter(JobPosting.branch_id == branch_id)
+    if key.branch_id:
+        query = query.filter(JobPosting.branch_id == key.branch_id)
 
-    if min_salary:
-        query = query.filter(JobPosting.salary >= min_salary)
+    if key.min_salary:
+        query = query.filter(JobPosting.salary >= key.min_salary)
 
-    postings = query.all()
+    postings = with_loaders(query, JobPostingResponse).all()
     return [JobPostingResponse.model_validate(p) for p in postings]
 
 
@@ -207,37 +221,15 @@ def filter_job_postings(
 @router.get("/dashboard")
 def job_dashboard(
     job_posting_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_view_permission(MENU_ID)),
 ):
-    query = db.query(JobPosting)
-
     # Only show jobs for the user's organization unless super_admin
+    organization_id = None
     if current_user.role.name != "super_admin":
-        query = query.filter(JobPosting.organization_id == current_user.organization_id)
-
-    if job_posting_id:
-        query = query.filter(JobPosting.id == job_posting_id)
-
-    jobs = query.all()
-    dashboard = []
+        organization_id = current_user.organization_id
 
-    for job in jobs:
-        candidates_query = db.query(Candidate).filter(Candidate.job_posting_id == job.id)
-
-        dashboard.append({
-            "job_id": job.id,
-            "job_type": job.job_type,
-            "role": job.job_description.title if job.job_description else "",
-            "location": job.location,
-            "approval_status": job.approval_status,
-            "total_candidates": candidates_query.count(),
-            "pending": candidates_query.filter(Candidate.status == "Pending").count(),
-            "accepted": candidates_query.filter(Candidate.status == "Accepted").count(),
-            "rejected": candidates_query.filter(Candidate.status == "Rejected").count(),
-        })
-
-    return dashboard
+    return job_dashboard_rows(db, organization_id=organization_id, job_posting_id=job_posting_id)
 
 
 # ------------------------------------------------------
@@ -249,9 +241,7 @@ def get_job_posting(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_view_permission(MENU_ID))
 ):
-    posting = db.query(JobPosting).filter(
-        JobPosting.id == job_posting_id
-    ).first()
+    posting = get_for_response(db, JobPosting, job_posting_id, JobPostingResponse)
 
     if not posting:
         raise HTTPException(status_code=404, detail="Job posting not found")
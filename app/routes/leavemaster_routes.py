@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from datetime import datetime, UTC
 from typing import List
 
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.utils.pagination import PageParams, paginate
 from app.models.leavemaster_m import LeaveMaster
 from app.models.user_m import User
 
@@ -16,6 +17,7 @@ from app.schema.leavemaster_schema import (
 from app.dependencies import get_current_user
 
 from app.utils.leave_day_util import calculate_leave_days
+from app.utils.attendance_utils import refresh_attendance_for_leave
 from app.utils.leave_balance_util import (
     add_pending_leave,
     approve_leave_balance,
@@ -131,6 +133,11 @@ def update_leave_status(
                 leave.leave_days
             )
 
+    # Approved leaves count in attendance → keep summaries current
+    if "approved" in (old_status, new_status):
+        db.flush()
+        refresh_attendance_for_leave(db, leave)
+
     db.commit()
     db.refresh(leave)
     return leave
@@ -141,13 +148,14 @@ def update_leave_status(
 # =================================================
 @router.get("/", response_model=List[LeaveMasterResponse])
 def get_all_leaves(
-    db: Session = Depends(get_db),
+    response: Response,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    return (
-        db.query(LeaveMaster)
-        .order_by(LeaveMaster.created_at.desc())
-        .all()
+    # Newest first (id follows created_at)
+    return paginate(
+        db.query(LeaveMaster), LeaveMaster.id, page, response, LeaveMasterResponse, descending=True
     )
 
 
@@ -205,6 +213,11 @@ def delete_leave(
         )
 
     db.delete(leave)
+    db.flush()
+
+    if leave.status == "approved":
+        refresh_attendance_for_leave(db, leave)
+
     db.commit()
 
     return {"message": "Leave deleted successfully"}
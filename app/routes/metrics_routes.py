@@ -0,0 +1,49 @@
+# app/routes/metrics_routes.py
+
+from fastapi import APIRouter, Depends
+
+from app.database import pool_metrics, async_pool_metrics, pool_status
+from app.dependencies import require_super_admin
+from app.utils.job_posting_cache import job_filter_cache
+from app.utils.rbac_cache import role_rights_cache
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+# ----------------------------------------------------
+# DB CONNECTION POOL (per worker process)  (Super Admin)
+# ----------------------------------------------------
+@router.get("/db-pool", dependencies=[Depends(require_super_admin)])
+def get_db_pool_metrics(reset: bool = False):
+    """
+    Checkouts, wait time, overflow use and connections in use since start
+    (or the last reset). Each uvicorn worker answers for its own pools —
+    sample repeatedly to cover all workers.
+    """
+    status = pool_status()
+    if reset:
+        pool_metrics.reset()
+        async_pool_metrics.reset()
+    return status
+
+
+# ----------------------------------------------------
+# RBAC RIGHTS CACHE (per worker process)  (Super Admin)
+# ----------------------------------------------------
+@router.get("/rbac-cache", dependencies=[Depends(require_super_admin)])
+def get_rbac_cache_metrics(reset: bool = False):
+    stats = role_rights_cache.stats()
+    if reset:
+        role_rights_cache.reset_stats()
+    return stats
+
+
+# ----------------------------------------------------
+# JOB POSTING FILTER CACHE (per worker process)  (Super Admin)
+# ----------------------------------------------------
+@router.get("/job-filter-cache", dependencies=[Depends(require_super_admin)])
+def get_job_filter_cache_metrics(reset: bool = False):
+    stats = job_filter_cache.stats()
+    if reset:
+        job_filter_cache.reset_stats()
+    return stats
@@ -0,0 +1,119 @@
+# app/routes/month_close_routes.py
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from sqlalchemy.orm import Session, sessionmaker
+from typing import Optional
+
+from app.database import get_db
+from app.models.month_close_m import MonthCloseJob
+from app.schema.month_close_schema import MonthCloseJobResponse
+from app.services.month_close_service import (
+    DEFAULT_SHARD_SIZE,
+    DEFAULT_WORKERS,
+    MonthCloseBusy,
+    claim_month_close_job,
+    create_month_close_job,
+    job_report,
+    run_month_close,
+)
+from app.dependencies import get_current_user, require_super_admin
+
+router = APIRouter(prefix="/month-close", tags=["Month Close"])
+
+
+def _session_factory(db: Session):
+    """Fresh sessions on the request's bind (the request session is closed by then)."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
+
+
+# ----------------------------------------------------
+# START MONTH CLOSE (attendance → payroll)  (Super Admin)
+# ----------------------------------------------------
+@router.post(
+    "/{year}/{month}",
+    response_model=MonthCloseJobResponse,
+    status_code=202,
+    dependencies=[Depends(require_super_admin)]
+)
+def start_month_close(
+    year: int,
+    month: int,
+    background_tasks: BackgroundTasks,
+    organization_id: Optional[int] = None,
+    branch_id: Optional[int] = None,
+    workers: int = Query(DEFAULT_WORKERS, ge=1, le=32),
+    shard_size: int = Query(DEFAULT_SHARD_SIZE, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    if not 1 <= month <= 12:
+        raise HTTPException(status_code=400, detail="Invalid month")
+
+    if organization_id is None and branch_id is None:
+        raise HTTPException(status_code=400, detail="organization_id or branch_id is required")
+
+    try:
+        job = create_month_close_job(
+            db,
+            year,
+            month,
+            organization_id=organization_id,
+            branch_id=branch_id,
+            shard_size=shard_size,
+            workers=workers,
+            created_by=current_user.first_name,
+        )
+    except MonthCloseBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    # Runs after the response; pool workers open their own DB connections
+    background_tasks.add_task(run_month_close, job.id, workers, _session_factory(db))
+
+    return job_report(db, job.id)
+
+
+# ----------------------------------------------------
+# JOB PROGRESS + PER-SHARD TIMINGS  (Super Admin)
+# ----------------------------------------------------
+@router.get(
+    "/{job_id}",
+    response_model=MonthCloseJobResponse,
+    dependencies=[Depends(require_super_admin)]
+)
+def get_month_close_job(job_id: int, db: Session = Depends(get_db)):
+    report = job_report(db, job_id)
+    if not report:
+        raise HTTPException(status_code=404, detail="Month close job not found")
+    return report
+
+
+# ----------------------------------------------------
+# RESUME AFTER CRASH / FAILED SHARDS  (Super Admin)
+# ----------------------------------------------------
+@router.post(
+    "/{job_id}/resume",
+    response_model=MonthCloseJobResponse,
+    status_code=202,
+    dependencies=[Depends(require_super_admin)]
+)
+def resume_month_close(
+    job_id: int,
+    background_tasks: BackgroundTasks,
+    workers: Optional[int] = Query(None, ge=1, le=32),
+    force: bool = Query(False, description="take over a job left 'running' by a dead process"),
+    db: Session = Depends(get_db)
+):
+    job = db.query(MonthCloseJob).filter(MonthCloseJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Month close job not found")
+
+    if job.status == "completed":
+        raise HTTPException(status_code=400, detail="Month close job already completed")
+
+    # Claimed here, not in the background task, so a conflict is a 409
+    if not claim_month_close_job(db, job_id, force=force):
+        raise HTTPException(status_code=409, detail="Month close job is already running")
+
+    background_tasks.add_task(run_month_close, job.id, workers, _session_factory(db), claimed=True)
+
+    return job_report(db, job.id)
@@ -1,17 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.utils.pagination import PageParams, paginate
 from app.models.payroll_attendance_m import PayrollAttendance
 from app.models.attendance_summary_m import Attendance
 from app.models.salary_structure_m import SalaryStructure
+from app.models.user_m import User
 from app.schema.payroll_attendance_schema import (
     PayrollAttendanceBase,
     PayrollAttendanceCreate,
     PayrollAttendanceResponse,
     PayrollAttendanceUpdate,
 )
+from app.schema.payroll_schema import PayrollAttendanceBulkResponse
+from app.utils.payroll_attendance_utils import (
+    generate_payroll_bulk,
+    monthly_gross_salaries,
+    parse_month,
+    payroll_values,
+)
+from app.utils.formula_engine import FormulaError
+from app.dependencies import get_current_user
 
 # 🔹 Permission imports (as you asked)
 from app.permission_dependencies import (
@@ -41,60 +52,101 @@ def create_payroll_attendance(user_id: int, month: str, db: Session = Depends(ge
     if existing:
         raise HTTPException(status_code=400, detail="Payroll already exists for this user and month")
 
+    try:
+        month_start = parse_month(month)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid month format. Use YYYY-MM")
+
+    # The user's own structure, not the latest active one of any user
     salary_structure = (
         db.query(SalaryStructure)
-        .filter(SalaryStructure.is_active == True)
-        .order_by(SalaryStructure.id.desc())
+        .join(User, User.salary_structure_id == SalaryStructure.id)
+        .filter(User.id == user_id, SalaryStructure.is_active == True)
         .first()
     )
     if not salary_structure:
         raise HTTPException(status_code=404, detail="Salary structure not found")
 
-    attendance_records = (
+    summary = (
         db.query(Attendance)
-        .filter(Attendance.user_id == user_id, Attendance.date.like(f"{month}%"))
-        .all()
+        .filter(Attendance.user_id == user_id, Attendance.month == month_start)
+        .first()
     )
 
-    if not attendance_records:
+    if not summary:
         raise HTTPException(status_code=404, detail="Attendance records not found")
 
-    total_days = len(attendance_records)
-    present_days = sum(1 for a in attendance_records if a.status == "Present")
-    half_days = sum(1 for a in attendance_records if a.status == "Half Day")
-    absent_days = total_days - (present_days + half_days)
-
-    daily_salary = salary_structure.total_annual / 12 / total_days
-    gross_salary = daily_salary * (present_days + 0.5 * half_days)
-    net_salary = round(gross_salary, 2)
-
-    payroll = PayrollAttendance(
-        user_id=user_id,
-        month=month,
-        total_days=total_days,
-        present_days=present_days,
-        half_days=half_days,
-        absent_days=absent_days,
-        gross_salary=round(gross_salary, 2),
-        net_salary=net_salary,
-        status="Generated",
-        generated_on=datetime.now().date(),
+    try:
+        monthly_gross = monthly_gross_salaries(db, salary_structure.id, [salary_structure.total_annual or 0])[0]
+    except FormulaError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    values = payroll_values(
+        user_id, month, monthly_gross,
+        summary.total_days, summary.present_days, summary.half_days, summary.absent_days
     )
 
+    payroll = PayrollAttendance(**values, status="Generated")
+
     db.add(payroll)
     db.commit()
     db.refresh(payroll)
     return payroll
 
 
+# ✅ Bulk Generate Payroll for an Organization / Branch
+@router.post(
+    "/generate-bulk",
+    response_model=PayrollAttendanceBulkResponse,
+    dependencies=[Depends(require_create_permission(MENU_ID))]
+)
+def generate_payroll_attendance_bulk(
+    month: str,
+    organization_id: Optional[int] = None,
+    branch_id: Optional[int] = None,
+    overwrite: bool = False,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    # Non super admins can only run payroll for their own organization
+    if current_user.role.name != "super_admin":
+        organization_id = current_user.organization_id
+
+    if organization_id is None and branch_id is None:
+        raise HTTPException(status_code=400, detail="organization_id or branch_id is required")
+
+    try:
+        parse_month(month)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid month format. Use YYYY-MM")
+
+    try:
+        result = generate_payroll_bulk(
+            db,
+            month,
+            organization_id=organization_id,
+            branch_id=branch_id,
+            overwrite=overwrite,
+        )
+    except FormulaError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    db.commit()
+    return {**result, "organization_id": organization_id, "branch_id": branch_id}
+
+
 # ✅ Get All Payrolls
 @router.get(
     "/", 
     response_model=List[PayrollAttendanceResponse],
     dependencies=[Depends(require_view_permission(MENU_ID))]
 )
-def get_all_payrolls(db: Session = Depends(get_db)):
-    return db.query(PayrollAttendance).all()
+def get_all_payrolls(
+    response: Response,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_read_db)
+):
+    return paginate(db.query(PayrollAttendance), PayrollAttendance.id, page, response, PayrollAttendanceResponse)
 
 
 # ✅ Get payroll by ID
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 from typing import List
 
 from app.database import get_db
+from app.utils.pagination import PageParams, paginate
 from app.models.permission_m import Permission
 from app.models.user_m import User
 from app.models.shift_m import Shift
@@ -13,6 +14,7 @@ from app.schema.permission_schema import (
     PermissionResponse
 )
 from app.dependencies import get_current_user
+from app.utils.attendance_utils import refresh_attendance_days
 
 from app.permission_dependencies import (
     require_view_permission,
@@ -68,6 +70,10 @@ def create_permission(
     )
 
     db.add(new_permission)
+    db.flush()
+
+    refresh_attendance_days(db, [new_permission.user_id], [new_permission.date])
+
     db.commit()
     db.refresh(new_permission)
 
@@ -81,10 +87,12 @@ def create_permission(
     dependencies=[Depends(require_view_permission(menu_id=MENU_ID))]
 )
 def get_all_permissions(
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    return db.query(Permission).all()
+    return paginate(db.query(Permission), Permission.id, page, response, PermissionResponse)
 
 
 # ------------------- GET BY ID -------------------
@@ -123,12 +131,20 @@ def update_permission(
 
     update_data = updated_data.model_dump(exclude_unset=True)   # ✔ UPDATED
 
+    # Old + new (user, date) both lose / gain this permission
+    affected = {(permission.user_id, permission.date)}
+
     for key, value in update_data.items():
         setattr(permission, key, value)
 
     permission.modified_by = current_user.first_name
     permission.updated_at = datetime.now(timezone.utc)          # ✔ UPDATED
 
+    db.flush()
+    affected.add((permission.user_id, permission.date))
+    for user_id, day in affected:
+        refresh_attendance_days(db, [user_id], [day])
+
     db.commit()
     db.refresh(permission)
 
@@ -150,6 +166,10 @@ def delete_permission(
         raise HTTPException(status_code=404, detail="Permission not found")
 
     db.delete(permission)
+    db.flush()
+
+    refresh_attendance_days(db, [permission.user_id], [permission.date])
+
     db.commit()
 
     return {"message": "Permission deleted successfully"}
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.subscription_plans_m import SubscriptionPlan
 from app.models.organization_m import Organization
 from app.schema.subscription_plan_schema import (
@@ -28,7 +29,7 @@ router = APIRouter(prefix="/subscription-plans", tags=["Subscription Plans"])
 @router.post("/", response_model=SubscriptionPlanResponse, status_code=status.HTTP_201_CREATED)
 async def create_subscription_plan(
     payload: SubscriptionPlanCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_super_admin)
 ):
     """
@@ -38,9 +39,9 @@ async def create_subscription_plan(
     """
     
     # Check if plan name already exists
-    existing = db.query(SubscriptionPlan).filter(
-        SubscriptionPlan.name == payload.name
-    ).first()
+    existing = await db.scalar(
+        select(SubscriptionPlan.id).where(SubscriptionPlan.name == payload.name)
+    )
     
     if existing:
         raise HTTPException(
@@ -55,8 +56,8 @@ async def create_subscription_plan(
     )
     
     db.add(new_plan)
-    db.commit()
-    db.refresh(new_plan)
+    await db.commit()
+    await db.refresh(new_plan)
     
     return new_plan
 
@@ -67,7 +68,7 @@ async def create_subscription_plan(
 @router.get("/admin/all", response_model=List[SubscriptionPlanResponse])
 async def get_all_plans_admin(
     show_inactive: bool = False,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_super_admin)
 ):
     """
@@ -76,13 +77,13 @@ async def get_all_plans_admin(
     - Can see inactive plans
     """
     
-    query = db.query(SubscriptionPlan)
+    query = select(SubscriptionPlan)
     
     if not show_inactive:
-        query = query.filter(SubscriptionPlan.is_active == True)
+        query = query.where(SubscriptionPlan.is_active == True)
     
-    plans = query.order_by(SubscriptionPlan.display_order).all()
-    return plans
+    plans = await db.scalars(query.order_by(SubscriptionPlan.display_order))
+    return plans.all()
 
 
 # ============================================
@@ -90,7 +91,7 @@ async def get_all_plans_admin(
 # ============================================
 @router.get("/public", response_model=List[SubscriptionPlanPublicResponse])
 async def get_public_plans(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user_optional)
 ):
     """
@@ -100,11 +101,13 @@ async def get_public_plans(
     - Shows calculated savings
     """
     
-    plans = db.query(SubscriptionPlan).filter(
-        SubscriptionPlan.is_active == True
-    ).order_by(SubscriptionPlan.display_order).all()
+    plans = await db.scalars(
+        select(SubscriptionPlan)
+        .where(SubscriptionPlan.is_active == True)
+        .order_by(SubscriptionPlan.display_order)
+    )
     
-    return plans
+    return plans.all()
 
 
 # ============================================
@@ -112,7 +115,7 @@ async def get_public_plans(
 # ============================================
 @router.get("/compare", response_model=List[PlanComparisonResponse])
 async def compare_plans(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user_optional)
 ):
     """
@@ -121,13 +124,18 @@ async def compare_plans(
     - Highlights current user's plan if logged in
     """
     
-    plans = db.query(SubscriptionPlan).filter(
-        SubscriptionPlan.is_active == True
-    ).order_by(SubscriptionPlan.display_order).all()
+    plans = (await db.scalars(
+        select(SubscriptionPlan)
+        .where(SubscriptionPlan.is_active == True)
+        .order_by(SubscriptionPlan.display_order)
+    )).all()
     
+    # Plan id through a query, not the lazy current_user.organization relationship
     current_plan_id = None
-    if current_user and current_user.organization:
-        current_plan_id = current_user.organization.plan_id
+    if current_user and current_user.organization_id:
+        current_plan_id = await db.scalar(
+            select(Organization.plan_id).where(Organization.id == current_user.organization_id)
+        )
     
     comparison = []
     for plan in plans:
@@ -159,7 +167,7 @@ async def compare_plans(
 # ============================================
 @router.get("/my-plan", response_model=SubscriptionPlanResponse)
 async def get_my_organization_plan(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -173,17 +181,19 @@ async def get_my_organization_plan(
             detail="No organization assigned to your account"
         )
     
-    org = db.query(Organization).filter(
-        Organization.id == current_user.organization_id
-    ).first()
+    plan = await db.scalar(
+        select(SubscriptionPlan)
+        .join(Organization, Organization.plan_id == SubscriptionPlan.id)
+        .where(Organization.id == current_user.organization_id)
+    )
     
-    if not org or not org.plan:
+    if not plan:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No subscription plan assigned to your organization"
         )
     
-    return org.plan
+    return plan
 
 
 # ============================================
@@ -192,7 +202,7 @@ async def get_my_organization_plan(
 @router.get("/{plan_id}", response_model=SubscriptionPlanResponse)
 async def get_plan_by_id(
     plan_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user_optional)
 ):
     """
@@ -200,10 +210,12 @@ async def get_plan_by_id(
     - Public endpoint
     """
     
-    plan = db.query(SubscriptionPlan).filter(
-        SubscriptionPlan.id == plan_id,
-        SubscriptionPlan.is_active == True
-    ).first()
+    plan = await db.scalar(
+        select(SubscriptionPlan).where(
+            SubscriptionPlan.id == plan_id,
+            SubscriptionPlan.is_active == True
+        )
+    )
     
     if not plan:
         raise HTTPException(
@@ -221,7 +233,7 @@ async def get_plan_by_id(
 async def update_subscription_plan(
     plan_id: int,
     payload: SubscriptionPlanUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_super_admin)
 ):
     """
@@ -230,9 +242,7 @@ async def update_subscription_plan(
     - Updates all organizations using this plan
     """
     
-    plan = db.query(SubscriptionPlan).filter(
-        SubscriptionPlan.id == plan_id
-    ).first()
+    plan = await db.get(SubscriptionPlan, plan_id)
     
     if not plan:
         raise HTTPException(
@@ -242,10 +252,12 @@ async def update_subscription_plan(
     
     # Check if name is being changed and if it conflicts
     if payload.name and payload.name != plan.name:
-        existing = db.query(SubscriptionPlan).filter(
-            SubscriptionPlan.name == payload.name,
-            SubscriptionPlan.id != plan_id
-        ).first()
+        existing = await db.scalar(
+            select(SubscriptionPlan.id).where(
+                SubscriptionPlan.name == payload.name,
+                SubscriptionPlan.id != plan_id
+            )
+        )
         
         if existing:
             raise HTTPException(
@@ -261,24 +273,22 @@ async def update_subscription_plan(
     
     plan.modified_by = f"{current_user.first_name} {current_user.last_name}"
     
-    db.commit()
-    db.refresh(plan)
+    # 🔥 Update all organizations using this plan (one UPDATE, same transaction)
+    limits = {
+        key: update_data[key]
+        for key in ["branch_limit", "user_limit", "storage_limit_mb"]
+        if key in update_data
+    }
+    if limits:
+        await db.execute(
+            update(Organization)
+            .where(Organization.plan_id == plan_id)
+            .values(**limits)
+            .execution_options(synchronize_session=False)
+        )
     
-    # 🔥 Update all organizations using this plan
-    if any(key in update_data for key in ["branch_limit", "user_limit", "storage_limit_mb"]):
-        organizations = db.query(Organization).filter(
-            Organization.plan_id == plan_id
-        ).all()
-        
-        for org in organizations:
-            if "branch_limit" in update_data:
-                org.branch_limit = plan.branch_limit
-            if "user_limit" in update_data:
-                org.user_limit = plan.user_limit
-            if "storage_limit_mb" in update_data:
-                org.storage_limit_mb = plan.storage_limit_mb
-        
-        db.commit()
+    await db.commit()
+    await db.refresh(plan)
     
     return plan
 
@@ -289,7 +299,7 @@ async def update_subscription_plan(
 @router.delete("/{plan_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_subscription_plan(
     plan_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_super_admin)
 ):
     """
@@ -298,9 +308,7 @@ async def delete_subscription_plan(
     - Cannot delete if organizations are using it
     """
     
-    plan = db.query(SubscriptionPlan).filter(
-        SubscriptionPlan.id == plan_id
-    ).first()
+    plan = await db.get(SubscriptionPlan, plan_id)
     
     if not plan:
         raise HTTPException(
@@ -309,9 +317,9 @@ async def delete_subscription_plan(
         )
     
     # Check if any organizations are using this plan
-    orgs_count = db.query(Organization).filter(
-        Organization.plan_id == plan_id
-    ).count()
+    orgs_count = await db.scalar(
+        select(func.count(Organization.id)).where(Organization.plan_id == plan_id)
+    )
     
     if orgs_count > 0:
         raise HTTPException(
@@ -320,8 +328,8 @@ async def delete_subscription_plan(
                    f"Please migrate them to another plan first."
         )
     
-    db.delete(plan)
-    db.commit()
+    await db.delete(plan)
+    await db.commit()
     
     return None
 
@@ -332,7 +340,7 @@ async def delete_subscription_plan(
 @router.patch("/{plan_id}/deactivate")
 async def deactivate_plan(
     plan_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_super_admin)
 ):
     """
@@ -342,9 +350,7 @@ async def deactivate_plan(
     - New organizations cannot select it
     """
     
-    plan = db.query(SubscriptionPlan).filter(
-        SubscriptionPlan.id == plan_id
-    ).first()
+    plan = await db.get(SubscriptionPlan, plan_id)
     
     if not plan:
         raise HTTPException(
@@ -355,14 +361,14 @@ async def deactivate_plan(
     plan.is_active = False
     plan.modified_by = f"{current_user.first_name} {current_user.last_name}"
     
-    db.commit()
-    db.refresh(plan)
+    await db.commit()
+    await db.refresh(plan)
     
     return {
         "message": f"Plan '{plan.name}' has been deactivated",
-        "organizations_affected": db.query(Organization).filter(
-            Organization.plan_id == plan_id
-        ).count()
+        "organizations_affected": await db.scalar(
+            select(func.count(Organization.id)).where(Organization.plan_id == plan_id)
+        )
     }
 
 
@@ -372,7 +378,7 @@ async def deactivate_plan(
 @router.patch("/{plan_id}/activate")
 async def activate_plan(
     plan_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_super_admin)
 ):
     """
@@ -380,9 +386,7 @@ async def activate_plan(
     - Only super admin can reactivate
     """
     
-    plan = db.query(SubscriptionPlan).filter(
-        SubscriptionPlan.id == plan_id
-    ).first()
+    plan = await db.get(SubscriptionPlan, plan_id)
     
     if not plan:
         raise HTTPException(
@@ -393,8 +397,8 @@ async def activate_plan(
     plan.is_active = True
     plan.modified_by = f"{current_user.first_name} {current_user.last_name}"
     
-    db.commit()
-    db.refresh(plan)
+    await db.commit()
+    await db.refresh(plan)
     
     return {
         "message": f"Plan '{plan.name}' has been reactivated"
@@ -1,15 +1,30 @@
 import os
+from functools import lru_cache
 from uuid import uuid4
 from fastapi import UploadFile, HTTPException
 from app.config import settings
-import boto3
 
-s3_client = boto3.client(
-    "s3",
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID_RESUME,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY_RESUME,
-    region_name=settings.AWS_REGION_RESUME,
-)
+
+@lru_cache(maxsize=None)
+def get_s3_client():
+    # boto3 / botocore import is the single most expensive import of the app
+    # → deferred to the first upload. boto3 clients are thread-safe, one is shared.
+    import boto3
+
+    return boto3.client(
+        "s3",
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID_RESUME,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY_RESUME,
+        region_name=settings.AWS_REGION_RESUME,
+    )
+
+
+def __getattr__(name):
+    # `app.s3_helper.s3_client` keeps working, built lazily
+    if name == "s3_client":
+        return get_s3_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def upload_file_to_s3(file: UploadFile, folder: str) -> str:
     if not file or not file.filename:
@@ -27,7 +42,7 @@ def upload_file_to_s3(file: UploadFile, folder: str) -> str:
 
     key = f"{folder}/{uuid4()}.{ext}"
 
-    s3_client.upload_fileobj(
+    get_s3_client().upload_fileobj(
         file.file,
         settings.BUCKET_NAME_RESUME,
         key,
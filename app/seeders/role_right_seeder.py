@@ -1,5 +1,8 @@
 # app/seeders/seed_role_rights.py
 
+from typing import Optional
+
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.models.role_right_m import RoleRight
@@ -7,219 +10,166 @@ from app.models.role_m import Role
 from app.models.menu_m import Menu
 
 
-def get_menu_by_name(db, name):
-    """Get menu by name field (lowercase)"""
-    return db.query(Menu).filter(Menu.name == name).first()
-
-
-def get_role(db, name):
-    """Get role by name"""
-    return db.query(Role).filter(Role.name == name).first()
-
-
-def seed_role_rights():
-    db: Session = SessionLocal()
+SEEDED_ROLES = ("super_admin", "org_admin", "employee", "manager")
+FULL_ACCESS = (True, True, True, True)
+VIEW_ONLY = (True, False, False, False)
+
+# ✅ Use actual menu names from your seeder
+EMPLOYEE_ALLOWED_MENUS = [
+    "dashboard",           # Menu ID 1
+    "attendance",          # Menu ID 44 (HRMS module)
+    "leave_master",        # Menu ID 45 (for requesting leaves)
+    "progress",            # Menu ID 37 (LMS - view own progress)
+    "courses",             # Menu ID 31 (LMS - view courses)
+    "videos",              # Menu ID 32 (LMS - watch videos)
+    "enrollments",         # Menu ID 34 (view own enrollments)
+]
+
+# Managers get more access than employees
+# Format: menu_name: (can_view, can_create, can_edit, can_delete)
+MANAGER_ACCESS = {
+    # Base Access
+    "dashboard":            (True, False, False, False),
+
+    # User Management (limited)
+    "users":                (True, True, True, False),  # Can manage users
+
+    # Organization
+    "departments":          (True, True, True, False),  # Manage departments
+
+    # HRMS Module
+    "attendance":           (True, True, True, False),  # Manage attendance
+    "shifts":               (True, True, True, False),  # Manage shifts
+    "user_shifts":          (True, True, True, False),  # Assign shifts
+    "shift_change_requests":(True, False, True, False), # Approve requests
+    "leave_master":         (True, False, True, False), # Approve leaves
+    "permissions_module":   (True, False, True, False), # Approve permissions
+
+    # Payroll (view only)
+    "payroll":              (True, False, False, False),
+    "payroll_attendance":   (True, False, False, False),
+
+    # Reports
+    "reports":              (True, False, False, False),
+    "attendance_reports":   (True, False, False, False),
+    "daily_attendance":     (True, False, False, False),
+    "monthly_attendance":   (True, False, False, False),
+
+    # LMS Module (manage team learning)
+    "courses":              (True, False, False, False),
+    "videos":               (True, False, False, False),
+    "enrollments":          (True, True, False, False),  # Enroll team
+    "progress":             (True, False, False, False),  # View team progress
+     # Hiring Module — Manager can only create/post jobs
+    "job_postings":         (True, True, False, False),
+    # Hiring (if manager is hiring manager)
+    "candidates":           (True, True, True, False),
+    "candidate_documents":  (True, True, False, False),
+}
+
+
+def desired_rights(roles, menus):
+    """
+    (role_id, menu_id) → (can_view, can_create, can_edit, can_delete)
+    roles: role name → id, menus: menu name → id
+    """
+    rights = {}
+
+    # 1️⃣ SUPER ADMIN / 2️⃣ ORG ADMIN → FULL ACCESS
+    for role_name in ("super_admin", "org_admin"):
+        if role_name in roles:
+            for menu_id in menus.values():
+                rights[(roles[role_name], menu_id)] = FULL_ACCESS
+
+    # 3️⃣ EMPLOYEE → view only, 4️⃣ MANAGER → moderate access
+    limited = {
+        "employee": {name: VIEW_ONLY for name in EMPLOYEE_ALLOWED_MENUS},
+        "manager": MANAGER_ACCESS,
+    }
+    for role_name, access in limited.items():
+        if role_name not in roles:
+            continue
+        for menu_name, perms in access.items():
+            if menu_name not in menus:
+                print(f"⚠️  Menu '{menu_name}' not found, skipping...")
+                continue
+            rights[(roles[role_name], menus[menu_name])] = perms
+
+    return rights
+
+
+def seed_role_rights(db: Optional[Session] = None) -> bool:
+    """
+    Insert missing role rights; existing rows are never modified.
+    Three reads (roles, menus, existing rights) + one bulk insert.
+    """
+    own_session = db is None
+    db = db or SessionLocal()
 
     try:
-        # ---------------------------------------------------------
-        # 1️⃣ SUPER ADMIN → FULL ACCESS (GLOBAL)
-        # ---------------------------------------------------------
-        super_admin = get_role(db, "super_admin")
-        if not super_admin:
+        roles = {
+            row.name: row.id
+            for row in db.query(Role.id, Role.name).filter(Role.name.in_(SEEDED_ROLES))
+        }
+        if "super_admin" not in roles:
             print("❌ super_admin role missing. Run seed_roles.py first.")
-            return
-
-        all_menus = db.query(Menu).all()
-        print(f"📋 Found {len(all_menus)} menus")
-
-        for menu in all_menus:
-            exists = db.query(RoleRight).filter_by(
-                role_id=super_admin.id,
-                menu_id=menu.id
-            ).first()
-
-            if not exists:
-                db.add(RoleRight(
-                    role_id=super_admin.id,
-                    menu_id=menu.id,
-                    can_view=True,
-                    can_create=True,
-                    can_edit=True,
-                    can_delete=True,
-                    created_by="System",
-                    modified_by="System"
-                ))
-        
-        print(f"✅ Super Admin: Granted full access to all {len(all_menus)} menus")
-
-
-        # ---------------------------------------------------------
-        # 2️⃣ ORG ADMIN → FULL ACCESS WITHIN THE ORG
-        # ---------------------------------------------------------
-        org_admin = get_role(db, "org_admin")
-        if org_admin:
-            for menu in all_menus:
-                exists = db.query(RoleRight).filter_by(
-                    role_id=org_admin.id,
-                    menu_id=menu.id
-                ).first()
-
-                if not exists:
-                    db.add(RoleRight(
-                        role_id=org_admin.id,
-                        menu_id=menu.id,
-                        can_view=True,
-                        can_create=True,
-                        can_edit=True,
-                        can_delete=True,
-                        created_by="System",
-                        modified_by="System"
-                    ))
-            
-            print(f"✅ Org Admin: Granted full access to all {len(all_menus)} menus")
-
-
-        # ---------------------------------------------------------
-        # 3️⃣ EMPLOYEE → LIMITED ACCESS
-        # ---------------------------------------------------------
-        employee = get_role(db, "employee")
-        if employee:
-            # ✅ Use actual menu names from your seeder
-            employee_allowed_menus = [
-                "dashboard",           # Menu ID 1
-                "attendance",          # Menu ID 44 (HRMS module)
-                "leave_master",        # Menu ID 45 (for requesting leaves)
-                "progress",            # Menu ID 37 (LMS - view own progress)
-                "courses",             # Menu ID 31 (LMS - view courses)
-                "videos",              # Menu ID 32 (LMS - watch videos)
-                "enrollments",         # Menu ID 34 (view own enrollments)
-            ]
-
-            for menu_name in employee_allowed_menus:
-                menu = get_menu_by_name(db, menu_name)
-                if not menu:
-                    print(f"⚠️  Menu '{menu_name}' not found, skipping...")
-                    continue
-
-                exists = db.query(RoleRight).filter_by(
-                    role_id=employee.id,
-                    menu_id=menu.id
-                ).first()
-
-                if not exists:
-                    # Employees can view but not create/edit/delete
-                    db.add(RoleRight(
-                        role_id=employee.id,
-                        menu_id=menu.id,
-                        can_view=True,
-                        can_create=False,  # Can't create
-                        can_edit=False,    # Can't edit
-                        can_delete=False,  # Can't delete
-                        created_by="System",
-                        modified_by="System"
-                    ))
-            
-            print(f"✅ Employee: Granted view access to {len(employee_allowed_menus)} menus")
-
-
-        # ---------------------------------------------------------
-        # 4️⃣ MANAGER → MODERATE ACCESS
-        # ---------------------------------------------------------
-        manager = get_role(db, "manager")
-        if manager:
-            # Managers get more access than employees
-            # Format: menu_name: (can_view, can_create, can_edit, can_delete)
-            manager_access = {
-                # Base Access
-                "dashboard":            (True, False, False, False),
-                
-                # User Management (limited)
-                "users":                (True, True, True, False),  # Can manage users
-                
-                # Organization
-                "departments":          (True, True, True, False),  # Manage departments
-                
-                # HRMS Module
-                "attendance":           (True, True, True, False),  # Manage attendance
-                "shifts":               (True, True, True, False),  # Manage shifts
-                "user_shifts":          (True, True, True, False),  # Assign shifts
-                "shift_change_requests":(True, False, True, False), # Approve requests
-                "leave_master":         (True, False, True, False), # Approve leaves
-                "permissions_module":   (True, False, True, False), # Approve permissions
-                
-                # Payroll (view only)
-                "payroll":              (True, False, False, False),
-                "payroll_attendance":   (True, False, False, False),
-                
-                # Reports
-                "reports":              (True, False, False, False),
-                "attendance_reports":   (True, False, False, False),
-                "daily_attendance":     (True, False, False, False),
-                "monthly_attendance":   (True, False, False, False),
-                
-                # LMS Module (manage team learning)
-                "courses":              (True, False, False, False),
-                "videos":               (True, False, False, False),
-                "enrollments":          (True, True, False, False),  # Enroll team
-                "progress":             (True, False, False, False),  # View team progress
-                 # Hiring Module — Manager can only create/post jobs
-                "job_postings":         (True, True, False, False),
-                # Hiring (if manager is hiring manager)
-                "candidates":           (True, True, True, False),
-                "candidate_documents":  (True, True, False, False),
+            return False
+
+        menus = {row.name: row.id for row in db.query(Menu.id, Menu.name)}
+        print(f"📋 Found {len(menus)} menus")
+
+        existing = set(
+            db.query(RoleRight.role_id, RoleRight.menu_id).filter(
+                RoleRight.role_id.in_(roles.values())
+            ).all()
+        )
+
+        missing = [
+            {
+                "role_id": role_id,
+                "menu_id": menu_id,
+                "can_view": can_view,
+                "can_create": can_create,
+                "can_edit": can_edit,
+                "can_delete": can_delete,
+                "created_by": "System",
+                "modified_by": "System",
             }
+            for (role_id, menu_id), (can_view, can_create, can_edit, can_delete)
+            in desired_rights(roles, menus).items()
+            if (role_id, menu_id) not in existing
+        ]
 
-            for menu_name, perms in manager_access.items():
-                menu = get_menu_by_name(db, menu_name)
-                if not menu:
-                    print(f"⚠️  Menu '{menu_name}' not found, skipping...")
-                    continue
-
-                can_view, can_create, can_edit, can_delete = perms
-
-                exists = db.query(RoleRight).filter_by(
-                    role_id=manager.id,
-                    menu_id=menu.id
-                ).first()
-
-                if not exists:
-                    db.add(RoleRight(
-                        role_id=manager.id,
-                        menu_id=menu.id,
-                        can_view=can_view,
-                        can_create=can_create,
-                        can_edit=can_edit,
-                        can_delete=can_delete,
-                        created_by="System",
-                        modified_by="System"
-                    ))
-            
-            print(f"✅ Manager: Granted access to {len(manager_access)} menus")
-
+        if missing:
+            db.bulk_insert_mappings(RoleRight, missing)
 
         # ---------------------------------------------------------
         # Commit changes
         # ---------------------------------------------------------
         db.commit()
-        print("\n✅ Role rights seeded successfully!")
+        print(f"\n✅ Role rights seeded successfully! ({len(missing)} added)")
         print("\n📊 Summary:")
-        print(f"   - super_admin: {db.query(RoleRight).filter_by(role_id=super_admin.id).count()} permissions")
-        if org_admin:
-            print(f"   - org_admin: {db.query(RoleRight).filter_by(role_id=org_admin.id).count()} permissions")
-        if employee:
-            print(f"   - employee: {db.query(RoleRight).filter_by(role_id=employee.id).count()} permissions")
-        if manager:
-            print(f"   - manager: {db.query(RoleRight).filter_by(role_id=manager.id).count()} permissions")
+        counts = dict(
+            db.query(RoleRight.role_id, func.count(RoleRight.id))
+            .filter(RoleRight.role_id.in_(roles.values()))
+            .group_by(RoleRight.role_id)
+            .all()
+        )
+        for role_name, role_id in roles.items():
+            print(f"   - {role_name}: {counts.get(role_id, 0)} permissions")
+        return True
 
     except Exception as e:
         db.rollback()
         print(f"\n❌ Error seeding role rights: {e}")
         import traceback
         traceback.print_exc()
+        return False
 
     finally:
-        db.close()
+        if own_session:
+            db.close()
 
 
 if __name__ == "__main__":
-    seed_role_rights()
\ No newline at end of file
+    seed_role_rights()
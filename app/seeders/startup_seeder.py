@@ -0,0 +1,117 @@
+# app/seeders/startup_seeder.py
+
+"""
+Startup schema + seeding, skipped entirely once a database carries the
+current SEED_VERSION marker (one primary-key lookup per worker boot).
+
+Bump SEED_VERSION whenever a seeder or the startup schema changes; the next
+boot re-runs every step once (seeders only add what is missing) and records
+the new version. FORCE_SEED=true re-runs regardless.
+"""
+
+import os
+import time as clock
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.database import engine as default_engine
+from app.models.seed_version_m import SeedVersion
+
+
+SEED_NAME = "startup"
+SEED_VERSION = 1
+SEED_LOCK_NAME = "lms_startup_seed"
+SEED_LOCK_TIMEOUT = 120  # seconds another worker may spend seeding
+
+FORCE_SEED = os.getenv("FORCE_SEED", "False").lower() == "true"
+
+
+def seeded_version(engine: Engine) -> Optional[int]:
+    """Recorded version, None when never seeded (or the table does not exist yet)."""
+    try:
+        with Session(engine) as db:
+            marker = db.get(SeedVersion, SEED_NAME)
+            return marker.version if marker else None
+    except SQLAlchemyError:
+        return None
+
+
+def mark_seeded(engine: Engine, version: int, seconds: float):
+    with Session(engine) as db:
+        marker = db.get(SeedVersion, SEED_NAME)
+        if marker is None:
+            db.add(SeedVersion(name=SEED_NAME, version=version, seconds=seconds))
+        else:
+            marker.version = version
+            marker.seconds = seconds
+        db.commit()
+
+
+@contextmanager
+def seed_lock(engine: Engine):
+    """
+    Cross-worker lock so simultaneous boots seed once
+    (MySQL GET_LOCK / PostgreSQL advisory lock; no-op elsewhere).
+    Yields whether the lock was acquired: GET_LOCK gives up after
+    SEED_LOCK_TIMEOUT seconds (0 / NULL).
+    """
+    dialect = engine.dialect.name
+    with engine.connect() as conn:
+        acquired = True
+        if dialect == "mysql":
+            acquired = conn.execute(
+                text("SELECT GET_LOCK(:name, :timeout)"), {"name": SEED_LOCK_NAME, "timeout": SEED_LOCK_TIMEOUT}
+            ).scalar() == 1
+        elif dialect == "postgresql":
+            conn.execute(text("SELECT pg_advisory_lock(hashtext(:name))"), {"name": SEED_LOCK_NAME})
+        try:
+            yield acquired
+        finally:
+            if acquired and dialect == "mysql":
+                conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": SEED_LOCK_NAME})
+            elif dialect == "postgresql":
+                conn.execute(text("SELECT pg_advisory_unlock(hashtext(:name))"), {"name": SEED_LOCK_NAME})
+
+
+def run_startup_seeding(
+    *steps: Callable[[], Optional[bool]],
+    engine: Engine = default_engine,
+    version: int = SEED_VERSION,
+    force: bool = FORCE_SEED,
+) -> bool:
+    """
+    Run the steps in order unless the database is already at `version`.
+    A step returning False counts as failed: the marker is not written, so
+    the next boot retries. Returns True when the steps ran.
+    """
+    if not force and seeded_version(engine) == version:
+        print(f"⏩ Seed version {version} already applied, skipping startup seeding")
+        return False
+
+    with seed_lock(engine) as acquired:
+        # Another worker may have finished while we waited for the lock
+        if not force and seeded_version(engine) == version:
+            print(f"⏩ Seed version {version} applied by another worker")
+            return False
+
+        # Still held by another worker (seeding slowly): never seed alongside it
+        if not acquired:
+            print(f"⚠️ Seed lock not acquired within {SEED_LOCK_TIMEOUT}s, skipping startup seeding (retried on next boot)")
+            return False
+
+        began = clock.perf_counter()
+        results = [step() for step in steps]
+        seconds = round(clock.perf_counter() - began, 3)
+
+        if any(result is False for result in results):
+            print(f"❌ Startup seeding incomplete after {seconds}s, will retry on next boot")
+            return True
+
+        mark_seeded(engine, version, seconds)
+        print(f"✅ Startup seeding v{version} applied in {seconds}s")
+        return True
@@ -0,0 +1,319 @@
+# app/services/email_outbox_service.py
+
+"""
+Transactional email outbox.
+
+Request handlers call enqueue_email() inside the transaction that makes the
+change (e.g. a candidate status update), so the email is stored if and only
+if the change commits and survives worker restarts. A separate worker drains
+the table:
+
+    python -m app.services.email_outbox_service --once     # one pass, then exit
+    python -m app.services.email_outbox_service --poll 5   # run forever
+
+Each pass claims up to EMAIL_OUTBOX_BATCH_SIZE due rows (FOR UPDATE SKIP
+LOCKED, so several workers can share the table), sends them on
+EMAIL_OUTBOX_CONCURRENCY threads and records the outcome in one commit.
+Failures are retried with exponential backoff (EMAIL_OUTBOX_BACKOFF_SECONDS,
+doubling, capped at EMAIL_OUTBOX_MAX_BACKOFF_SECONDS) until
+EMAIL_OUTBOX_MAX_ATTEMPTS, then marked failed. Rows left in "sending" by a
+crashed worker are reclaimed after EMAIL_OUTBOX_LOCK_TIMEOUT seconds.
+
+dedupe_key makes enqueueing idempotent: the same key is queued (and sent)
+once. Candidate status emails are keyed on the transition (see
+candidate_status_keys), so a retried or concurrent copy of one status change
+sends one email, and a later change back to the same status sends another.
+"""
+
+import argparse
+import os
+import time as clock
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import and_, func, insert, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.email_outbox_m import EmailOutbox
+
+
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 50))
+EMAIL_OUTBOX_CONCURRENCY = int(os.getenv("EMAIL_OUTBOX_CONCURRENCY", 5))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+EMAIL_OUTBOX_BACKOFF_SECONDS = int(os.getenv("EMAIL_OUTBOX_BACKOFF_SECONDS", 30))
+EMAIL_OUTBOX_MAX_BACKOFF_SECONDS = int(os.getenv("EMAIL_OUTBOX_MAX_BACKOFF_SECONDS", 3600))
+EMAIL_OUTBOX_LOCK_TIMEOUT = int(os.getenv("EMAIL_OUTBOX_LOCK_TIMEOUT", 300))
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def normalize_status(status: Optional[str]) -> str:
+    """ "accepted" / " Accepted" → "accepted"; None → "none"."""
+    return (status or "none").strip().casefold()
+
+
+def candidate_status_key(candidate_id: int, sequence: int, previous_status: Optional[str], status: str,
+                         template: str) -> str:
+    """
+    One email of one status transition. sequence = the candidate's emails
+    queued before it, so A → R → A gets a new key for the second acceptance.
+    """
+    return (f"candidate:{candidate_id}:status:{sequence}:"
+            f"{normalize_status(previous_status)}:{normalize_status(status)}:{template}")
+
+
+def candidate_status_keys(db: Session, transitions: Iterable[tuple]) -> Dict[int, str]:
+    """
+    (candidate_id, previous_status, status, template) → {candidate_id: dedupe_key},
+    with one count query for all of them. Call before the new emails are queued.
+    """
+    transitions = list(transitions)
+    sequences = dict(
+        db.query(EmailOutbox.candidate_id, func.count(EmailOutbox.id))
+        .filter(EmailOutbox.candidate_id.in_([transition[0] for transition in transitions]))
+        .group_by(EmailOutbox.candidate_id)
+        .all()
+    ) if transitions else {}
+
+    return {
+        candidate_id: candidate_status_key(candidate_id, sequences.get(candidate_id, 0), previous, status, template)
+        for candidate_id, previous, status, template in transitions
+    }
+
+
+# ---------------------------------------------------
+# ENQUEUE (inside the caller's transaction, no commit)
+# ---------------------------------------------------
+def enqueue_email(
+    db: Session,
+    to_email: str,
+    subject: str,
+    html_body: str,
+    dedupe_key: Optional[str] = None,
+    candidate_id: Optional[int] = None,
+) -> EmailOutbox:
+    """Queue one email; with a dedupe_key already queued, the existing row is returned."""
+    if dedupe_key is not None:
+        existing = db.query(EmailOutbox).filter(EmailOutbox.dedupe_key == dedupe_key).first()
+        if existing is not None:
+            return existing
+
+    message = EmailOutbox(
+        dedupe_key=dedupe_key,
+        candidate_id=candidate_id,
+        to_email=to_email,
+        subject=subject,
+        html_body=html_body,
+        status="pending",
+        attempts=0,
+        next_attempt_at=_now(),
+    )
+
+    # Savepoint: a concurrent request queuing the same key must not roll back ours
+    try:
+        with db.begin_nested():
+            db.add(message)
+    except IntegrityError:
+        return db.query(EmailOutbox).filter(EmailOutbox.dedupe_key == dedupe_key).one()
+    return message
+
+
+def enqueue_emails(db: Session, messages: List[dict]) -> int:
+    """
+    Queue many emails with one dedupe lookup and one multi-row INSERT.
+    messages: dicts of enqueue_email's arguments. Returns how many were new.
+    """
+    keys = [message["dedupe_key"] for message in messages if message.get("dedupe_key")]
+    queued = set()
+    if keys:
+        queued = {
+            key for (key,) in db.query(EmailOutbox.dedupe_key).filter(EmailOutbox.dedupe_key.in_(keys))
+        }
+
+    now = _now()
+    rows = []
+    for message in messages:
+        key = message.get("dedupe_key")
+        if key is not None:
+            if key in queued:
+                continue
+            queued.add(key)
+        rows.append({
+            "dedupe_key": key,
+            "candidate_id": message.get("candidate_id"),
+            "to_email": message["to_email"],
+            "subject": message["subject"],
+            "html_body": message["html_body"],
+            "status": "pending",
+            "attempts": 0,
+            "next_attempt_at": now,
+        })
+
+    if not rows:
+        return 0
+    try:
+        with db.begin_nested():
+            db.execute(insert(EmailOutbox), rows)
+    except IntegrityError:
+        # A concurrent request queued some of the same keys → row by row
+        existing = {row.id for row in db.query(EmailOutbox.id).filter(EmailOutbox.dedupe_key.in_(keys))}
+        fields = ("to_email", "subject", "html_body", "dedupe_key", "candidate_id")
+        created = [enqueue_email(db, **{field: row[field] for field in fields}) for row in rows]
+        db.flush()
+        return sum(1 for message in created if message.id not in existing)
+    return len(rows)
+
+
+# ---------------------------------------------------
+# WORKER
+# ---------------------------------------------------
+class OutboxMessage(NamedTuple):
+    """Detached copy of a claimed row, safe to hand to sender threads."""
+    id: int
+    to_email: str
+    subject: str
+    html_body: str
+    attempts: int
+
+
+def backoff_seconds(attempts: int) -> int:
+    return min(EMAIL_OUTBOX_MAX_BACKOFF_SECONDS, EMAIL_OUTBOX_BACKOFF_SECONDS * 2 ** max(0, attempts - 1))
+
+
+def claim_batch(db: Session, batch_size: int = EMAIL_OUTBOX_BATCH_SIZE, now: Optional[datetime] = None) -> List[OutboxMessage]:
+    """Lock due rows, mark them "sending" and commit, so no other worker takes them."""
+    now = now or _now()
+    stale = now - timedelta(seconds=EMAIL_OUTBOX_LOCK_TIMEOUT)
+
+    rows = (
+        db.query(EmailOutbox)
+        .filter(or_(
+            and_(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now),
+            and_(EmailOutbox.status == "sending", EmailOutbox.locked_at < stale),
+        ))
+        .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+    for row in rows:
+        row.status = "sending"
+        row.locked_at = now
+        row.attempts += 1  # counted at claim, so a crash mid-send still counts
+
+    messages = [OutboxMessage(row.id, row.to_email, row.subject, row.html_body, row.attempts) for row in rows]
+    db.commit()
+    return messages
+
+
+def record_results(db: Session, results: List[tuple], max_attempts: int = EMAIL_OUTBOX_MAX_ATTEMPTS,
+                   now: Optional[datetime] = None) -> dict:
+    """results: (message, error or None) → sent / retry later / failed, one commit."""
+    now = now or _now()
+    stats = {"sent": 0, "retried": 0, "failed": 0}
+    rows = {
+        row.id: row
+        for row in db.query(EmailOutbox).filter(EmailOutbox.id.in_([message.id for message, _ in results]))
+    }
+
+    for message, error in results:
+        row = rows[message.id]
+        row.locked_at = None
+        if error is None:
+            row.status = "sent"
+            row.sent_at = now
+            row.last_error = None
+            stats["sent"] += 1
+        elif message.attempts >= max_attempts:
+            row.status = "failed"
+            row.last_error = error
+            stats["failed"] += 1
+        else:
+            row.status = "pending"
+            row.next_attempt_at = now + timedelta(seconds=backoff_seconds(message.attempts))
+            row.last_error = error
+            stats["retried"] += 1
+
+    db.commit()
+    return stats
+
+
+def default_sender(message: OutboxMessage):
+    # Imported on first send: the web process never loads the SES client for this
+    from app.utils.email_ses import send_email_ses
+
+    send_email_ses(message.subject, message.html_body, message.to_email)
+
+
+def drain_outbox(
+    session_factory: Callable[[], Session] = SessionLocal,
+    sender: Callable[[OutboxMessage], None] = default_sender,
+    batch_size: int = EMAIL_OUTBOX_BATCH_SIZE,
+    concurrency: int = EMAIL_OUTBOX_CONCURRENCY,
+    max_attempts: int = EMAIL_OUTBOX_MAX_ATTEMPTS,
+    max_batches: Optional[int] = None,
+) -> dict:
+    """Send everything currently due, batch by batch; returns totals."""
+    totals = {"batches": 0, "claimed": 0, "sent": 0, "retried": 0, "failed": 0}
+
+    def send(message: OutboxMessage):
+        try:
+            sender(message)
+            return message, None
+        except Exception as e:
+            return message, f"{type(e).__name__}: {e}"[:2000]
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="email-outbox") as pool:
+        while max_batches is None or totals["batches"] < max_batches:
+            db = session_factory()
+            try:
+                messages = claim_batch(db, batch_size)
+                if not messages:
+                    break
+
+                results = list(pool.map(send, messages))
+                stats = record_results(db, results, max_attempts)
+            finally:
+                db.close()
+
+            totals["batches"] += 1
+            totals["claimed"] += len(messages)
+            for key, value in stats.items():
+                totals[key] += value
+
+    return totals
+
+
+def run_worker(poll_interval: float = 5.0, **kwargs):
+    print(f"📬 Email outbox worker started (poll every {poll_interval}s)")
+    while True:
+        totals = drain_outbox(**kwargs)
+        if totals["claimed"]:
+            print(f"📨 sent {totals['sent']}, retrying {totals['retried']}, failed {totals['failed']}")
+        else:
+            clock.sleep(poll_interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drain the email outbox")
+    parser.add_argument("--once", action="store_true", help="one pass over due emails, then exit")
+    parser.add_argument("--poll", type=float, default=5.0, help="seconds between polls when idle")
+    parser.add_argument("--batch-size", type=int, default=EMAIL_OUTBOX_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=EMAIL_OUTBOX_CONCURRENCY)
+    args = parser.parse_args(argv)
+
+    options = {"batch_size": args.batch_size, "concurrency": args.concurrency}
+    if args.once:
+        print(drain_outbox(**options))
+    else:
+        run_worker(args.poll, **options)
+
+
+if __name__ == "__main__":
+    main()
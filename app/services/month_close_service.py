@@ -0,0 +1,394 @@
+# app/services/month_close_service.py
+
+"""
+Parallel month close: attendance summaries → payroll, sharded across a
+ProcessPoolExecutor.
+
+Every shard is a row in month_close_shards, so a crashed run is resumed by
+re-running the job: shards already "done" are skipped, the rest (pending /
+running / failed) are processed again. Both steps are idempotent (summary
+upsert + payroll refresh), so re-running a half-finished shard is safe.
+
+A job is claimed (status → "running") with one conditional UPDATE before
+any shard runs, whichever entry point starts it, so two runners never work
+the same job; a second job for a month / scope that still has one pending or
+running is refused.
+
+CLI:
+    python -m app.services.month_close_service 2025 12 --organization-id 1 --workers 4
+    python -m app.services.month_close_service --resume 17 [--force]
+"""
+
+import os
+import time as clock
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from typing import Callable, List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.database import DATABASE_URL, SessionLocal
+from app.models.month_close_m import MonthCloseJob, MonthCloseShard
+from app.models.user_m import User
+from app.utils.attendance_utils import calculate_monthly_summaries_bulk, month_bounds
+from app.utils.payroll_attendance_utils import generate_payroll_bulk
+
+
+DEFAULT_SHARD_SIZE = 200
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+ACTIVE_STATUSES = ("pending", "running")
+
+
+class MonthCloseBusy(ValueError):
+    """The job (or another one for the same month / scope) is already running."""
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+# ---------------------------------------------------
+# JOB CREATION
+# ---------------------------------------------------
+def create_month_close_job(
+    db: Session,
+    year: int,
+    month: int,
+    organization_id: Optional[int] = None,
+    branch_id: Optional[int] = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    workers: int = DEFAULT_WORKERS,
+    created_by: str = "system",
+) -> MonthCloseJob:
+    """Snapshot the users in scope and split them into shards (commits)."""
+    month_start, _, _ = month_bounds(year, month)
+
+    active = db.query(MonthCloseJob.id).filter(
+        MonthCloseJob.month == month_start,
+        MonthCloseJob.organization_id == organization_id,
+        MonthCloseJob.branch_id == branch_id,
+        MonthCloseJob.status.in_(ACTIVE_STATUSES)
+    ).first()
+    if active:
+        raise MonthCloseBusy(f"Month close job {active.id} is already open for this month")
+
+    query = db.query(User.id).filter(User.biometric_id != None)
+    if organization_id is not None:
+        query = query.filter(User.organization_id == organization_id)
+    if branch_id is not None:
+        query = query.filter(User.branch_id == branch_id)
+
+    user_ids = [row.id for row in query.order_by(User.id)]
+    shards = [user_ids[i:i + shard_size] for i in range(0, len(user_ids), shard_size)]
+
+    job = MonthCloseJob(
+        month=month_start,
+        organization_id=organization_id,
+        branch_id=branch_id,
+        status="pending",
+        total_users=len(user_ids),
+        processed_users=0,
+        total_shards=len(shards),
+        completed_shards=0,
+        workers=workers,
+        created_by=created_by,
+    )
+    db.add(job)
+    db.flush()
+
+    db.bulk_insert_mappings(MonthCloseShard, [
+        {"job_id": job.id, "shard_no": no, "user_ids": ids, "status": "pending", "attempts": 0}
+        for no, ids in enumerate(shards, start=1)
+    ])
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+# ---------------------------------------------------
+# SHARD (runs inside a worker process)
+# ---------------------------------------------------
+_worker_session: Optional[sessionmaker] = None
+
+
+def _init_worker(database_url: str):
+    """Each worker process gets its own engine / connection pool."""
+    global _worker_session
+    engine = create_engine(database_url, pool_pre_ping=True)
+    _worker_session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _run_shard_in_worker(shard_id: int) -> dict:
+    return run_shard(_worker_session, shard_id)
+
+
+def run_shard(session_factory: Callable[[], Session], shard_id: int) -> dict:
+    db = session_factory()
+    try:
+        shard = db.get(MonthCloseShard, shard_id)
+        if shard.status == "done":
+            return shard_report(shard)
+
+        job = shard.job
+        month_start = job.month
+        created_by = job.created_by or "month_close"
+
+        shard.status = "running"
+        shard.attempts = (shard.attempts or 0) + 1
+        shard.worker_pid = os.getpid()
+        shard.started_at = _now()
+        shard.error = None
+        db.commit()
+
+        try:
+            began = clock.perf_counter()
+            calculate_monthly_summaries_bulk(
+                db, month_start.year, month_start.month,
+                user_ids=shard.user_ids, created_by=created_by
+            )  # commits
+            attendance_done = clock.perf_counter()
+
+            payroll = generate_payroll_bulk(
+                db, month_start.strftime("%Y-%m"), user_ids=shard.user_ids, overwrite=True
+            )
+            shard.payrolls_generated = payroll["created"] + payroll["updated"]
+            shard.attendance_seconds = round(attendance_done - began, 3)
+            shard.payroll_seconds = round(clock.perf_counter() - attendance_done, 3)
+            shard.status = "done"
+            shard.finished_at = _now()
+            db.commit()
+
+        except Exception as e:
+            db.rollback()
+            shard = db.get(MonthCloseShard, shard_id)
+            shard.status = "failed"
+            shard.error = repr(e)[:2000]
+            shard.finished_at = _now()
+            db.commit()
+
+        return shard_report(shard)
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------
+# JOB RUNNER (parent process)
+# ---------------------------------------------------
+def claim_month_close_job(db: Session, job_id: int, force: bool = False) -> bool:
+    """
+    Mark the job "running" unless it is completed or already running (commits).
+    force takes over a job left "running" by a dead process. False → not claimed.
+    """
+    if db.get(MonthCloseJob, job_id) is None:
+        raise ValueError(f"Month close job {job_id} not found")
+
+    unclaimable = ["completed"] if force else ["completed", "running"]
+    claimed = db.query(MonthCloseJob).filter(
+        MonthCloseJob.id == job_id,
+        MonthCloseJob.status.notin_(unclaimable)
+    ).update({MonthCloseJob.status: "running"}, synchronize_session=False)
+    db.commit()
+    return bool(claimed)
+
+
+def _refresh_progress(db: Session, job: MonthCloseJob):
+    done = db.query(MonthCloseShard.user_ids).filter(
+        MonthCloseShard.job_id == job.id,
+        MonthCloseShard.status == "done"
+    ).all()
+    job.completed_shards = len(done)
+    job.processed_users = sum(len(row.user_ids) for row in done)
+    db.commit()
+
+
+def run_month_close(
+    job_id: int,
+    workers: Optional[int] = None,
+    session_factory: Callable[[], Session] = SessionLocal,
+    database_url: str = DATABASE_URL,
+    force: bool = False,
+    claimed: bool = False,
+) -> dict:
+    """
+    Process every shard that is not done yet (fresh run or resume).
+    workers <= 1 runs shards in-process with session_factory.
+
+    The job is claimed first (see claim_month_close_job); claimed=True when
+    the caller already did. MonthCloseBusy when it cannot be claimed.
+    """
+    if not claimed:
+        db = session_factory()
+        try:
+            if not claim_month_close_job(db, job_id, force=force):
+                raise MonthCloseBusy(f"Month close job {job_id} is already running or completed")
+        finally:
+            db.close()
+
+    db = session_factory()
+    try:
+        job = db.get(MonthCloseJob, job_id)
+        if job is None:
+            raise ValueError(f"Month close job {job_id} not found")
+
+        workers = workers or job.workers or 1
+
+        # Anything not "done" is re-run: "running" here means a previous run died
+        shard_ids = [
+            row.id for row in db.query(MonthCloseShard.id).filter(
+                MonthCloseShard.job_id == job_id,
+                MonthCloseShard.status != "done"
+            ).order_by(MonthCloseShard.shard_no)
+        ]
+
+        job.status = "running"
+        job.workers = workers
+        job.started_at = job.started_at or _now()
+        job.finished_at = None
+        db.commit()
+
+        if workers <= 1:
+            for shard_id in shard_ids:
+                run_shard(session_factory, shard_id)
+                _refresh_progress(db, job)
+        else:
+            # spawn: never fork a parent that holds pooled connections
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(database_url,),
+            ) as pool:
+                futures = [pool.submit(_run_shard_in_worker, shard_id) for shard_id in shard_ids]
+                for future in as_completed(futures):
+                    future.result()
+                    _refresh_progress(db, job)
+
+        _refresh_progress(db, job)
+        job.status = "completed" if job.completed_shards == job.total_shards else "failed"
+        job.finished_at = _now()
+        db.commit()
+
+        return job_report(db, job_id)
+    except Exception:
+        db.rollback()
+        job = db.get(MonthCloseJob, job_id)
+        if job is not None:
+            job.status = "failed"
+            job.finished_at = _now()
+            db.commit()
+        raise
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------
+# REPORTING
+# ---------------------------------------------------
+def shard_report(shard: MonthCloseShard) -> dict:
+    return {
+        "shard_no": shard.shard_no,
+        "status": shard.status,
+        "users": len(shard.user_ids or []),
+        "attempts": shard.attempts or 0,
+        "attendance_seconds": shard.attendance_seconds,
+        "payroll_seconds": shard.payroll_seconds,
+        "payrolls_generated": shard.payrolls_generated or 0,
+        "worker_pid": shard.worker_pid,
+        "error": shard.error,
+    }
+
+
+def job_report(db: Session, job_id: int) -> Optional[dict]:
+    job = db.get(MonthCloseJob, job_id)
+    if job is None:
+        return None
+
+    shards = db.query(MonthCloseShard).filter(
+        MonthCloseShard.job_id == job_id
+    ).order_by(MonthCloseShard.shard_no).all()
+
+    elapsed = None
+    if job.started_at:
+        finished = _aware(job.finished_at) if job.finished_at else _now()
+        elapsed = round((finished - _aware(job.started_at)).total_seconds(), 3)
+
+    return {
+        "job_id": job.id,
+        "month": job.month,
+        "organization_id": job.organization_id,
+        "branch_id": job.branch_id,
+        "status": job.status,
+        "workers": job.workers,
+        "total_users": job.total_users,
+        "processed_users": job.processed_users or 0,
+        "total_shards": job.total_shards,
+        "completed_shards": job.completed_shards or 0,
+        "progress": round(100 * (job.completed_shards or 0) / job.total_shards, 1) if job.total_shards else 100.0,
+        "elapsed_seconds": elapsed,
+        "shards": [shard_report(s) for s in shards],
+    }
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite / MySQL hand back naive datetimes for timezone=True columns
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def main(argv: Optional[List[str]] = None):
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Parallel attendance + payroll month close")
+    parser.add_argument("year", type=int, nargs="?")
+    parser.add_argument("month", type=int, nargs="?")
+    parser.add_argument("--organization-id", type=int)
+    parser.add_argument("--branch-id", type=int)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE)
+    parser.add_argument("--resume", type=int, metavar="JOB_ID", help="Resume an unfinished job")
+    parser.add_argument("--force", action="store_true", help="Resume a job left 'running' by a dead process")
+    args = parser.parse_args(argv)
+
+    if args.resume is None:
+        if args.year is None or args.month is None:
+            parser.error("year and month are required unless --resume is given")
+
+        db = SessionLocal()
+        try:
+            job = create_month_close_job(
+                db, args.year, args.month,
+                organization_id=args.organization_id,
+                branch_id=args.branch_id,
+                shard_size=args.shard_size,
+                workers=args.workers,
+                created_by="cli",
+            )
+            job_id = job.id
+        except MonthCloseBusy as e:
+            parser.exit(1, f"{e}\n")
+        finally:
+            db.close()
+        print(f"Month close job {job_id} created")
+    else:
+        job_id = args.resume
+
+    try:
+        report = run_month_close(job_id, workers=args.workers, force=args.force)
+    except ValueError as e:
+        parser.exit(1, f"{e}\n")
+
+    for shard in report["shards"]:
+        print(f"shard {shard['shard_no']:>4}  {shard['status']:<8} users={shard['users']:<5} "
+              f"attendance={shard['attendance_seconds']}s payroll={shard['payroll_seconds']}s"
+              + (f"  error={shard['error']}" if shard["error"] else ""))
+    print(json.dumps({k: v for k, v in report.items() if k != "shards"}, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+# app/services/resume_upload_service.py
+
+"""
+Direct-to-S3 resume uploads (presigned POST), so resume bytes never pass
+through an API worker.
+
+    1. POST /candidates/resume-upload      → {url, fields, upload_token, ...}
+    2. client POSTs the file to `url` with `fields` (S3 enforces prefix,
+       size range, content type and expiry)
+    3. apply_candidate(resume_upload_token=...) or
+       POST /candidates/{id}/resume/confirm → object checked (size, magic
+       bytes), moved out of pending/ and attached to the candidate
+
+Uploads land under candidate_resumes/pending/. Confirmed files are copied
+server-side to candidate_resumes/ (no bytes through the worker); anything left
+in pending/ is an abandoned upload and expires through the bucket lifecycle
+rule installed by:
+
+    python -m app.services.resume_upload_service --apply-lifecycle
+
+upload_token is an HMAC (SECRET_KEY) over the pending key and its expiry, so a
+confirm call can only attach an object this API handed out. Without SECRET_KEY
+both endpoints answer 503.
+"""
+
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time as clock
+from typing import Callable, Optional
+from uuid import uuid4
+
+from fastapi import HTTPException
+
+from app.config import SECRET_KEY, settings
+from app.s3_helper import get_s3_client
+from app.services.s3_upload_service import RESUME_TYPES, S3_UPLOAD_MAX_BYTES, sniff_file_type
+
+
+RESUME_PREFIX = "candidate_resumes/"
+PENDING_PREFIX = f"{RESUME_PREFIX}pending/"
+
+RESUME_UPLOAD_EXPIRES = int(os.getenv("RESUME_UPLOAD_EXPIRES", 600))            # seconds the policy is valid
+RESUME_PENDING_EXPIRE_DAYS = int(os.getenv("RESUME_PENDING_EXPIRE_DAYS", 1))    # lifecycle cleanup of pending/
+LIFECYCLE_RULE_ID = "expire-pending-candidate-resumes"
+
+CONTENT_TYPES = {"pdf": "application/pdf", "jpg": "image/jpeg", "png": "image/png"}
+
+
+# ---------------------------------------------------
+# UPLOAD TOKEN
+# ---------------------------------------------------
+def _signature(payload: bytes) -> str:
+    # No key → anyone could mint tokens; refuse instead of signing with ""
+    if not SECRET_KEY:
+        raise HTTPException(status_code=503, detail="Resume uploads are not configured (SECRET_KEY missing)")
+    secret = SECRET_KEY.encode()
+    return base64.urlsafe_b64encode(hmac.new(secret, payload, hashlib.sha256).digest()).decode().rstrip("=")
+
+
+def sign_upload_token(key: str, expires_at: int) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({"key": key, "exp": expires_at}).encode()).decode().rstrip("=")
+    return f"{payload}.{_signature(payload.encode())}"
+
+
+def read_upload_token(token: str) -> str:
+    """Pending key from a token this API issued; 400 when forged or expired."""
+    try:
+        payload, signature = token.split(".", 1)
+        if not hmac.compare_digest(signature, _signature(payload.encode())):
+            raise ValueError("bad signature")
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        key = claims["key"]
+        expires_at = int(claims["exp"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid upload token")
+
+    # The object may be confirmed a while after the upload itself finished
+    if expires_at + RESUME_PENDING_EXPIRE_DAYS * 86400 < clock.time():
+        raise HTTPException(status_code=400, detail="Upload token expired")
+    if not key.startswith(PENDING_PREFIX):
+        raise HTTPException(status_code=400, detail="Invalid upload token")
+    return key
+
+
+# ---------------------------------------------------
+# SERVICE
+# ---------------------------------------------------
+class ResumeUploadService:
+
+    def __init__(
+        self,
+        client_factory: Callable = get_s3_client,
+        bucket: Optional[str] = None,
+        region: Optional[str] = None,
+        max_bytes: int = S3_UPLOAD_MAX_BYTES,
+        expires_in: int = RESUME_UPLOAD_EXPIRES,
+    ):
+        self.client_factory = client_factory
+        self._bucket = bucket
+        self._region = region
+        self.max_bytes = max_bytes
+        self.expires_in = expires_in
+
+    @property
+    def bucket(self) -> str:
+        return self._bucket or settings.BUCKET_NAME_RESUME
+
+    @property
+    def region(self) -> str:
+        return self._region or settings.AWS_REGION_RESUME
+
+    def object_url(self, key: str) -> str:
+        return f"https://{self.bucket}.s3.{self.region}.amazonaws.com/{key}"
+
+    def create_upload(self, file_type: str) -> dict:
+        """Presigned POST for one resume under pending/ (no S3 round trip)."""
+        file_type = file_type.lower().replace("jpeg", "jpg")
+        if file_type not in RESUME_TYPES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid file type. Allowed: {', '.join(RESUME_TYPES)}"
+            )
+
+        key = f"{PENDING_PREFIX}{uuid4()}.{file_type}"
+        content_type = CONTENT_TYPES[file_type]
+        post = self.client_factory().generate_presigned_post(
+            Bucket=self.bucket,
+            Key=key,
+            Fields={"Content-Type": content_type},
+            Conditions=[
+                {"Content-Type": content_type},
+                ["starts-with", "$key", PENDING_PREFIX],
+                ["content-length-range", 1, self.max_bytes],
+            ],
+            ExpiresIn=self.expires_in,
+        )
+
+        return {
+            "url": post["url"],
+            "fields": post["fields"],
+            "key": key,
+            "upload_token": sign_upload_token(key, int(clock.time()) + self.expires_in),
+            "expires_in": self.expires_in,
+            "max_bytes": self.max_bytes,
+        }
+
+    def confirm_upload(self, upload_token: str) -> str:
+        """
+        Verify the uploaded object and move it to its final key; returns the
+        URL to store on the candidate. Blocking (boto3) → run in a thread.
+        """
+        pending_key = read_upload_token(upload_token)
+        client = self.client_factory()
+
+        try:
+            head = client.head_object(Bucket=self.bucket, Key=pending_key)
+        except client.exceptions.ClientError:
+            raise HTTPException(status_code=404, detail="Uploaded file not found")
+
+        if head["ContentLength"] <= 0:
+            raise HTTPException(status_code=400, detail="Uploaded file is empty")
+        if head["ContentLength"] > self.max_bytes:
+            raise HTTPException(status_code=413, detail="File too large")
+
+        # Only the first bytes are fetched, enough for the signature
+        first = client.get_object(Bucket=self.bucket, Key=pending_key, Range="bytes=0-15")["Body"].read()
+        detected = sniff_file_type(first)
+        if detected is None or not pending_key.endswith(f".{detected[0]}"):
+            client.delete_object(Bucket=self.bucket, Key=pending_key)
+            raise HTTPException(status_code=400, detail="Uploaded file content does not match its type")
+
+        final_key = RESUME_PREFIX + pending_key[len(PENDING_PREFIX):]
+        client.copy_object(
+            Bucket=self.bucket,
+            Key=final_key,
+            CopySource={"Bucket": self.bucket, "Key": pending_key},
+            ContentType=detected[1],
+            MetadataDirective="REPLACE",
+        )
+        client.delete_object(Bucket=self.bucket, Key=pending_key)
+        return self.object_url(final_key)
+
+    # -------- lifecycle --------
+    def apply_lifecycle_rule(self, days: int = RESUME_PENDING_EXPIRE_DAYS) -> dict:
+        """Expire abandoned pending/ uploads; other lifecycle rules are kept."""
+        client = self.client_factory()
+        try:
+            rules = client.get_bucket_lifecycle_configuration(Bucket=self.bucket)["Rules"]
+        except client.exceptions.ClientError:
+            rules = []  # bucket has no lifecycle configuration yet
+
+        rule = {
+            "ID": LIFECYCLE_RULE_ID,
+            "Filter": {"Prefix": PENDING_PREFIX},
+            "Status": "Enabled",
+            "Expiration": {"Days": days},
+            "AbortIncompleteMultipartUpload": {"DaysAfterInitiation": days},
+        }
+        rules = [existing for existing in rules if existing.get("ID") != LIFECYCLE_RULE_ID] + [rule]
+        client.put_bucket_lifecycle_configuration(Bucket=self.bucket, LifecycleConfiguration={"Rules": rules})
+        return rule
+
+
+resume_upload_service = ResumeUploadService()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Candidate resume upload maintenance")
+    parser.add_argument("--apply-lifecycle", action="store_true",
+                        help=f"install the rule expiring {PENDING_PREFIX} objects")
+    parser.add_argument("--days", type=int, default=RESUME_PENDING_EXPIRE_DAYS)
+    args = parser.parse_args(argv)
+
+    if not args.apply_lifecycle:
+        parser.print_help()
+        return
+
+    rule = resume_upload_service.apply_lifecycle_rule(args.days)
+    print(f"✅ Lifecycle rule '{rule['ID']}' on {resume_upload_service.bucket}: "
+          f"{PENDING_PREFIX} expires after {args.days} day(s)")
+
+
+if __name__ == "__main__":
+    main()
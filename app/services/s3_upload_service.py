@@ -0,0 +1,198 @@
+# app/services/s3_upload_service.py
+
+"""
+Async S3 uploads for request handlers.
+
+The UploadFile is read chunk by chunk and each chunk goes to S3 as one part
+of a multipart upload on a bounded thread pool, so:
+- the event loop never blocks on boto3 (it only awaits the pool)
+- memory per upload is bounded by part_size × parts in flight
+- the size limit is enforced while reading; an oversized file is aborted
+  before it is fully sent and no object is left behind
+- the type comes from the file's magic bytes, not its name or the
+  client-supplied content type
+
+Files that fit in one part go up with a single put_object.
+
+Settings: S3_UPLOAD_MAX_BYTES (10 MiB), S3_UPLOAD_PART_SIZE (8 MiB, S3 minimum
+5 MiB), S3_UPLOAD_WORKERS (4 threads shared by all uploads of the process).
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional, Tuple
+from uuid import uuid4
+
+from fastapi import HTTPException, UploadFile
+
+from app.config import settings
+from app.s3_helper import get_s3_client
+
+
+MIN_PART_SIZE = 5 * 1024 * 1024  # S3 rejects smaller parts (except the last)
+
+S3_UPLOAD_MAX_BYTES = int(os.getenv("S3_UPLOAD_MAX_BYTES", 10 * 1024 * 1024))
+S3_UPLOAD_PART_SIZE = max(MIN_PART_SIZE, int(os.getenv("S3_UPLOAD_PART_SIZE", 8 * 1024 * 1024)))
+S3_UPLOAD_WORKERS = int(os.getenv("S3_UPLOAD_WORKERS", 4))
+
+# extension → (magic bytes, content type)
+FILE_SIGNATURES = {
+    "pdf": (b"%PDF-", "application/pdf"),
+    "png": (b"\x89PNG\r\n\x1a\n", "image/png"),
+    "jpg": (b"\xff\xd8\xff", "image/jpeg"),
+}
+RESUME_TYPES = ("pdf", "jpg", "png")
+
+
+def sniff_file_type(head: bytes) -> Optional[Tuple[str, str]]:
+    """(extension, content type) from the first bytes, None if unknown."""
+    for extension, (magic, content_type) in FILE_SIGNATURES.items():
+        if head.startswith(magic):
+            return extension, content_type
+    return None
+
+
+# ---------------------------------------------------
+# THREAD POOL (shared, created on first upload)
+# ---------------------------------------------------
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_upload_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=S3_UPLOAD_WORKERS, thread_name_prefix="s3-upload")
+        return _executor
+
+
+# ---------------------------------------------------
+# SERVICE
+# ---------------------------------------------------
+class S3UploadService:
+
+    def __init__(
+        self,
+        client_factory: Callable = get_s3_client,
+        bucket: Optional[str] = None,
+        region: Optional[str] = None,
+        max_bytes: int = S3_UPLOAD_MAX_BYTES,
+        part_size: int = S3_UPLOAD_PART_SIZE,
+        max_parts_in_flight: int = S3_UPLOAD_WORKERS,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        self.client_factory = client_factory
+        self._bucket = bucket
+        self._region = region
+        self.max_bytes = max_bytes
+        self.part_size = part_size
+        self.max_parts_in_flight = max(1, max_parts_in_flight)
+        self._executor = executor
+
+    @property
+    def bucket(self) -> str:
+        return self._bucket or settings.BUCKET_NAME_RESUME
+
+    @property
+    def region(self) -> str:
+        return self._region or settings.AWS_REGION_RESUME
+
+    def object_url(self, key: str) -> str:
+        return f"https://{self.bucket}.s3.{self.region}.amazonaws.com/{key}"
+
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        executor = self._executor or get_upload_executor()
+        return await loop.run_in_executor(executor, lambda: fn(*args, **kwargs))
+
+    def _too_large(self):
+        return HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum size is {self.max_bytes // (1024 * 1024)} MB"
+        )
+
+    async def upload(self, file: UploadFile, folder: str, allowed: Iterable[str] = RESUME_TYPES) -> str:
+        """Stream `file` to `<folder>/<uuid>.<ext>`; returns the object URL."""
+        if not file or not file.filename:
+            raise HTTPException(status_code=400, detail="File is required")
+
+        first = await file.read(self.part_size)
+        if not first:
+            raise HTTPException(status_code=400, detail="File is empty")
+        if len(first) > self.max_bytes:
+            raise self._too_large()
+
+        allowed = tuple(allowed)
+        detected = sniff_file_type(first)
+        if detected is None or detected[0] not in allowed:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid file type. Allowed: {', '.join(allowed)}"
+            )
+        extension, content_type = detected
+
+        key = f"{folder}/{uuid4()}.{extension}"
+        client = self.client_factory()
+
+        if len(first) < self.part_size:
+            # Whole file already in hand → one request
+            await self._run(
+                client.put_object, Bucket=self.bucket, Key=key, Body=first, ContentType=content_type
+            )
+        else:
+            await self._multipart(client, file, key, content_type, first)
+
+        return self.object_url(key)
+
+    async def _multipart(self, client, file: UploadFile, key: str, content_type: str, first: bytes):
+        created = await self._run(
+            client.create_multipart_upload, Bucket=self.bucket, Key=key, ContentType=content_type
+        )
+        upload_id = created["UploadId"]
+        slots = asyncio.Semaphore(self.max_parts_in_flight)
+        pending = []
+
+        async def send(number: int, body: bytes):
+            try:
+                result = await self._run(
+                    client.upload_part,
+                    Bucket=self.bucket, Key=key, UploadId=upload_id, PartNumber=number, Body=body,
+                )
+                return {"PartNumber": number, "ETag": result["ETag"]}
+            finally:
+                slots.release()
+
+        try:
+            chunk, number, total = first, 1, 0
+            while chunk:
+                total += len(chunk)
+                if total > self.max_bytes:
+                    raise self._too_large()
+
+                await slots.acquire()  # bounds memory: at most N parts buffered
+                pending.append(asyncio.ensure_future(send(number, chunk)))
+
+                chunk = await file.read(self.part_size)
+                number += 1
+
+            parts = await asyncio.gather(*pending)
+            await self._run(
+                client.complete_multipart_upload,
+                Bucket=self.bucket, Key=key, UploadId=upload_id,
+                MultipartUpload={"Parts": sorted(parts, key=lambda part: part["PartNumber"])},
+            )
+        except BaseException:
+            # Let in-flight parts finish before aborting, otherwise S3 can keep them
+            await asyncio.gather(*pending, return_exceptions=True)
+            await self._run(client.abort_multipart_upload, Bucket=self.bucket, Key=key, UploadId=upload_id)
+            raise
+
+
+default_upload_service = S3UploadService()
+
+
+async def upload_file(file: UploadFile, folder: str, allowed: Iterable[str] = RESUME_TYPES) -> str:
+    return await default_upload_service.upload(file, folder, allowed)
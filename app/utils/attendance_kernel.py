@@ -0,0 +1,187 @@
+# app/utils/attendance_kernel.py
+
+"""
+Vectorized (NumPy) version of the per-day attendance rules in
+app/utils/attendance_utils.evaluate_day.
+
+Every input is an array shaped (users × days). Times are integer microseconds
+since midnight of the day, so the arithmetic mirrors datetime.combine()
+exactly (including overnight punches and shifts).
+"""
+
+from datetime import date, time
+from typing import Dict, List
+
+import numpy as np
+
+from app.utils.attendance_utils import (
+    DEFAULT_SHIFT,
+    SUMMARY_COUNTERS,
+    AttendanceMonthContext,
+)
+
+
+US_PER_MINUTE = 60 * 1_000_000
+US_PER_DAY = 24 * 60 * US_PER_MINUTE
+
+
+# -------------------------------------------
+# Helpers
+# -------------------------------------------
+def time_to_us(t: time) -> int:
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * 1_000_000 + t.microsecond
+
+
+def _minutes(delta_us):
+    # Same float ops as int(timedelta.total_seconds() / 60) → truncates like int()
+    return (delta_us / 1_000_000 / 60).astype(np.int64)
+
+
+# ---------------------------------------------------
+# INPUT BUILDER
+# ---------------------------------------------------
+def build_day_arrays(contexts: List[AttendanceMonthContext]) -> Dict[str, np.ndarray]:
+    """Flatten month contexts (all for the same month) into (users × days) arrays."""
+    n_users = len(contexts)
+    n_days = contexts[0].days_in_month if contexts else 0
+    shape = (n_users, n_days)
+
+    a = {
+        "has_pair": np.zeros(shape, dtype=bool),
+        "in_us": np.zeros(shape, dtype=np.int64),
+        "out_us": np.zeros(shape, dtype=np.int64),
+        "on_leave": np.zeros(shape, dtype=bool),
+        "half_leave": np.zeros(shape, dtype=bool),
+        "is_holiday": np.zeros(shape, dtype=bool),
+        "is_sunday": np.zeros(shape, dtype=bool),
+        "has_perm": np.zeros(shape, dtype=bool),
+        "perm_from_us": np.zeros(shape, dtype=np.int64),
+        "perm_to_us": np.zeros(shape, dtype=np.int64),
+        "shift_start_us": np.full(shape, time_to_us(DEFAULT_SHIFT.start_time), dtype=np.int64),
+        "shift_end_us": np.full(shape, time_to_us(DEFAULT_SHIFT.end_time), dtype=np.int64),
+        "lag_minutes": np.full(shape, DEFAULT_SHIFT.lag_minutes, dtype=np.int64),
+        "working_minutes": np.full(shape, DEFAULT_SHIFT.working_minutes, dtype=np.int64),
+    }
+
+    for u, ctx in enumerate(contexts):
+        for d, day in enumerate(ctx.days()):
+            times = ctx.punch_map.get(day)
+            if times and len(times) >= 2:
+                a["has_pair"][u, d] = True
+                a["in_us"][u, d] = time_to_us(min(times))
+                a["out_us"][u, d] = time_to_us(max(times))
+
+            if day in ctx.leave_map:
+                a["on_leave"][u, d] = True
+                a["half_leave"][u, d] = ctx.leave_map[day] is True
+
+            a["is_holiday"][u, d] = day in ctx.holiday_dates
+            a["is_sunday"][u, d] = day.weekday() == 6
+
+            perm = ctx.permission_map.get(day)
+            if perm is not None:
+                a["has_perm"][u, d] = True
+                a["perm_from_us"][u, d] = time_to_us(perm.from_time)
+                a["perm_to_us"][u, d] = time_to_us(perm.to_time)
+
+            shift = ctx.shift_for(day)
+            a["shift_start_us"][u, d] = time_to_us(shift.start_time)
+            a["shift_end_us"][u, d] = time_to_us(shift.end_time)
+            a["lag_minutes"][u, d] = shift.lag_minutes
+            a["working_minutes"][u, d] = shift.working_minutes
+
+    return a
+
+
+# ---------------------------------------------------
+# KERNEL
+# ---------------------------------------------------
+def evaluate_days(a: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Per-day counters for every (user, day) cell.
+    Returns SUMMARY_COUNTERS → int64 array shaped like the inputs.
+    """
+    pair = a["has_pair"]
+    on_leave = a["on_leave"]
+
+    full_leave = on_leave & ~a["half_leave"]
+    half_leave = on_leave & a["half_leave"]
+    regular = ~on_leave & ~(a["is_holiday"] | a["is_sunday"])
+    worked_day = regular & pair
+
+    # Punch window (overnight → next day)
+    in_us = a["in_us"]
+    out_us = np.where(a["out_us"] < in_us, a["out_us"] + US_PER_DAY, a["out_us"])
+
+    # Shift window (overnight → next day)
+    start_us = a["shift_start_us"]
+    end_us = np.where(a["shift_end_us"] <= start_us, a["shift_end_us"] + US_PER_DAY, a["shift_end_us"])
+
+    # LATE (uses grace) / EARLY EXIT (NO grace)
+    allowed_in = start_us + a["lag_minutes"] * US_PER_MINUTE
+
+    worked = _minutes(out_us - in_us)
+
+    perm = a["has_perm"]
+    late = np.where(in_us > allowed_in, _minutes(in_us - allowed_in), 0)
+    late = np.where(perm & (allowed_in <= in_us) & (in_us <= a["perm_from_us"]), 0, late)
+
+    early = np.where(out_us < end_us, _minutes(end_us - out_us), 0)
+    early = np.where(perm & (a["perm_to_us"] <= out_us) & (out_us <= end_us), 0, early)
+
+    overtime = np.where(out_us > end_us, _minutes(out_us - end_us), 0)
+
+    # Classification (present/half/absent)
+    working = a["working_minutes"]
+    is_present = worked >= working * 0.80
+    is_half = ~is_present & (worked >= working * 0.50)
+    is_absent = ~is_present & ~is_half
+
+    zero = np.zeros_like(worked)
+
+    return {
+        "present_days": (worked_day & is_present).astype(np.int64),
+        "half_days": ((half_leave & pair) | (worked_day & is_half)).astype(np.int64),
+        "absent_days": (
+            (half_leave & ~pair) | (regular & ~pair) | (worked_day & is_absent)
+        ).astype(np.int64),
+        "holidays": a["is_holiday"].astype(np.int64),
+        "sundays": a["is_sunday"].astype(np.int64),
+        "leaves": full_leave.astype(np.int64),
+        "permissions": (regular & perm).astype(np.int64),
+        "total_work_minutes": np.where((half_leave & pair) | worked_day, worked, zero),
+        "overtime_minutes": np.where(worked_day, overtime, zero),
+        "late_minutes": np.where(worked_day, late, zero),
+        "early_exit_minutes": np.where(worked_day, early, zero),
+    }
+
+
+def day_counters_vectorized(contexts: List[AttendanceMonthContext]) -> Dict[int, Dict[date, Dict[str, int]]]:
+    """user_id → {day → counters}, same values as AttendanceMonthContext.day_counters_map()"""
+    if not contexts:
+        return {}
+
+    per_day = evaluate_days(build_day_arrays(contexts))
+    columns = {key: per_day[key].tolist() for key in SUMMARY_COUNTERS}
+
+    return {
+        ctx.user_id: {
+            day: {key: columns[key][u][d] for key in SUMMARY_COUNTERS}
+            for d, day in enumerate(ctx.days())
+        }
+        for u, ctx in enumerate(contexts)
+    }
+
+
+def month_counters_vectorized(contexts: List[AttendanceMonthContext]) -> Dict[int, Dict[str, int]]:
+    """user_id → monthly counters, same values as AttendanceMonthContext.month_counters()"""
+    if not contexts:
+        return {}
+
+    per_day = evaluate_days(build_day_arrays(contexts))
+    totals = {key: per_day[key].sum(axis=1) for key in SUMMARY_COUNTERS}
+
+    return {
+        ctx.user_id: {key: int(totals[key][u]) for key in SUMMARY_COUNTERS}
+        for u, ctx in enumerate(contexts)
+    }
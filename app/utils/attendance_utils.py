@@ -1,24 +1,56 @@
 # app/utils/attendance_util.py
 
 import calendar
+import threading
+import time as clock
+from collections import OrderedDict, namedtuple
 from datetime import date, datetime, timedelta, time
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import event, func, or_
 
 from app.models.attendance_punch_m import AttendancePunch
 from app.models.holiday_m import Holiday
 from app.models.leavemaster_m import LeaveMaster
+from app.models.leavetype_m import LeaveType
 from app.models.permission_m import Permission
 from app.models.user_m import User
 from app.models.shift_m import Shift
 from app.models.shift_roster_detail_m import ShiftRosterDetail
 from app.models.attendance_summary_m import Attendance
+from app.models.attendance_day_m import AttendanceDay
 
 
 DEFAULT_WORKING_MINUTES = 480
 DEFAULT_LAG_MINUTES = 0
 
+# Keep IN (...) lists well below driver / server limits
+IN_CLAUSE_CHUNK_SIZE = 1000
+
+# Plain (session-free) values kept in month contexts, so contexts can be cached
+ShiftWindow = namedtuple("ShiftWindow", "start_time end_time lag_minutes working_minutes")
+PermissionWindow = namedtuple("PermissionWindow", "from_time to_time reason")
+
+DEFAULT_SHIFT = ShiftWindow(time(9, 0), time(17, 0), DEFAULT_LAG_MINUTES, DEFAULT_WORKING_MINUTES)
+
+# session.info key: month contexts to drop again once the session commits
+CONTEXT_INVALIDATIONS_KEY = "month_context_invalidations"
+
+# Counters stored on the Attendance row (everything except total_days)
+SUMMARY_COUNTERS = (
+    "present_days",
+    "half_days",
+    "absent_days",
+    "holidays",
+    "sundays",
+    "leaves",
+    "permissions",
+    "total_work_minutes",
+    "overtime_minutes",
+    "late_minutes",
+    "early_exit_minutes",
+)
+
 
 # -------------------------------------------
 # Helpers
@@ -29,6 +61,18 @@ def daterange(start: date, end: date):
         start += timedelta(days=1)
 
 
+def chunked(items: List, size: int = IN_CLAUSE_CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def month_bounds(year: int, month: int):
+    """Return (month_start, month_end, days_in_month)"""
+    month_start = date(year, month, 1)
+    _, days_in_month = calendar.monthrange(year, month)
+    return month_start, date(year, month, days_in_month), days_in_month
+
+
 def expand_leave_dates(leave_records: List[LeaveMaster]):
     """Return date → is_half_day (True/False/None)"""
     leave_map = {}
@@ -43,32 +87,300 @@ def expand_leave_dates(leave_records: List[LeaveMaster]):
     return leave_map
 
 
+def empty_counters() -> Dict[str, int]:
+    return dict.fromkeys(SUMMARY_COUNTERS, 0)
+
+
+def summary_status_for(absent: int, late: int) -> str:
+    if absent == 0 and late == 0:
+        return "Perfect"
+    elif absent <= 2:
+        return "Good"
+    return "Poor"
+
+
 # ---------------------------------------------------
-# MAIN FUNCTION
+# PER-DAY RULES (shared by summary, incremental and daily view)
 # ---------------------------------------------------
-def calculate_monthly_summary(db: Session, user_id: int, year: int, month: int):
+def evaluate_day(
+    day: date,
+    punch_times: List[time],
+    leave_flag,
+    on_leave: bool,
+    is_holiday: bool,
+    permission: Optional[PermissionWindow],
+    shift: ShiftWindow = DEFAULT_SHIFT,
+):
+    """
+    Evaluate ONE day → (status, counters).
+    counters is the day's contribution to the monthly Attendance row;
+    leave_flag is LeaveMaster.is_half_day for the day (only read when on_leave).
+    """
+    c = empty_counters()
+    is_sunday = day.weekday() == 6
+
+    # Holidays / Sundays are counted for the month regardless of leave
+    if is_holiday:
+        c["holidays"] = 1
+    if is_sunday:
+        c["sundays"] = 1
+
+    # --------------------------------------------------------
+    # FULL-DAY LEAVE
+    # --------------------------------------------------------
+    if on_leave and (leave_flag is False or leave_flag is None):
+        c["leaves"] = 1
+        return "Full-Day Leave", c
+
+    punch_times = sorted(punch_times)
+
+    # --------------------------------------------------------
+    # HALF-DAY LEAVE
+    # --------------------------------------------------------
+    if on_leave and leave_flag is True:
+
+        if len(punch_times) < 2:
+            c["absent_days"] = 1
+            return "Absent", c
+
+        c["half_days"] = 1  # count in half_days only
+
+        # Work minutes for the half-day
+        in_dt = datetime.combine(day, punch_times[0])
+        out_dt = datetime.combine(day, punch_times[-1])
+        if out_dt < in_dt:
+            out_dt += timedelta(days=1)
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user or not user.biometric_id:
-        return None
+        c["total_work_minutes"] = int((out_dt - in_dt).total_seconds() / 60)
+        return "Half-Day Leave", c
+
+    # --------------------------------------------------------
+    # Sundays / Holidays
+    # --------------------------------------------------------
+    if is_holiday:
+        return "Holiday", c
+    if is_sunday:
+        return "Sunday", c
+
+    # --------------------------------------------------------
+    # Permissions (do NOT skip — calculate!)
+    # --------------------------------------------------------
+    has_permission = permission is not None
+    if has_permission:
+        c["permissions"] = 1
+
+    # --------------------------------------------------------
+    # ABSENT: no punches / only 1 punch
+    # --------------------------------------------------------
+    if len(punch_times) < 2:
+        c["absent_days"] = 1
+        return "Absent", c
+
+    # --------------------------------------------------------
+    # REGULAR WORK CALC
+    # --------------------------------------------------------
+    in_dt = datetime.combine(day, punch_times[0])
+    out_dt = datetime.combine(day, punch_times[-1])
+    if out_dt < in_dt:
+        out_dt += timedelta(days=1)
+
+    # Shift
+    start_dt = datetime.combine(day, shift.start_time)
+    end_dt = datetime.combine(day, shift.end_time)
+    if end_dt <= start_dt:
+        end_dt += timedelta(days=1)
+
+    # LATE (uses grace)
+    allowed_in = start_dt + timedelta(minutes=shift.lag_minutes)
+
+    # Work minutes
+    worked = int((out_dt - in_dt).total_seconds() / 60)
+    c["total_work_minutes"] = worked
+
+    # -------------------------
+    # Late Entry Logic
+    # -------------------------
+    if has_permission:
+        perm_start = datetime.combine(day, permission.from_time)
+        # ignore late if in permission window
+        if not (allowed_in <= in_dt <= perm_start):
+            if in_dt > allowed_in:
+                c["late_minutes"] = int((in_dt - allowed_in).total_seconds() / 60)
+    else:
+        if in_dt > allowed_in:
+            c["late_minutes"] = int((in_dt - allowed_in).total_seconds() / 60)
+
+    # -------------------------
+    # Early Exit Logic (NO grace)
+    # -------------------------
+    if has_permission:
+        perm_end = datetime.combine(day, permission.to_time)
+        # ignore early exit inside permission period
+        if not (perm_end <= out_dt <= end_dt):
+            if out_dt < end_dt:
+                c["early_exit_minutes"] = int((end_dt - out_dt).total_seconds() / 60)
+    else:
+        if out_dt < end_dt:
+            c["early_exit_minutes"] = int((end_dt - out_dt).total_seconds() / 60)
 
-    # Month range
-    month_start = date(year, month, 1)
-    _, days_in_month = calendar.monthrange(year, month)
-    month_end = date(year, month, days_in_month)
+    # -------------------------
+    # Overtime
+    # -------------------------
+    if out_dt > end_dt:
+        c["overtime_minutes"] = int((out_dt - end_dt).total_seconds() / 60)
 
-    # Punches
-    punches = db.query(AttendancePunch).filter(
-        AttendancePunch.bio_id == user.biometric_id,
-        AttendancePunch.punch_date >= month_start,
-        AttendancePunch.punch_date <= month_end
-    ).all()
+    # -------------------------
+    # Classification (present/half/absent)
+    # -------------------------
+    if worked >= shift.working_minutes * 0.80:
+        c["present_days"] = 1
+        return "Present", c
+    elif worked >= shift.working_minutes * 0.50:
+        c["half_days"] = 1
+        return "Half", c
+
+    c["absent_days"] = 1
+    return "Absent", c
 
-    punch_map: Dict[date, List[AttendancePunch]] = {}
-    for p in punches:
-        punch_map.setdefault(p.punch_date, []).append(p)
 
-    # Holidays
+# ---------------------------------------------------
+# MONTH CONTEXT (one user, one month)
+# ---------------------------------------------------
+class AttendanceMonthContext:
+    """
+    Everything the daily rules need for one user-month, loaded up front
+    and compiled to plain values (no ORM objects → safe to cache).
+    """
+
+    def __init__(self, user, year: int, month: int, holiday_dates=None):
+        self.user_id = user.id
+        self.biometric_id = user.biometric_id
+        self.shift_roster_id = getattr(user, "shift_roster_id", None)
+        self.year = year
+        self.month = month
+        self.month_start, self.month_end, self.days_in_month = month_bounds(year, month)
+
+        # True when loaded for a few days only (incremental) → never cached
+        self.partial = False
+
+        self.punch_map: Dict[date, List[time]] = {}
+        self.holiday_dates = holiday_dates if holiday_dates is not None else set()
+        self.leave_map: Dict[date, Optional[bool]] = {}
+        self.leave_type_map: Dict[date, Optional[str]] = {}
+        self.permission_map: Dict[date, PermissionWindow] = {}
+
+        # isoweekday → ShiftWindow, resolved once per context
+        self.shift_table: Dict[int, ShiftWindow] = {wd: DEFAULT_SHIFT for wd in range(1, 8)}
+
+    def set_roster(self, weekly_map: Dict[int, int], shifts: Dict[int, ShiftWindow]):
+        """weekly_map: week_day_id (isoweekday) → shift_id"""
+        for week_day_id, shift_id in weekly_map.items():
+            if shift_id in shifts:
+                self.shift_table[week_day_id] = shifts[shift_id]
+
+    def days(self):
+        return daterange(self.month_start, self.month_end)
+
+    def shift_for(self, day: date) -> ShiftWindow:
+        return self.shift_table.get(day.isoweekday(), DEFAULT_SHIFT)
+
+    def evaluate(self, day: date):
+        return evaluate_day(
+            day,
+            self.punch_map.get(day, []),
+            self.leave_map.get(day),
+            day in self.leave_map,
+            day in self.holiday_dates,
+            self.permission_map.get(day),
+            self.shift_for(day),
+        )
+
+    def day_counters(self, day: date) -> Dict[str, int]:
+        return self.evaluate(day)[1]
+
+    def day_counters_map(self) -> Dict[date, Dict[str, int]]:
+        return {day: self.day_counters(day) for day in self.days()}
+
+    def month_counters(self) -> Dict[str, int]:
+        return sum_counters(self.day_counters_map().values())
+
+    def daily_view(self) -> List[dict]:
+        """
+        Day-wise rows for GET /attendance-summary/daily (same rules as the summary).
+
+        Unlike the former route-local rules: an approved leave wins over a
+        holiday / Sunday (as it always did in the summary), and a permission
+        day is no longer a "Permission" status; it is evaluated like any
+        working day (Present / Half / Absent) with the window in "permission".
+        """
+        daywise = []
+
+        for day in self.days():
+            status, c = self.evaluate(day)
+            punch_times = sorted(self.punch_map.get(day, []))
+            permission = self.permission_map.get(day)
+            shift = self.shift_for(day)
+
+            daywise.append({
+                "date": str(day),
+                "status": status,
+                "punch_in": str(punch_times[0]) if len(punch_times) >= 1 else None,
+                "punch_out": str(punch_times[-1]) if len(punch_times) >= 2 else None,
+                "shift_start": str(shift.start_time),
+                "shift_end": str(shift.end_time),
+                "worked_minutes": c["total_work_minutes"],
+                "late_minutes": c["late_minutes"],
+                "early_exit_minutes": c["early_exit_minutes"],
+                "overtime_minutes": c["overtime_minutes"],
+                "leave_type": self.leave_type_map.get(day),
+                "permission": {
+                    "from": str(permission.from_time),
+                    "to": str(permission.to_time),
+                    "reason": permission.reason
+                } if permission else None
+            })
+
+        return daywise
+
+
+def sum_counters(per_day: Iterable[Dict[str, int]]) -> Dict[str, int]:
+    totals = empty_counters()
+    for counters in per_day:
+        for key, value in counters.items():
+            totals[key] += value
+    return totals
+
+
+def load_month_contexts(
+    db: Session,
+    users: Iterable[User],
+    year: int,
+    month: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    include_without_biometric: bool = False,
+) -> Dict[int, AttendanceMonthContext]:
+    """
+    Build AttendanceMonthContext for many users with set-based queries
+    (one query per table, chunked on IN lists) instead of per-user round trips.
+    start / end narrow the loaded rows to a few days of the month
+    (incremental maintenance); only those days can then be evaluated.
+    Users without a biometric_id are skipped unless include_without_biometric
+    (daily view: every day without punches).
+    """
+    users = [u for u in users if u and (u.biometric_id or include_without_biometric)]
+    if not users:
+        return {}
+
+    month_start, month_end = month_bounds(year, month)[:2]
+
+    # Narrowed window (incremental maintenance)
+    if start:
+        month_start = max(month_start, start)
+    if end:
+        month_end = min(month_end, end)
+
+    # Holidays are organization-wide → load once
     holiday_dates = {
         h.date
         for h in db.query(Holiday)
@@ -76,233 +388,525 @@ def calculate_monthly_summary(db: Session, user_id: int, year: int, month: int):
         .all()
     }
 
-    # Sundays
-    sundays = {
-        month_start + timedelta(days=i)
-        for i in range(days_in_month)
-        if (month_start + timedelta(days=i)).weekday() == 6
-    }
+    contexts = {u.id: AttendanceMonthContext(u, year, month, holiday_dates) for u in users}
+    for ctx in contexts.values():
+        ctx.partial = bool(start or end)
+    by_bio = {u.biometric_id: contexts[u.id] for u in users if u.biometric_id}
+    user_ids = list(contexts.keys())
 
-    # Leaves
-    approved_leaves = db.query(LeaveMaster).filter(
-        LeaveMaster.user_id == user_id,
-        LeaveMaster.status == "approved",
-        LeaveMaster.start_date <= month_end,
-        or_(
-            LeaveMaster.end_date == None,
-            LeaveMaster.end_date >= month_start
-        )
-    ).all()
+    # Punches
+    for bio_chunk in chunked(list(by_bio.keys())):
+        punches = db.query(AttendancePunch).filter(
+            AttendancePunch.bio_id.in_(bio_chunk),
+            AttendancePunch.punch_date >= month_start,
+            AttendancePunch.punch_date <= month_end
+        ).all()
 
-    leave_map = expand_leave_dates(approved_leaves)
+        for p in punches:
+            by_bio[p.bio_id].punch_map.setdefault(p.punch_date, []).append(p.punch_time)
+
+    for id_chunk in chunked(user_ids):
+        # Leaves (+ type name for the daily view, same round trip)
+        approved_leaves = db.query(LeaveMaster, LeaveType.leave_type).outerjoin(
+            LeaveType, LeaveType.id == LeaveMaster.leave_type_id
+        ).filter(
+            LeaveMaster.user_id.in_(id_chunk),
+            LeaveMaster.status == "approved",
+            LeaveMaster.start_date <= month_end,
+            or_(
+                LeaveMaster.end_date == None,
+                LeaveMaster.end_date >= month_start
+            )
+        ).all()
 
-    # Permissions
-    permission_records = db.query(Permission).filter(
-        Permission.user_id == user_id,
-        Permission.date >= month_start,
-        Permission.date <= month_end,
-        Permission.status == "approved"
-    ).all()
+        leaves_by_user: Dict[int, List[LeaveMaster]] = {}
+        for rec, leave_type_name in approved_leaves:
+            leaves_by_user.setdefault(rec.user_id, []).append(rec)
+            for d in expand_leave_dates([rec]):
+                contexts[rec.user_id].leave_type_map[d] = leave_type_name
+        for uid, records in leaves_by_user.items():
+            contexts[uid].leave_map = expand_leave_dates(records)
+
+        # Permissions
+        permission_records = db.query(Permission).filter(
+            Permission.user_id.in_(id_chunk),
+            Permission.date >= month_start,
+            Permission.date <= month_end,
+            Permission.status == "approved"
+        ).all()
 
-    permission_map = {p.date: p for p in permission_records}
+        for p in permission_records:
+            contexts[p.user_id].permission_map[p.date] = PermissionWindow(p.from_time, p.to_time, p.reason)
 
     # Roster
-    weekly_map = {}
-    if user.shift_roster_id:
+    roster_ids = list({u.shift_roster_id for u in users if u.shift_roster_id})
+    weekly_by_roster: Dict[int, Dict[int, int]] = {}
+    for roster_chunk in chunked(roster_ids):
         details = db.query(ShiftRosterDetail).filter(
-            ShiftRosterDetail.shift_roster_id == user.shift_roster_id
+            ShiftRosterDetail.shift_roster_id.in_(roster_chunk)
         ).all()
-        weekly_map = {d.week_day_id: d.shift_id for d in details}
+        for d in details:
+            weekly_by_roster.setdefault(d.shift_roster_id, {})[d.week_day_id] = d.shift_id
 
-    shifts = {}
-    if weekly_map:
-        shift_objs = db.query(Shift).filter(
-            Shift.id.in_(weekly_map.values())
-        ).all()
-        shifts = {s.id: s for s in shift_objs}
-
-    # Counters
-    present = half = absent = 0
-    leaves_full = 0
-    permissions = 0
-
-    total_work = overtime = late = early_exit = 0
-
-    # -------------------------------------------
-    # DAILY LOOP
-    # -------------------------------------------
-    for i in range(days_in_month):
-        day = month_start + timedelta(days=i)
-
-        # --------------------------------------------------------
-        # FULL-DAY LEAVE
-        # --------------------------------------------------------
-        if day in leave_map and (leave_map[day] is False or leave_map[day] is None):
-            leaves_full += 1
-            continue
+    shift_ids = list({sid for weekly in weekly_by_roster.values() for sid in weekly.values()})
+    shifts: Dict[int, ShiftWindow] = {}
+    for shift_chunk in chunked(shift_ids):
+        shifts.update({
+            s.id: ShiftWindow(s.start_time, s.end_time, s.lag_minutes, s.working_minutes)
+            for s in db.query(Shift).filter(Shift.id.in_(shift_chunk)).all()
+        })
 
-        # --------------------------------------------------------
-        # HALF-DAY LEAVE
-        # --------------------------------------------------------
-        if day in leave_map and leave_map[day] is True:
+    for ctx in contexts.values():
+        ctx.set_roster(weekly_by_roster.get(ctx.shift_roster_id, {}), shifts)
 
-            if day not in punch_map or len(punch_map[day]) < 2:
-                absent += 1
-                continue
+    return contexts
 
-            half += 1  # count in half_days only
 
-            # Work minutes for the half-day
-            punches_today = sorted(punch_map[day], key=lambda x: x.punch_time)
-            in_dt = datetime.combine(day, punches_today[0].punch_time)
-            out_dt = datetime.combine(day, punches_today[-1].punch_time)
-            if out_dt < in_dt:
-                out_dt += timedelta(days=1)
+# ---------------------------------------------------
+# CONTEXT CACHE (user, year, month)
+# ---------------------------------------------------
+class MonthContextCache:
+    """
+    Small in-process LRU of full month contexts.
+    Writes through this module invalidate their entries (see
+    queue_context_invalidation); the TTL bounds staleness for changes made
+    elsewhere (other workers, raw punch inserts).
+    """
+
+    def __init__(self, max_size: int = 512, ttl_seconds: int = 120):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._items: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation: a load that raced one is not stored
+        self.generation = 0
+
+    def get(self, user_id: int, year: int, month: int) -> Optional[AttendanceMonthContext]:
+        key = (user_id, year, month)
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            stored_at, ctx = item
+            if clock.monotonic() - stored_at > self.ttl_seconds:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return ctx
+
+    def put(self, ctx: AttendanceMonthContext, generation: Optional[int] = None):
+        """generation: self.generation read before the load (None → store unconditionally)."""
+        if ctx.partial:
+            return
+        key = (ctx.user_id, ctx.year, ctx.month)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._items[key] = (clock.monotonic(), ctx)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def invalidate(self, user_ids: Optional[Iterable[int]], year: int, month: int):
+        """Drop these users' contexts for the month; user_ids None → every user's."""
+        with self._lock:
+            if user_ids is None:
+                for key in [key for key in self._items if key[1:] == (year, month)]:
+                    del self._items[key]
+            else:
+                for uid in user_ids:
+                    self._items.pop((uid, year, month), None)
+            self.generation += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.generation += 1
+
+
+month_context_cache = MonthContextCache()
+
+
+def queue_context_invalidation(db: Session, user_ids: Optional[Iterable[int]], month_start: date):
+    """
+    Drop cached contexts of a month whose punches / leaves / permissions /
+    holidays change in `db`: now, and again after commit, so a reader that
+    loaded the pre-commit rows meanwhile cannot keep them. user_ids None → all.
+    """
+    user_ids = None if user_ids is None else frozenset(user_ids)
+    month_context_cache.invalidate(user_ids, month_start.year, month_start.month)
+    db.info.setdefault(CONTEXT_INVALIDATIONS_KEY, []).append((user_ids, month_start.year, month_start.month))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_context_invalidations(session):
+    for user_ids, year, month in session.info.pop(CONTEXT_INVALIDATIONS_KEY, ()):
+        month_context_cache.invalidate(user_ids, year, month)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_context_invalidations(session):
+    # Rolled back: nothing changed, and this session never filled the cache
+    session.info.pop(CONTEXT_INVALIDATIONS_KEY, None)
+
+
+def get_month_context(db: Session, user_id: int, year: int, month: int) -> Optional[AttendanceMonthContext]:
+    """Cached month context; a cache hit costs no queries."""
+    ctx = month_context_cache.get(user_id, year, month)
+    if ctx is not None:
+        return ctx
 
-            total_work += int((out_dt - in_dt).total_seconds() / 60)
-            continue
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        return None
 
-        # --------------------------------------------------------
-        # Sundays / Holidays
-        # --------------------------------------------------------
-        if day in holiday_dates or day in sundays:
-            continue
+    generation = month_context_cache.generation
+    # No biometric_id → no punches, but leaves / holidays / absences still apply
+    ctx = load_month_contexts(db, [user], year, month, include_without_biometric=True)[user.id]
 
-        # --------------------------------------------------------
-        # Permissions (do NOT skip — calculate!)
-        # --------------------------------------------------------
-        permission_obj = permission_map.get(day)
-        has_permission = permission_obj is not None
-        if has_permission:
-            permissions += 1
-
-        # --------------------------------------------------------
-        # ABSENT: No punches
-        # --------------------------------------------------------
-        if day not in punch_map:
-            absent += 1
-            continue
+    # Uncommitted attendance changes in this session → not for other requests
+    if not db.info.get(CONTEXT_INVALIDATIONS_KEY):
+        month_context_cache.put(ctx, generation)
+    return ctx
 
-        punches_today = sorted(punch_map[day], key=lambda x: x.punch_time)
 
-        # ABSENT: only 1 punch
-        if len(punches_today) < 2:
-            absent += 1
-            continue
+def apply_summary_counters(summary: Attendance, counters: Dict[str, int], days_in_month: int):
+    summary.total_days = days_in_month
+    for key in SUMMARY_COUNTERS:
+        setattr(summary, key, counters[key])
+    summary.summary_status = summary_status_for(counters["absent_days"], counters["late_minutes"])
+
+
+def store_day_counters(db: Session, month_start: date, per_day_by_user: Dict[int, Dict[date, Dict[str, int]]]):
+    """Replace the stored per-day contributions of these users for the month."""
+    user_ids = list(per_day_by_user.keys())
+
+    for id_chunk in chunked(user_ids):
+        db.query(AttendanceDay).filter(
+            AttendanceDay.user_id.in_(id_chunk),
+            AttendanceDay.month == month_start
+        ).delete(synchronize_session=False)
+
+    rows = [
+        dict(counters, user_id=uid, date=day, month=month_start)
+        for uid, per_day in per_day_by_user.items()
+        for day, counters in per_day.items()
+    ]
+    if rows:
+        db.bulk_insert_mappings(AttendanceDay, rows)
+
+
+def upsert_summaries(db: Session, rows: List[dict]) -> bool:
+    """
+    Native upsert on uq_attendance_user_month:
+    MySQL ON DUPLICATE KEY UPDATE, PostgreSQL / SQLite ON CONFLICT DO UPDATE.
+    Returns False when the dialect has neither (caller falls back to the ORM path).
+    """
+    dialect = db.bind.dialect.name
+
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return False
 
-        # --------------------------------------------------------
-        # REGULAR WORK CALC
-        # --------------------------------------------------------
-        first = punches_today[0]
-        lastp = punches_today[-1]
+    update_columns = SUMMARY_COUNTERS + ("total_days", "summary_status")
 
-        in_dt = datetime.combine(day, first.punch_time)
-        out_dt = datetime.combine(day, lastp.punch_time)
-        if out_dt < in_dt:
-            out_dt += timedelta(days=1)
+    for row_chunk in chunked(rows):
+        stmt = dialect_insert(Attendance.__table__).values(row_chunk)
+        new = stmt.inserted if dialect == "mysql" else stmt.excluded
 
-        # Shift
-        shift_obj = shifts.get(weekly_map.get(day.isoweekday()))
-        working_minutes = getattr(shift_obj, "working_minutes", DEFAULT_WORKING_MINUTES)
-        lag = getattr(shift_obj, "lag_minutes", DEFAULT_LAG_MINUTES)
-
-        s_start = getattr(shift_obj, "start_time", time(9, 0))
-        s_end = getattr(shift_obj, "end_time", time(17, 0))
-
-        start_dt = datetime.combine(day, s_start)
-        end_dt = datetime.combine(day, s_end)
-        if end_dt <= start_dt:
-            end_dt += timedelta(days=1)
-
-        # LATE (uses grace)
-        allowed_in = start_dt + timedelta(minutes=lag)
-
-        # EARLY EXIT (NO grace)
-        allowed_out = end_dt
-
-        # Work minutes
-        worked = int((out_dt - in_dt).total_seconds() / 60)
-        total_work += worked
-
-        # -------------------------
-        # Late Entry Logic
-        # -------------------------
-        if has_permission:
-            perm_start = datetime.combine(day, permission_obj.from_time)
-            # ignore late if in permission window
-            if not (allowed_in <= in_dt <= perm_start):
-                if in_dt > allowed_in:
-                    late += int((in_dt - allowed_in).total_seconds() / 60)
-        else:
-            if in_dt > allowed_in:
-                late += int((in_dt - allowed_in).total_seconds() / 60)
-
-        # -------------------------
-        # Early Exit Logic
-        # -------------------------
-        if has_permission:
-            perm_end = datetime.combine(day, permission_obj.to_time)
-            # ignore early exit inside permission period
-            if not (perm_end <= out_dt <= end_dt):
-                if out_dt < end_dt:
-                    early_exit += int((end_dt - out_dt).total_seconds() / 60)
-        else:
-            if out_dt < end_dt:
-                early_exit += int((end_dt - out_dt).total_seconds() / 60)
-
-        # -------------------------
-        # Overtime
-        # -------------------------
-        if out_dt > end_dt:
-            overtime += int((out_dt - end_dt).total_seconds() / 60)
-
-        # -------------------------
-        # Classification (present/half/absent)
-        # -------------------------
-        if worked >= working_minutes * 0.80:
-            present += 1
-        elif worked >= working_minutes * 0.50:
-            half += 1
+        set_ = {c: new[c] for c in update_columns}
+        set_.update(modified_by=new.created_by, updated_at=func.now())
+
+        if dialect == "mysql":
+            stmt = stmt.on_duplicate_key_update(set_)
         else:
-            absent += 1
+            stmt = stmt.on_conflict_do_update(index_elements=["user_id", "month"], set_=set_)
+
+        db.execute(stmt)
+
+    return True
+
 
-    # -------------------------------------------------------
-    # SAVE SUMMARY
-    # -------------------------------------------------------
-    summary = db.query(Attendance).filter(
-        Attendance.user_id == user_id,
-        Attendance.month == month_start
-    ).first()
+def _generate_summary(db: Session, ctx: AttendanceMonthContext, summary: Optional[Attendance] = None):
+    """Full recompute of one user-month (no commit)."""
+    per_day = ctx.day_counters_map()
+
+    if summary is None:
+        summary = db.query(Attendance).filter(
+            Attendance.user_id == ctx.user_id,
+            Attendance.month == ctx.month_start
+        ).first()
 
     if not summary:
         summary = Attendance(
-            user_id=user_id,
-            month=month_start,
+            user_id=ctx.user_id,
+            month=ctx.month_start,
             created_by="system"
         )
         db.add(summary)
 
-    summary.total_days = days_in_month
-    summary.present_days = present
-    summary.half_days = half
-    summary.absent_days = absent
-    summary.holidays = len(holiday_dates)
-    summary.sundays = len(sundays)
-    summary.leaves = leaves_full
-    summary.permissions = permissions
-
-    summary.total_work_minutes = total_work
-    summary.overtime_minutes = overtime
-    summary.late_minutes = late
-    summary.early_exit_minutes = early_exit
+    apply_summary_counters(summary, sum_counters(per_day.values()), ctx.days_in_month)
+    store_day_counters(db, ctx.month_start, {ctx.user_id: per_day})
+    db.flush()
+    return summary
 
-    if absent == 0 and late == 0:
-        summary.summary_status = "Perfect"
-    elif absent <= 2:
-        summary.summary_status = "Good"
-    else:
-        summary.summary_status = "Poor"
+
+# ---------------------------------------------------
+# MAIN FUNCTION
+# ---------------------------------------------------
+def calculate_monthly_summary(db: Session, user_id: int, year: int, month: int):
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user or not user.biometric_id:
+        return None
+
+    generation = month_context_cache.generation
+    ctx = load_month_contexts(db, [user], year, month)[user.id]
+    summary = _generate_summary(db, ctx)
 
     db.commit()
+    # Daily view right after generate reuses this context (only once
+    # committed, and only if nothing was invalidated while it was loaded)
+    month_context_cache.put(ctx, generation)
     db.refresh(summary)
-    return summary
\ No newline at end of file
+    return summary
+
+
+# ---------------------------------------------------
+# BATCH (ORGANIZATION / BRANCH) MONTH CLOSE
+# ---------------------------------------------------
+def calculate_monthly_summaries_bulk(
+    db: Session,
+    year: int,
+    month: int,
+    organization_id: Optional[int] = None,
+    branch_id: Optional[int] = None,
+    user_ids: Optional[List[int]] = None,
+    created_by: str = "system",
+    vectorized: bool = False,
+):
+    """
+    Compute Attendance summaries for every user of an organization / branch
+    (or an explicit list of user ids) in one pass:
+    set-based loads, bulk upsert and a single commit.
+    vectorized=True evaluates all (user × day) cells with the NumPy kernel.
+    """
+    query = db.query(User).filter(User.biometric_id != None)
+
+    if organization_id is not None:
+        query = query.filter(User.organization_id == organization_id)
+    if branch_id is not None:
+        query = query.filter(User.branch_id == branch_id)
+    if user_ids is not None:
+        query = query.filter(User.id.in_(user_ids))
+
+    users = query.all()
+    contexts = load_month_contexts(db, users, year, month)
+
+    month_start, _, days_in_month = month_bounds(year, month)
+
+    # Existing summaries → id per user
+    existing: Dict[int, int] = {}
+    for id_chunk in chunked(list(contexts.keys())):
+        existing.update({
+            row.user_id: row.id
+            for row in db.query(Attendance.id, Attendance.user_id).filter(
+                Attendance.user_id.in_(id_chunk),
+                Attendance.month == month_start
+            )
+        })
+
+    if vectorized:
+        # numpy is only needed for this path
+        from app.utils.attendance_kernel import day_counters_vectorized
+        per_day_by_user = day_counters_vectorized(list(contexts.values()))
+    else:
+        per_day_by_user = {uid: ctx.day_counters_map() for uid, ctx in contexts.items()}
+
+    rows = []
+    for uid, per_day in per_day_by_user.items():
+        counters = sum_counters(per_day.values())
+        rows.append(dict(
+            counters,
+            user_id=uid,
+            month=month_start,
+            total_days=days_in_month,
+            summary_status=summary_status_for(counters["absent_days"], counters["late_minutes"]),
+            created_by=created_by,
+        ))
+
+    created = sum(1 for r in rows if r["user_id"] not in existing)
+
+    # Native upsert is safe against a concurrent generate of the same month
+    if rows and not upsert_summaries(db, rows):
+        to_insert = [r for r in rows if r["user_id"] not in existing]
+        to_update = [
+            dict(r, id=existing[r["user_id"]], modified_by=created_by)
+            for r in rows if r["user_id"] in existing
+        ]
+        for r in to_update:
+            del r["created_by"]
+
+        if to_insert:
+            db.bulk_insert_mappings(Attendance, to_insert)
+        if to_update:
+            db.bulk_update_mappings(Attendance, to_update)
+
+    store_day_counters(db, month_start, per_day_by_user)
+
+    db.commit()
+    month_context_cache.invalidate(contexts.keys(), year, month)
+
+    return {
+        "month": month_start,
+        "processed": len(contexts),
+        "created": created,
+        "updated": len(rows) - created,
+    }
+
+
+# ---------------------------------------------------
+# INCREMENTAL MAINTENANCE
+# ---------------------------------------------------
+def refresh_attendance_days(db: Session, user_ids: Iterable[int], days: Iterable[date]):
+    """
+    Re-evaluate only `days` for `user_ids` and move the stored monthly
+    counters by (new − old) day contribution. No commit — call after the
+    punch / leave / permission / holiday change is flushed, in the same
+    transaction.
+
+    Only months that already have a summary are maintained (generate creates
+    them). A summary without stored day rows is rebuilt once in full.
+    """
+    user_ids = list(set(user_ids))
+    by_month: Dict[date, List[date]] = {}
+    for day in set(days):
+        by_month.setdefault(day.replace(day=1), []).append(day)
+
+    if not user_ids:
+        return 0
+
+    changed = 0
+
+    for month_start, month_days in by_month.items():
+        month_days.sort()
+
+        # Row locks (in user_id order) serialize concurrent refreshes of the
+        # same user + month: the deltas below are read-modify-write, and the
+        # day rows they are computed from are only read once the lock is held.
+        # populate_existing: values already in the session may be stale.
+        summaries: Dict[int, Attendance] = {}
+        for id_chunk in chunked(user_ids):
+            summaries.update({
+                s.user_id: s
+                for s in db.query(Attendance).filter(
+                    Attendance.user_id.in_(id_chunk),
+                    Attendance.month == month_start
+                ).order_by(Attendance.user_id).with_for_update().populate_existing()
+            })
+
+        # Daily view contexts change whether or not the month has a summary yet
+        queue_context_invalidation(db, user_ids, month_start)
+
+        if not summaries:
+            continue
+
+        users = []
+        for id_chunk in chunked(list(summaries.keys())):
+            users.extend(db.query(User).filter(User.id.in_(id_chunk)).all())
+        users_by_id = {u.id: u for u in users}
+
+        contexts = load_month_contexts(
+            db, users, month_start.year, month_start.month,
+            start=month_days[0], end=month_days[-1]
+        )
+
+        stored: Dict[tuple, AttendanceDay] = {}
+        for id_chunk in chunked(list(contexts.keys())):
+            stored.update({
+                (r.user_id, r.date): r
+                for r in db.query(AttendanceDay).filter(
+                    AttendanceDay.user_id.in_(id_chunk),
+                    AttendanceDay.date >= month_days[0],
+                    AttendanceDay.date <= month_days[-1]
+                )
+            })
+
+        for uid, ctx in contexts.items():
+            summary = summaries[uid]
+
+            # No baseline for these days → rebuild the month once
+            if any((uid, day) not in stored for day in month_days):
+                full_ctx = load_month_contexts(db, [users_by_id[uid]], month_start.year, month_start.month)[uid]
+                _generate_summary(db, full_ctx, summary)
+                changed += 1
+                continue
+
+            for day in month_days:
+                row = stored[(uid, day)]
+                new = ctx.day_counters(day)
+
+                for key in SUMMARY_COUNTERS:
+                    delta = new[key] - (getattr(row, key) or 0)
+                    if delta:
+                        setattr(summary, key, (getattr(summary, key) or 0) + delta)
+                    setattr(row, key, new[key])
+
+            summary.summary_status = summary_status_for(summary.absent_days, summary.late_minutes)
+            summary.modified_by = "system"
+            changed += 1
+
+    db.flush()
+    return changed
+
+
+def refresh_attendance_for_punches(db: Session, punch_keys: Iterable[tuple]):
+    """punch_keys: (bio_id, punch_date) pairs that gained / lost punches."""
+    days_by_bio: Dict[str, set] = {}
+    for bio_id, punch_date in punch_keys:
+        days_by_bio.setdefault(bio_id, set()).add(punch_date)
+
+    if not days_by_bio:
+        return 0
+
+    user_by_bio = {}
+    for bio_chunk in chunked(list(days_by_bio.keys())):
+        user_by_bio.update({
+            u.biometric_id: u.id
+            for u in db.query(User.id, User.biometric_id).filter(User.biometric_id.in_(bio_chunk))
+        })
+
+    # Users sharing the same set of days are refreshed together
+    users_by_days: Dict[frozenset, List[int]] = {}
+    for bio_id, days in days_by_bio.items():
+        if bio_id in user_by_bio:
+            users_by_days.setdefault(frozenset(days), []).append(user_by_bio[bio_id])
+
+    return sum(
+        refresh_attendance_days(db, user_ids, days)
+        for days, user_ids in users_by_days.items()
+    )
+
+
+def refresh_attendance_for_leave(db: Session, leave: LeaveMaster):
+    if not leave.start_date:
+        return 0
+    days = list(daterange(leave.start_date, leave.end_date or leave.start_date))
+    return refresh_attendance_days(db, [leave.user_id], days)
+
+
+def refresh_attendance_for_holiday(db: Session, holiday_date: date):
+    """A holiday affects everyone: summaries of that month, and every cached context."""
+    queue_context_invalidation(db, None, holiday_date.replace(day=1))
+    user_ids = [
+        row.user_id
+        for row in db.query(Attendance.user_id).filter(
+            Attendance.month == holiday_date.replace(day=1)
+        )
+    ]
+    return refresh_attendance_days(db, user_ids, [holiday_date])
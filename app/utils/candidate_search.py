@@ -0,0 +1,518 @@
+# app/utils/candidate_search.py
+
+"""
+Candidate search: ranked keyword match on skills + facets on candidate_type,
+city, highest_qualification and the language levels.
+
+Two backends, same result shape:
+- database: MySQL FULLTEXT index on candidates.skills (MATCH ... AGAINST),
+            facets as GROUP BY over the filtered rows
+- memory:   in-process inverted index (NumPy), used everywhere else
+            (SQLite in tests, or CANDIDATE_SEARCH_BACKEND=memory)
+
+CANDIDATE_SEARCH_BACKEND = auto (default) | database | memory.
+
+The memory index is columnar: one row per candidate, facet values as integer
+codes, skills as token → row postings. A search is a few vectorised passes
+over those arrays, so 1M candidates stay in the millisecond range (see
+benchmarks/candidate_search_bench.py).
+
+Freshness of the memory index:
+- Candidate writes through the ORM in this process mark the rows dirty after
+  commit; they are re-read before the next search.
+- Writes from other workers are picked up every
+  CANDIDATE_SEARCH_REFRESH_INTERVAL seconds (created_at / updated_at).
+- A full rebuild every CANDIDATE_SEARCH_REBUILD_INTERVAL seconds drops rows
+  deleted elsewhere. Hits are always re-read from the database, so a
+  deleted candidate is never returned, only counted in facets until then.
+"""
+
+import math
+import os
+import re
+import threading
+import time as clock
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+import numpy as np
+from fastapi import Query
+from sqlalchemy import Float, Numeric, cast, event, func, literal, or_, select
+from sqlalchemy.orm import Session, object_session
+
+from app.models.candidate_m import Candidate
+from app.models.job_posting_m import JobPosting
+
+
+CANDIDATE_SEARCH_BACKEND = os.getenv("CANDIDATE_SEARCH_BACKEND", "auto").lower()
+CANDIDATE_SEARCH_REFRESH_INTERVAL = float(os.getenv("CANDIDATE_SEARCH_REFRESH_INTERVAL", 10))    # seconds
+CANDIDATE_SEARCH_REBUILD_INTERVAL = float(os.getenv("CANDIDATE_SEARCH_REBUILD_INTERVAL", 3600))  # seconds
+
+FACETS = (
+    "candidate_type",
+    "city",
+    "highest_qualification",
+    "telugu_level",
+    "english_level",
+    "hindi_level",
+)
+
+MAX_SEARCH_LIMIT = 100
+FACET_VALUES_LIMIT = 50
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """'Python, Django; C++ / Node.js' → ['python', 'django', 'c++', 'node.js']"""
+    if not text:
+        return []
+    return [token.rstrip(".") for token in _TOKEN.findall(text.lower())]
+
+
+def parse_experience(value: Optional[str]) -> Optional[float]:
+    """total_experience is free text ("3", "2.5 years") → years, None if absent."""
+    match = _NUMBER.search(value or "")
+    return float(match.group()) if match else None
+
+
+def _normalize(value) -> Optional[str]:
+    value = (value or "").strip()
+    return value.casefold() if value else None
+
+
+# ---------------------------------------------------
+# SEARCH PARAMETERS / RESULT
+# ---------------------------------------------------
+class CandidateSearchParams:
+    """Query parameters of GET /candidates/search."""
+
+    def __init__(
+        self,
+        q: Optional[str] = Query(None, description="Skills keywords, ranked"),
+        candidate_type: Optional[str] = Query(None),
+        city: Optional[str] = Query(None),
+        highest_qualification: Optional[str] = Query(None),
+        telugu_level: Optional[str] = Query(None),
+        english_level: Optional[str] = Query(None),
+        hindi_level: Optional[str] = Query(None),
+        min_experience: Optional[float] = Query(None, ge=0),
+        max_experience: Optional[float] = Query(None, ge=0),
+        job_posting_id: Optional[int] = Query(None),
+        limit: int = Query(20, ge=1, le=MAX_SEARCH_LIMIT),
+        offset: int = Query(0, ge=0),
+    ):
+        self.q = q
+        self.filters = {
+            field: value
+            for field, value in {
+                "candidate_type": candidate_type,
+                "city": city,
+                "highest_qualification": highest_qualification,
+                "telugu_level": telugu_level,
+                "english_level": english_level,
+                "hindi_level": hindi_level,
+            }.items()
+            if value
+        }
+        self.min_experience = min_experience
+        self.max_experience = max_experience
+        self.job_posting_id = job_posting_id
+        self.limit = limit
+        self.offset = offset
+
+
+class SearchResult(NamedTuple):
+    total: int
+    ids: List[int]            # ranked, page only
+    scores: List[float]
+    facets: Dict[str, Dict[str, int]]
+    backend: str
+
+
+class CandidateDoc(NamedTuple):
+    id: int
+    organization_id: Optional[int]
+    job_posting_id: Optional[int]
+    skills: Optional[str]
+    total_experience: Optional[str]
+    candidate_type: Optional[str]
+    city: Optional[str]
+    highest_qualification: Optional[str]
+    telugu_level: Optional[str]
+    english_level: Optional[str]
+    hindi_level: Optional[str]
+
+
+DOC_COLUMNS = (
+    Candidate.id,
+    JobPosting.organization_id,
+    Candidate.job_posting_id,
+    Candidate.skills,
+    Candidate.total_experience,
+    *(getattr(Candidate, field) for field in FACETS),
+)
+
+
+def load_documents(db: Session, ids: Optional[Iterable[int]] = None, changed_since: Optional[datetime] = None):
+    query = db.query(*DOC_COLUMNS).outerjoin(JobPosting, JobPosting.id == Candidate.job_posting_id)
+    if ids is not None:
+        query = query.filter(Candidate.id.in_(list(ids)))
+    if changed_since is not None:
+        query = query.filter(or_(Candidate.created_at >= changed_since, Candidate.updated_at >= changed_since))
+    for row in query.yield_per(5000):
+        yield CandidateDoc(*row)
+
+
+# ---------------------------------------------------
+# IN-PROCESS INDEX
+# ---------------------------------------------------
+class CandidateSearchIndex:
+
+    def __init__(self, capacity: int = 1024):
+        self._lock = threading.RLock()
+        self._allocate(capacity)
+        self.built_at = float("-inf")
+        self.refreshed_at = float("-inf")
+        self.watermark: Optional[datetime] = None
+        self._dirty: Set[int] = set()
+
+    def _allocate(self, capacity: int):
+        self.size = 0  # rows used (alive or not)
+        self.live = 0
+        self.capacity = capacity
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.experience = np.full(capacity, np.nan, dtype=np.float32)
+        self.organization = np.full(capacity, -1, dtype=np.int64)
+        self.job_posting = np.full(capacity, -1, dtype=np.int64)
+        self.codes = {field: np.full(capacity, -1, dtype=np.int32) for field in FACETS}
+        self.value_codes: Dict[str, Dict[str, int]] = {field: {} for field in FACETS}
+        self.labels: Dict[str, List[str]] = {field: [] for field in FACETS}
+        self.postings: Dict[str, array] = {}
+        self._posting_arrays: Dict[str, np.ndarray] = {}
+        self.row_of: Dict[int, int] = {}
+
+    def _grow(self, needed: int):
+        if needed <= self.capacity:
+            return
+        capacity = max(needed, self.capacity * 2)
+
+        def grown(values, fill):
+            out = np.full(capacity, fill, dtype=values.dtype)
+            out[:self.size] = values[:self.size]
+            return out
+
+        self.ids = grown(self.ids, 0)
+        self.alive = grown(self.alive, False)
+        self.experience = grown(self.experience, np.nan)
+        self.organization = grown(self.organization, -1)
+        self.job_posting = grown(self.job_posting, -1)
+        self.codes = {field: grown(codes, -1) for field, codes in self.codes.items()}
+        self.capacity = capacity
+
+    def _code(self, field: str, value) -> int:
+        key = _normalize(value)
+        if key is None:
+            return -1
+        codes = self.value_codes[field]
+        code = codes.get(key)
+        if code is None:
+            code = codes[key] = len(self.labels[field])
+            self.labels[field].append(value.strip())
+        return code
+
+    # -------- writes --------
+    def add_many(self, docs: Iterable[CandidateDoc]) -> int:
+        added = 0
+        with self._lock:
+            for doc in docs:
+                self._remove(doc.id)
+                if self.size == self.capacity:
+                    self._grow(self.size + 1)
+
+                row = self.size
+                self.size += 1
+                self.live += 1
+                self.row_of[doc.id] = row
+                self.ids[row] = doc.id
+                self.alive[row] = True
+                experience = parse_experience(doc.total_experience)
+                self.experience[row] = np.nan if experience is None else experience
+                self.organization[row] = -1 if doc.organization_id is None else doc.organization_id
+                self.job_posting[row] = -1 if doc.job_posting_id is None else doc.job_posting_id
+                for field in FACETS:
+                    self.codes[field][row] = self._code(field, getattr(doc, field))
+
+                for token in set(tokenize(doc.skills)):
+                    postings = self.postings.get(token)
+                    if postings is None:
+                        postings = self.postings[token] = array("i")
+                    postings.append(row)
+                    self._posting_arrays.pop(token, None)
+                added += 1
+        return added
+
+    def _remove(self, candidate_id: int):
+        row = self.row_of.pop(candidate_id, None)
+        if row is not None and self.alive[row]:
+            self.alive[row] = False
+            self.live -= 1
+
+    def remove(self, candidate_ids: Iterable[int]):
+        with self._lock:
+            for candidate_id in candidate_ids:
+                self._remove(candidate_id)
+
+    @property
+    def built(self) -> bool:
+        return self.watermark is not None
+
+    def mark_dirty(self, candidate_ids: Iterable[int]):
+        # Never built (e.g. the database backend is in use) → the first
+        # rebuild reads everything anyway; don't collect ids forever
+        if not self.built:
+            return
+        with self._lock:
+            self._dirty.update(candidate_ids)
+
+    @property
+    def dead_ratio(self) -> float:
+        return 1 - self.live / self.size if self.size else 0.0
+
+    # -------- freshness --------
+    def rebuild(self, db: Session):
+        with self._lock:
+            started = db.scalar(select(func.now()))  # before reading: nothing slips between
+            self._allocate(1024)
+            self._dirty.clear()
+            self.add_many(load_documents(db))
+            self.watermark = started
+            self.built_at = self.refreshed_at = clock.monotonic()
+
+    def invalidate(self):
+        """Force a full rebuild on the next search."""
+        self.built_at = float("-inf")
+
+    def ensure_fresh(self, db: Session):
+        """Bring the index up to date before a search (cheap when nothing changed)."""
+        now = clock.monotonic()
+        if (now - self.built_at > CANDIDATE_SEARCH_REBUILD_INTERVAL
+                or self.dead_ratio > 0.5):
+            self.rebuild(db)
+            return
+
+        with self._lock:
+            if self._dirty:
+                dirty, self._dirty = self._dirty, set()
+                self.remove(dirty)
+                self.add_many(load_documents(db, ids=dirty))
+
+            if now - self.refreshed_at > CANDIDATE_SEARCH_REFRESH_INTERVAL:
+                started = db.scalar(select(func.now()))
+                self.add_many(load_documents(db, changed_since=self.watermark))
+                self.watermark = started
+                self.refreshed_at = now
+
+    # -------- reads --------
+    def _posting_rows(self, token: str) -> Optional[np.ndarray]:
+        rows = self._posting_arrays.get(token)
+        if rows is None:
+            postings = self.postings.get(token)
+            if postings is None:
+                return None
+            rows = self._posting_arrays[token] = np.frombuffer(postings, dtype=np.int32).copy()
+        return rows
+
+    def search(
+        self,
+        q: Optional[str] = None,
+        filters: Optional[Dict[str, str]] = None,
+        min_experience: Optional[float] = None,
+        max_experience: Optional[float] = None,
+        organization_id: Optional[int] = None,
+        job_posting_id: Optional[int] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> SearchResult:
+        with self._lock:
+            size = self.size
+            mask = self.alive[:size].copy()
+
+            for field, value in (filters or {}).items():
+                code = self.value_codes[field].get(_normalize(value))
+                if code is None:
+                    mask[:] = False
+                    break
+                mask &= self.codes[field][:size] == code
+
+            if min_experience is not None:
+                mask &= self.experience[:size] >= min_experience
+            if max_experience is not None:
+                mask &= self.experience[:size] <= max_experience
+            if organization_id is not None:
+                mask &= self.organization[:size] == organization_id
+            if job_posting_id is not None:
+                mask &= self.job_posting[:size] == job_posting_id
+
+            scores = None
+            tokens = set(tokenize(q))
+            if tokens:
+                # idf-weighted count of matched terms: rare skills weigh more
+                scores = np.zeros(size, dtype=np.float32)
+                for token in tokens:
+                    rows = self._posting_rows(token)
+                    if rows is not None:
+                        scores[rows] += math.log(1 + self.live / len(rows))
+                mask &= scores > 0
+
+            matched = np.flatnonzero(mask)
+            facets = {}
+            for field in FACETS:
+                codes = self.codes[field][matched]
+                counts = np.bincount(codes[codes >= 0], minlength=len(self.labels[field]))
+                top = np.argsort(-counts, kind="stable")[:FACET_VALUES_LIMIT]
+                facets[field] = {self.labels[field][code]: int(counts[code]) for code in top if counts[code]}
+
+            # Rank: score desc, then newest (highest id) first, as one int64 key
+            # so only the requested page is sorted (argpartition is O(n))
+            ids = self.ids[matched]
+            if scores is not None:
+                rounded = np.round(scores[matched] * 10_000).astype(np.int64)
+                rank_key = rounded * (1 << 32) + ids
+            else:
+                rank_key = ids
+            wanted = min(offset + limit, len(matched))
+            if wanted < len(matched):
+                top = np.argpartition(-rank_key, wanted - 1)[:wanted]
+            else:
+                top = np.arange(len(matched))
+            top = top[np.argsort(-rank_key[top], kind="stable")][offset:wanted]
+            page = matched[top]
+
+            return SearchResult(
+                total=len(matched),
+                ids=self.ids[page].tolist(),
+                scores=([round(score, 4) for score in scores[page].tolist()] if scores is not None else [0.0] * len(page)),
+                facets=facets,
+                backend="memory",
+            )
+
+    def stats(self) -> dict:
+        return {
+            "rows": self.size,
+            "live": self.live,
+            "tokens": len(self.postings),
+            "facet_values": {field: len(labels) for field, labels in self.labels.items()},
+        }
+
+
+candidate_search_index = CandidateSearchIndex()
+
+
+# ---------------------------------------------------
+# DATABASE FULL-TEXT (MySQL)
+# ---------------------------------------------------
+def _database_search(db: Session, params: CandidateSearchParams, organization_id: Optional[int]) -> SearchResult:
+    from sqlalchemy.dialects.mysql import match
+
+    query = db.query(Candidate.id)
+    if organization_id is not None:
+        query = query.join(JobPosting, JobPosting.id == Candidate.job_posting_id).filter(
+            JobPosting.organization_id == organization_id
+        )
+    for field, value in params.filters.items():
+        query = query.filter(getattr(Candidate, field) == value.strip())
+    if params.job_posting_id is not None:
+        query = query.filter(Candidate.job_posting_id == params.job_posting_id)
+
+    # "2.5 years" → 2.5 (MySQL casts the leading number)
+    experience = cast(Candidate.total_experience, Numeric(6, 2))
+    if params.min_experience is not None:
+        query = query.filter(experience >= params.min_experience)
+    if params.max_experience is not None:
+        query = query.filter(experience <= params.max_experience)
+
+    score = None
+    if tokenize(params.q):
+        score = match(Candidate.skills, against=params.q).in_natural_language_mode()
+        query = query.filter(score > 0)
+
+    filtered = query.subquery()
+    facets = {}
+    for field in FACETS:
+        column = getattr(Candidate, field)
+        rows = (
+            db.query(column, func.count())
+            .filter(Candidate.id.in_(db.query(filtered.c.id)), column.isnot(None), column != "")
+            .group_by(column)
+            .order_by(func.count().desc())
+            .limit(FACET_VALUES_LIMIT)
+        )
+        facets[field] = {value: count for value, count in rows}
+
+    total = db.query(func.count()).select_from(filtered).scalar()
+    if score is not None:
+        ranked = query.add_columns(score.label("score")).order_by(score.desc(), Candidate.id.desc())
+    else:
+        ranked = query.add_columns(literal(0.0, Float).label("score")).order_by(Candidate.id.desc())
+    page = ranked.offset(params.offset).limit(params.limit).all()
+
+    return SearchResult(
+        total=total,
+        ids=[row.id for row in page],
+        scores=[round(float(row.score or 0), 4) for row in page],
+        facets=facets,
+        backend="database",
+    )
+
+
+def search_backend(db: Session) -> str:
+    if CANDIDATE_SEARCH_BACKEND in ("database", "memory"):
+        return CANDIDATE_SEARCH_BACKEND
+    return "database" if db.get_bind().dialect.name == "mysql" else "memory"
+
+
+def search_candidates(db: Session, params: CandidateSearchParams, organization_id: Optional[int] = None) -> SearchResult:
+    if search_backend(db) == "database":
+        return _database_search(db, params, organization_id)
+
+    candidate_search_index.ensure_fresh(db)
+    return candidate_search_index.search(
+        q=params.q,
+        filters=params.filters,
+        min_experience=params.min_experience,
+        max_experience=params.max_experience,
+        organization_id=organization_id,
+        job_posting_id=params.job_posting_id,
+        limit=params.limit,
+        offset=params.offset,
+    )
+
+
+# ---------------------------------------------------
+# INDEX MAINTENANCE (this process)
+# ---------------------------------------------------
+def _queue_reindex(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("candidate_search_dirty", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_reindex(session):
+    dirty = session.info.pop("candidate_search_dirty", None)
+    if dirty:
+        candidate_search_index.mark_dirty(dirty)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_reindex(session):
+    session.info.pop("candidate_search_dirty", None)
+
+
+event.listen(Candidate, "after_insert", _queue_reindex)
+event.listen(Candidate, "after_update", _queue_reindex)
+event.listen(Candidate, "after_delete", _queue_reindex)
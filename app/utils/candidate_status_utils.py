@@ -0,0 +1,112 @@
+# app/utils/candidate_status_utils.py
+
+"""
+Candidate status transitions and their notification emails, for one
+candidate or a whole drive at once.
+
+Bulk path: one SELECT of the candidates, one UPDATE for the status, each
+template rendered once (per-candidate fields substituted into the rendered
+HTML, checked against one full render), one batch insert into the email
+outbox, and the dashboard counters of the touched postings recomputed (the
+UPDATE bypasses the ORM events).
+"""
+
+from typing import Dict, Iterable, List
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.candidate_m import Candidate
+from app.services.email_outbox_service import candidate_status_keys, enqueue_emails, normalize_status
+from app.utils.email_templates_utils import render_email
+from app.utils.job_dashboard_utils import rebuild_job_posting_counters
+
+
+# status → (subject, template)
+STATUS_EMAILS = {
+    "Accepted": ("🎉 You are selected!", "accepted_email.html"),
+    "Rejected": ("Application Update", "rejected_email.html"),
+}
+
+# Rendered in place of the per-candidate fields, then substituted
+_NAME_SLOT = "__candidate_name_slot__"
+
+
+def candidate_name(candidate) -> str:
+    return f"{candidate.first_name} {candidate.last_name}"
+
+
+def render_status_email(candidate, status: str) -> str:
+    _, template = STATUS_EMAILS[status]
+    return render_email(template, {"candidate_name": candidate_name(candidate)})
+
+
+def render_status_emails(candidates: Iterable, status: str) -> Dict[int, str]:
+    """
+    candidate id → HTML, with the template rendered once for all of them.
+
+    Names are escaped with markupsafe, as Jinja's autoescape does. A template
+    that transforms the name (a filter, a condition on it) cannot be filled in
+    this way: the first candidate is checked against a full render, and on a
+    mismatch every candidate is rendered one by one.
+    """
+    # markupsafe ships with jinja2, imported lazily like it (see email_templates_utils)
+    from markupsafe import escape
+
+    candidates = list(candidates)
+    if not candidates:
+        return {}
+
+    _, template = STATUS_EMAILS[status]
+    rendered = render_email(template, {"candidate_name": _NAME_SLOT})
+
+    def fill(candidate) -> str:
+        return rendered.replace(_NAME_SLOT, str(escape(candidate_name(candidate))))
+
+    if fill(candidates[0]) != render_status_email(candidates[0], status):
+        return {candidate.id: render_status_email(candidate, status) for candidate in candidates}
+    return {candidate.id: fill(candidate) for candidate in candidates}
+
+
+def bulk_update_candidate_status(db: Session, candidate_ids: List[int], status: str) -> dict:
+    """Move many candidates to `status` and queue their emails (no commit)."""
+    candidate_ids = list(dict.fromkeys(candidate_ids))
+    rows = (
+        db.query(Candidate.id, Candidate.first_name, Candidate.last_name,
+                 Candidate.email, Candidate.status, Candidate.job_posting_id)
+        .filter(Candidate.id.in_(candidate_ids))
+        .all()
+    )
+
+    found = {row.id for row in rows}
+    changing = [row for row in rows if normalize_status(row.status) != normalize_status(status)]
+
+    if changing:
+        db.execute(
+            update(Candidate)
+            .where(Candidate.id.in_([row.id for row in changing]))
+            .values(status=status),
+            execution_options={"synchronize_session": "fetch"},
+        )
+        rebuild_job_posting_counters(db, {row.job_posting_id for row in changing})
+
+    subject, template = STATUS_EMAILS[status]
+    bodies = render_status_emails(changing, status)
+    keys = candidate_status_keys(db, [(row.id, row.status, status, template) for row in changing])
+    queued = enqueue_emails(db, [
+        {
+            "to_email": row.email,
+            "subject": subject,
+            "html_body": bodies[row.id],
+            "dedupe_key": keys[row.id],
+            "candidate_id": row.id,
+        }
+        for row in changing
+    ])
+
+    return {
+        "updated": len(changing),
+        "unchanged": len(rows) - len(changing),
+        "not_found": [candidate_id for candidate_id in candidate_ids if candidate_id not in found],
+        "emails_queued": queued,
+    }
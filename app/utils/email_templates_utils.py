@@ -0,0 +1,125 @@
+# app/utils/email_templates_utils.py
+
+"""
+Email template registry.
+
+Each template (accepted_email.html, rejected_email.html,
+candidate_accepted.html, candidate_rejected.html, ...) is compiled once, on
+first use, and kept in memory. The file's mtime is re-checked at most every
+EMAIL_TEMPLATES_CHECK_INTERVAL seconds, so an edited template is picked up
+without a restart and an unchanged one costs no disk access per message.
+
+    render_email("accepted_email.html", {"candidate_name": "..."})
+    render_emails("accepted_email.html", [ctx1, ctx2, ...])   # one lookup, N renders
+
+Templates live in EMAIL_TEMPLATES_DIR (default app/templates). HTML is
+autoescaped.
+"""
+
+import os
+import threading
+import time as clock
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+EMAIL_TEMPLATES_DIR = os.getenv("EMAIL_TEMPLATES_DIR", str(Path(__file__).resolve().parents[1] / "templates"))
+EMAIL_TEMPLATES_CHECK_INTERVAL = float(os.getenv("EMAIL_TEMPLATES_CHECK_INTERVAL", 2))  # seconds
+
+EMAIL_TEMPLATES = (
+    "accepted_email.html",
+    "rejected_email.html",
+    "candidate_accepted.html",
+    "candidate_rejected.html",
+)
+
+
+class TemplateRegistry:
+
+    def __init__(self, directory: str = EMAIL_TEMPLATES_DIR, check_interval: float = EMAIL_TEMPLATES_CHECK_INTERVAL):
+        self.directory = directory
+        self.check_interval = check_interval
+        self._env = None
+        self._templates: Dict[str, tuple] = {}  # name → (template, mtime, checked_at)
+        self._lock = threading.Lock()
+        self.compiles = 0
+        self.hits = 0
+
+    @property
+    def env(self):
+        if self._env is None:
+            # jinja2 imported on first render, not when the routes load
+            from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+            self._env = Environment(
+                loader=FileSystemLoader(self.directory),
+                autoescape=select_autoescape(["html", "htm"]),
+                cache_size=0,        # the registry is the cache
+                auto_reload=False,
+            )
+        return self._env
+
+    def _mtime(self, name: str) -> tuple:
+        # size too: two edits within the filesystem's mtime granularity
+        stat = os.stat(os.path.join(self.directory, name))
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, name: str):
+        now = clock.monotonic()
+        cached = self._templates.get(name)
+        if cached is not None and now - cached[2] < self.check_interval:
+            self.hits += 1
+            return cached[0]
+
+        with self._lock:
+            mtime = self._mtime(name)
+            cached = self._templates.get(name)
+            if cached is not None and cached[1] == mtime:
+                self._templates[name] = (cached[0], mtime, now)
+                self.hits += 1
+                return cached[0]
+
+            template = self.env.get_template(name)
+            self._templates[name] = (template, mtime, now)
+            self.compiles += 1
+            return template
+
+    def render(self, name: str, context: Optional[dict] = None) -> str:
+        return self.get(name).render(context or {})
+
+    def render_many(self, name: str, contexts: Iterable[dict]) -> List[str]:
+        """Same template for every context: one lookup, then only the rendering."""
+        render = self.get(name).render
+        return [render(context) for context in contexts]
+
+    def warm(self, names: Iterable[str] = EMAIL_TEMPLATES) -> int:
+        """Compile ahead of time (e.g. in a worker's startup); missing files are skipped."""
+        warmed = 0
+        for name in names:
+            if os.path.exists(os.path.join(self.directory, name)):
+                self.get(name)
+                warmed += 1
+        return warmed
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+
+    def stats(self) -> dict:
+        return {
+            "directory": self.directory,
+            "templates": sorted(self._templates),
+            "compiles": self.compiles,
+            "hits": self.hits,
+        }
+
+
+template_registry = TemplateRegistry()
+
+
+def render_email(template: str, context: Optional[dict] = None) -> str:
+    return template_registry.render(template, context)
+
+
+def render_emails(template: str, contexts: Iterable[dict]) -> List[str]:
+    return template_registry.render_many(template, contexts)
@@ -0,0 +1,317 @@
+# app/utils/formula_engine.py
+
+"""
+Salary formula evaluator.
+
+Formula.formula_expression is parsed ONCE into a whitelisted AST and compiled
+to a code object; the compiled set of a salary structure is cached and
+evaluated over a NumPy array of monthly gross salaries, so a payroll run is
+one vectorized pass per structure instead of one DB load per employee.
+
+Expressions may use:
+    gross (also GROSS / gross_salary)        monthly gross being distributed
+    <component_code>                         any other active component
+    + - * / // % ** (constant exponent ≤ 10), comparisons, numbers
+    min(a, b) max(a, b) round(x[, n]) abs(x) where(cond, a, b)
+
+e.g.  BASIC = gross * 0.4     HRA = BASIC * 0.5     PF = min(BASIC * 0.12, 1800)
+"""
+
+import ast
+import threading
+import time as clock
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import event, or_
+from sqlalchemy.orm import Session, object_session
+
+from app.models.formula_m import Formula
+
+
+GROSS_NAMES = ("gross", "GROSS", "gross_salary")
+
+def _round(x, decimals=0):
+    # Constants are compiled as floats (see CompiledFormula); np.round needs an int
+    return np.round(x, int(decimals))
+
+
+# Scalar builtins mapped to their element-wise NumPy equivalents
+FUNCTIONS = {
+    "min": np.minimum,
+    "max": np.maximum,
+    "round": _round,
+    "abs": np.abs,
+    "where": np.where,
+}
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Call, ast.Name,
+    ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.UAdd, ast.USub,
+    ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+)
+
+
+MAX_EXPONENT = 10
+
+
+class FormulaError(ValueError):
+    """
+    A formula that cannot be parsed, references unknown names or is cyclic,
+    or whose evaluation fails (division by zero, overflow, bad arguments).
+    """
+
+
+# ---------------------------------------------------
+# COMPILATION
+# ---------------------------------------------------
+class CompiledFormula:
+    __slots__ = ("component_code", "formula_type", "names", "code")
+
+    def __init__(self, component_code: str, formula_type: str, expression: str):
+        self.component_code = component_code
+        self.formula_type = (formula_type or "earning").lower()
+
+        try:
+            tree = ast.parse(expression.strip(), mode="eval")
+        except SyntaxError as e:
+            raise FormulaError(f"{component_code}: invalid expression '{expression}' ({e.msg})")
+
+        names = set()
+        for node in ast.walk(tree):
+            if not isinstance(node, _ALLOWED_NODES):
+                raise FormulaError(f"{component_code}: '{type(node).__name__}' is not allowed in formulas")
+            if isinstance(node, ast.Call):
+                if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords:
+                    raise FormulaError(f"{component_code}: only {', '.join(FUNCTIONS)} can be called")
+            elif isinstance(node, ast.Name) and node.id not in FUNCTIONS:
+                names.add(node.id)
+            elif isinstance(node, ast.Constant):
+                if not isinstance(node.value, (int, float)):
+                    raise FormulaError(f"{component_code}: only numeric constants are allowed")
+                # Floats, not ints: an oversized result overflows instead of
+                # being computed as an ever-growing bigint
+                try:
+                    node.value = float(node.value)
+                except OverflowError:
+                    raise FormulaError(f"{component_code}: constant out of range")
+            elif isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+                exponent = node.right
+                if not (isinstance(exponent, ast.Constant) and isinstance(exponent.value, (int, float))
+                        and abs(exponent.value) <= MAX_EXPONENT):
+                    raise FormulaError(
+                        f"{component_code}: '**' needs a numeric constant exponent of at most {MAX_EXPONENT}"
+                    )
+
+        self.names = names
+        self.code = compile(tree, f"<formula {component_code}>", "eval")
+
+
+class CompiledFormulaSet:
+    """Formulas of one salary structure, in dependency order."""
+
+    def __init__(self, formulas: List[CompiledFormula]):
+        self.formulas = _dependency_order(formulas)
+
+    def __len__(self):
+        return len(self.formulas)
+
+    def evaluate(self, gross) -> Dict[str, np.ndarray]:
+        """component_code → array of component amounts (same shape as gross)."""
+        gross = np.asarray(gross, dtype=np.float64)
+        namespace = dict(FUNCTIONS)
+        namespace.update({name: gross for name in GROSS_NAMES})
+
+        results: Dict[str, np.ndarray] = {}
+        for f in self.formulas:
+            # NumPy only warns on x / 0 and overflow → raise, never store inf / nan
+            try:
+                with np.errstate(all="raise", under="ignore"):
+                    value = eval(f.code, {"__builtins__": {}}, namespace)
+                    value = np.broadcast_to(np.asarray(value, dtype=np.float64), gross.shape)
+            except (ArithmeticError, TypeError, ValueError) as e:
+                raise FormulaError(f"{f.component_code}: {e}")
+            if not np.isfinite(value).all():
+                raise FormulaError(f"{f.component_code}: result is not a finite number")
+            namespace[f.component_code] = value
+            results[f.component_code] = value
+        return results
+
+    def net_amounts(self, gross) -> Optional[np.ndarray]:
+        """Σ earnings − Σ deductions per element; None when there are no formulas."""
+        if not self.formulas:
+            return None
+
+        components = self.evaluate(gross)
+        total = np.zeros(np.shape(gross), dtype=np.float64)
+        for f in self.formulas:
+            if f.formula_type == "deduction":
+                total -= components[f.component_code]
+            else:
+                total += components[f.component_code]
+        return total
+
+
+def _dependency_order(formulas: List[CompiledFormula]) -> List[CompiledFormula]:
+    by_code = {f.component_code: f for f in formulas}
+
+    for f in formulas:
+        unknown = f.names - set(by_code) - set(GROSS_NAMES)
+        if unknown:
+            raise FormulaError(f"{f.component_code}: unknown name(s) {', '.join(sorted(unknown))}")
+
+    ordered, done, visiting = [], set(), set()
+
+    def visit(code):
+        if code in done:
+            return
+        if code in visiting:
+            raise FormulaError(f"Circular formula reference through '{code}'")
+        visiting.add(code)
+        for dep in by_code[code].names & set(by_code):
+            visit(dep)
+        visiting.discard(code)
+        done.add(code)
+        ordered.append(by_code[code])
+
+    for f in formulas:
+        visit(f.component_code)
+    return ordered
+
+
+def compile_formulas(rows: Iterable) -> CompiledFormulaSet:
+    """Formula rows (anything with component_code / formula_type / formula_expression)."""
+    return CompiledFormulaSet([
+        CompiledFormula(r.component_code, r.formula_type, r.formula_expression)
+        for r in rows
+        if (r.formula_expression or "").strip()
+    ])
+
+
+# ---------------------------------------------------
+# CACHE (per salary structure)
+# ---------------------------------------------------
+class FormulaCache:
+    """
+    Compiled formula sets per salary_structure_id.
+    Formula inserts / updates / deletes through the ORM invalidate entries;
+    the TTL bounds staleness for changes made by other processes.
+    """
+
+    def __init__(self, max_size: int = 256, ttl_seconds: int = 300):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._items: "OrderedDict[Optional[int], tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, salary_structure_id: Optional[int]) -> Optional[CompiledFormulaSet]:
+        with self._lock:
+            item = self._items.get(salary_structure_id)
+            if item is None:
+                return None
+            stored_at, compiled = item
+            if clock.monotonic() - stored_at > self.ttl_seconds:
+                del self._items[salary_structure_id]
+                return None
+            self._items.move_to_end(salary_structure_id)
+            return compiled
+
+    def put(self, salary_structure_id: Optional[int], compiled: CompiledFormulaSet):
+        with self._lock:
+            self._items[salary_structure_id] = (clock.monotonic(), compiled)
+            self._items.move_to_end(salary_structure_id)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def invalidate(self, salary_structure_id: Optional[int]):
+        # Structure-less formulas apply to every structure
+        if salary_structure_id is None:
+            self.clear()
+            return
+        with self._lock:
+            self._items.pop(salary_structure_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+formula_cache = FormulaCache()
+
+
+def get_compiled_formulas(db: Session, salary_structure_id: Optional[int] = None) -> CompiledFormulaSet:
+    """Active formulas of a structure (plus structure-less ones), compiled once."""
+    compiled = formula_cache.get(salary_structure_id)
+    if compiled is not None:
+        return compiled
+
+    query = db.query(
+        Formula.component_code,
+        Formula.formula_type,
+        Formula.formula_expression,
+    ).filter(Formula.is_active == True)
+
+    if salary_structure_id is None:
+        query = query.filter(Formula.salary_structure_id == None)
+    else:
+        query = query.filter(or_(
+            Formula.salary_structure_id == salary_structure_id,
+            Formula.salary_structure_id == None
+        ))
+
+    compiled = compile_formulas(query.order_by(Formula.id).all())
+    formula_cache.put(salary_structure_id, compiled)
+    return compiled
+
+
+# Invalidate on flush, and again after commit so a reload that raced the
+# open transaction cannot keep the old formulas
+def _queue_invalidation(mapper, connection, target):
+    formula_cache.invalidate(target.salary_structure_id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("formula_invalidations", set()).add(target.salary_structure_id)
+
+
+def _queue_update_invalidation(mapper, connection, target):
+    # salary_structure_id itself may have changed → drop everything
+    formula_cache.clear()
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("formula_invalidations", set()).add(None)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session):
+    for salary_structure_id in session.info.pop("formula_invalidations", ()):
+        formula_cache.invalidate(salary_structure_id)
+
+
+event.listen(Formula, "after_insert", _queue_invalidation)
+event.listen(Formula, "after_delete", _queue_invalidation)
+event.listen(Formula, "after_update", _queue_update_invalidation)
+
+
+# ---------------------------------------------------
+# PUBLIC API
+# ---------------------------------------------------
+def calculate_salaries_with_formulas(
+    db: Session,
+    gross_salaries,
+    salary_structure_id: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """Vectorized: component_code → amounts for every gross in the array."""
+    return get_compiled_formulas(db, salary_structure_id).evaluate(gross_salaries)
+
+
+def calculate_salary_with_formulas(
+    db: Session,
+    gross_salary: float,
+    salary_structure_id: Optional[int] = None,
+) -> Dict[str, float]:
+    """Single employee: component_code → amount."""
+    components = calculate_salaries_with_formulas(db, [gross_salary], salary_structure_id)
+    return {code: float(values[0]) for code, values in components.items()}
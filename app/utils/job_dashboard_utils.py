@@ -0,0 +1,206 @@
+# app/utils/job_dashboard_utils.py
+
+"""
+Job posting dashboard: candidate counts per posting.
+
+Two sources, same output:
+- live:     one grouped query with conditional aggregation over candidates
+- counters: job_posting_counters, kept current by the Candidate ORM events
+            below, so the read is O(postings) instead of O(candidates)
+
+JOB_DASHBOARD_COUNTERS=true switches the dashboard to the counter table.
+"""
+
+import os
+from typing import Iterable, List, Optional
+
+from sqlalchemy import case, event, func, inspect, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.candidate_m import Candidate
+from app.models.job_description_m import JobDescription
+from app.models.job_posting_counter_m import JobPostingCounter
+from app.models.job_posting_m import JobPosting
+
+
+JOB_DASHBOARD_COUNTERS = os.getenv("JOB_DASHBOARD_COUNTERS", "False").lower() == "true"
+
+# Candidate.status → counter column
+STATUS_COLUMNS = {
+    "Pending": "pending",
+    "Accepted": "accepted",
+    "Rejected": "rejected",
+}
+
+counters = JobPostingCounter.__table__
+
+
+# ---------------------------------------------------
+# DASHBOARD
+# ---------------------------------------------------
+def _status_count(status: str):
+    return func.coalesce(func.sum(case((Candidate.status == status, 1), else_=0)), 0)
+
+
+def job_dashboard_rows(
+    db: Session,
+    organization_id: Optional[int] = None,
+    job_posting_id: Optional[int] = None,
+    use_counters: bool = JOB_DASHBOARD_COUNTERS,
+) -> List[dict]:
+    """One query either way; titles come from the same join."""
+    columns = [
+        JobPosting.id.label("job_id"),
+        JobPosting.job_type,
+        func.coalesce(JobDescription.title, "").label("role"),
+        JobPosting.location,
+        JobPosting.approval_status,
+    ]
+
+    if use_counters:
+        query = db.query(
+            *columns,
+            func.coalesce(JobPostingCounter.total_candidates, 0).label("total_candidates"),
+            func.coalesce(JobPostingCounter.pending, 0).label("pending"),
+            func.coalesce(JobPostingCounter.accepted, 0).label("accepted"),
+            func.coalesce(JobPostingCounter.rejected, 0).label("rejected"),
+        ).outerjoin(JobPostingCounter, JobPostingCounter.job_posting_id == JobPosting.id)
+    else:
+        query = db.query(
+            *columns,
+            func.count(Candidate.id).label("total_candidates"),
+            *(_status_count(status).label(column) for status, column in STATUS_COLUMNS.items()),
+        ).outerjoin(Candidate, Candidate.job_posting_id == JobPosting.id).group_by(
+            JobPosting.id,
+            JobPosting.job_type,
+            JobDescription.title,
+            JobPosting.location,
+            JobPosting.approval_status,
+        )
+
+    query = query.outerjoin(JobDescription, JobDescription.id == JobPosting.job_description_id)
+
+    if organization_id is not None:
+        query = query.filter(JobPosting.organization_id == organization_id)
+    if job_posting_id:
+        query = query.filter(JobPosting.id == job_posting_id)
+
+    return [
+        {
+            "job_id": row.job_id,
+            "job_type": row.job_type,
+            "role": row.role,
+            "location": row.location,
+            "approval_status": row.approval_status,
+            "total_candidates": int(row.total_candidates),
+            "pending": int(row.pending),
+            "accepted": int(row.accepted),
+            "rejected": int(row.rejected),
+        }
+        for row in query.order_by(JobPosting.id)
+    ]
+
+
+# ---------------------------------------------------
+# COUNTER MAINTENANCE
+# ---------------------------------------------------
+def _recount_values(connection, job_posting_id: int) -> dict:
+    row = connection.execute(
+        select(
+            func.count(Candidate.id).label("total_candidates"),
+            *(_status_count(status).label(column) for status, column in STATUS_COLUMNS.items()),
+        ).where(Candidate.job_posting_id == job_posting_id)
+    ).one()
+    return {key: int(value) for key, value in row._mapping.items()}
+
+
+def rebuild_job_posting_counters(db: Session, job_posting_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute counters from candidates (no commit). Needed after writes that
+    bypass the ORM events, e.g. Query.update() / bulk_update_mappings.
+    """
+    connection = db.connection()
+    if job_posting_ids is None:
+        job_posting_ids = [row.id for row in db.query(JobPosting.id)]
+
+    rebuilt = 0
+    for job_posting_id in set(job_posting_ids):
+        if job_posting_id is None:
+            continue
+        values = _recount_values(connection, job_posting_id)
+        result = connection.execute(
+            update(counters).where(counters.c.job_posting_id == job_posting_id).values(**values)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(counters).values(job_posting_id=job_posting_id, **values))
+        rebuilt += 1
+    return rebuilt
+
+
+def _deltas(status: Optional[str], sign: int) -> dict:
+    deltas = {"total_candidates": sign}
+    if status in STATUS_COLUMNS:
+        deltas[STATUS_COLUMNS[status]] = sign
+    return deltas
+
+
+def _bump(connection, job_posting_id: Optional[int], deltas: dict):
+    if job_posting_id is None:
+        return
+
+    result = connection.execute(
+        update(counters)
+        .where(counters.c.job_posting_id == job_posting_id)
+        .values(**{column: counters.c[column] + delta for column, delta in deltas.items()})
+    )
+    if result.rowcount == 0:
+        # Posting without a counter row yet → start from the real counts
+        connection.execute(insert(counters).values(
+            job_posting_id=job_posting_id, **_recount_values(connection, job_posting_id)
+        ))
+
+
+def _previous(state, key):
+    history = state.attrs[key].history
+    return history.deleted[0] if history.deleted else getattr(state.object, key)
+
+
+def _candidate_inserted(mapper, connection, target):
+    _bump(connection, target.job_posting_id, _deltas(target.status, +1))
+
+
+def _candidate_updated(mapper, connection, target):
+    state = inspect(target)
+    old_posting = _previous(state, "job_posting_id")
+    old_status = _previous(state, "status")
+
+    if old_posting == target.job_posting_id and old_status == target.status:
+        return
+
+    _bump(connection, old_posting, _deltas(old_status, -1))
+    _bump(connection, target.job_posting_id, _deltas(target.status, +1))
+
+
+def _candidate_deleted(mapper, connection, target):
+    _bump(connection, target.job_posting_id, _deltas(target.status, -1))
+
+
+def _posting_inserted(mapper, connection, target):
+    connection.execute(insert(counters).values(
+        job_posting_id=target.id, total_candidates=0, pending=0, accepted=0, rejected=0
+    ))
+
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    return value
+
+
+event.listen(Candidate, "after_insert", _candidate_inserted)
+event.listen(Candidate, "after_update", _candidate_updated)
+event.listen(Candidate, "after_delete", _candidate_deleted)
+event.listen(JobPosting, "after_insert", _posting_inserted)
+
+# active_history: the replaced status / posting is loaded even when the
+# attribute was expired (e.g. after commit), so the old bucket is known
+for attribute in (Candidate.status, Candidate.job_posting_id):
+    event.listen(attribute, "set", _load_previous_value, retval=True, active_history=True)
@@ -0,0 +1,190 @@
+# app/utils/job_posting_cache.py
+
+"""
+Short-TTL cache of GET /job-postings/filters responses.
+
+Entries are keyed by (organization_id, location, job_type, role_id,
+branch_id, min_salary), with organization_id None for the all-organizations
+(super_admin) view. They live for JOB_FILTER_CACHE_TTL seconds, at most
+JOB_FILTER_CACHE_SIZE of them, least recently used evicted first.
+
+Invalidation:
+- JobPosting inserts / updates / deletes through the ORM drop the
+  organization's entries and the all-organizations ones (at flush, and again
+  after commit).
+- A session holding uncommitted posting changes never fills the cache, and a
+  load that raced an invalidation is not stored.
+- Writes that bypass the ORM, and renamed branches / job descriptions (they
+  are nested in the response), are only picked up when the TTL expires.
+  Call job_filter_cache.invalidate(organization_id) to see them sooner.
+"""
+
+import os
+import threading
+import time as clock
+from collections import OrderedDict
+from typing import Callable, List, NamedTuple, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app.models.job_posting_m import JobPosting
+
+
+JOB_FILTER_CACHE_SIZE = int(os.getenv("JOB_FILTER_CACHE_SIZE", 512))    # filter combinations kept
+JOB_FILTER_CACHE_TTL = float(os.getenv("JOB_FILTER_CACHE_TTL", 30))     # seconds
+
+SESSION_KEY = "job_filter_invalidations"
+
+
+class JobFilterKey(NamedTuple):
+    organization_id: Optional[int]
+    location: Optional[str]
+    job_type: Optional[str]
+    role_id: Optional[int]
+    branch_id: Optional[int]
+    min_salary: Optional[int]
+
+
+def normalize_location(location: Optional[str]) -> Optional[str]:
+    """ "  New   DELHI " → "new delhi"; blank → None."""
+    if not location:
+        return None
+    return " ".join(location.split()).casefold() or None
+
+
+def filter_key(organization_id, location=None, job_type=None, role_id=None, branch_id=None, min_salary=None) -> JobFilterKey:
+    # Falsy filters are "not set", as in the route
+    return JobFilterKey(
+        organization_id,
+        normalize_location(location),
+        getattr(job_type, "value", job_type) or None,
+        role_id or None,
+        branch_id or None,
+        min_salary or None,
+    )
+
+
+def matching_locations(db: Session, organization_id: Optional[int], location: str) -> List[str]:
+    """
+    Stored locations containing `location` (case-insensitive).
+
+    Locations repeat across postings (a few cities per organization), so the
+    distinct values are read from idx_job_postings_org_location and matched
+    here. The postings query then filters on location IN (...), which uses the
+    index, where a leading-wildcard ILIKE scans every row.
+    """
+    query = db.query(JobPosting.location).group_by(JobPosting.location)
+    if organization_id is not None:
+        query = query.filter(JobPosting.organization_id == organization_id)
+
+    term = normalize_location(location)
+    # Blank stored locations normalize to None → never match
+    return [value for (value,) in query if term in (normalize_location(value) or "")]
+
+
+# ---------------------------------------------------
+# CACHE
+# ---------------------------------------------------
+class JobFilterCache:
+
+    def __init__(self, max_size: int = JOB_FILTER_CACHE_SIZE, ttl_seconds: float = JOB_FILTER_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        self._items: "OrderedDict[JobFilterKey, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_load(self, db: Session, key: JobFilterKey, loader: Callable[[Session, JobFilterKey], list]) -> list:
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and clock.monotonic() - item[0] <= self.ttl_seconds:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item[1]
+            self.misses += 1
+            generation = self._generation
+
+        value = loader(db, key)
+
+        # Uncommitted posting changes in this session → not for other requests
+        if db.info.get(SESSION_KEY):
+            return value
+
+        with self._lock:
+            if generation == self._generation:
+                self._items[key] = (clock.monotonic(), value)
+                self._items.move_to_end(key)
+                while len(self._items) > self.max_size:
+                    self._items.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def invalidate(self, organization_id: Optional[int] = None):
+        """Drop one organization's entries (plus the all-organizations ones), or everything."""
+        with self._lock:
+            if organization_id is None:
+                self._items.clear()
+            else:
+                for key in [key for key in self._items if key.organization_id in (organization_id, None)]:
+                    del self._items[key]
+            self._generation += 1
+            self.invalidations += 1
+
+    def clear(self):
+        self.invalidate()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "pid": os.getpid(),
+            "entries": len(self._items),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+job_filter_cache = JobFilterCache()
+
+
+# Invalidate on flush, and again after commit so a load that raced the open
+# transaction cannot keep the old postings
+def _queue_invalidation(mapper, connection, target):
+    # organization_id itself may have been changed → the previous one too
+    organization_ids = {target.organization_id, *inspect(target).attrs.organization_id.history.deleted}
+    for organization_id in organization_ids:
+        job_filter_cache.invalidate(organization_id)
+
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(SESSION_KEY, set()).update(organization_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session):
+    for organization_id in session.info.pop(SESSION_KEY, ()):
+        job_filter_cache.invalidate(organization_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session):
+    # Rolled back: the cache was never filled from these rows (see get_or_load)
+    session.info.pop(SESSION_KEY, None)
+
+
+event.listen(JobPosting, "after_insert", _queue_invalidation)
+event.listen(JobPosting, "after_update", _queue_invalidation)
+event.listen(JobPosting, "after_delete", _queue_invalidation)
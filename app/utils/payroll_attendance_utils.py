@@ -1,63 +1,163 @@
 from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from models.attendance_summary_m import Attendance
+from app.models.attendance_summary_m import Attendance
+from app.models.payroll_attendance_m import PayrollAttendance
 from app.models.salary_structure_m import SalaryStructure
-from app.utils.formula_engine import calculate_salary_with_formulas
+from app.models.user_m import User
+from app.utils.attendance_utils import chunked
+from app.utils.formula_engine import get_compiled_formulas
+
+
+def parse_month(month: str):
+    """'YYYY-MM' → first day of the month (the Attendance.month key)."""
+    return datetime.strptime(month, "%Y-%m").date()
+
+
+def monthly_gross_salaries(db: Session, salary_structure_id: int, total_annuals) -> np.ndarray:
+    """
+    Monthly gross for many employees of one structure in one vectorized pass:
+    annual / 12, redistributed through the structure's formulas when it has any
+    (Σ earnings − Σ deductions).
+    """
+    gross = np.asarray(total_annuals, dtype=np.float64) / 12
+    net = get_compiled_formulas(db, salary_structure_id).net_amounts(gross)
+    return gross if net is None else net
+
+
+def payroll_values(user_id: int, month: str, monthly_gross, total_days, present_days, half_days, absent_days):
+    """PayrollAttendance fields from one monthly summary + monthly gross."""
+    total_days = total_days or 0
+    present_days = present_days or 0
+    half_days = half_days or 0
+
+    daily_salary = float(monthly_gross) / total_days if total_days else 0
+    gross_salary = daily_salary * (present_days + 0.5 * half_days)
+
+    return {
+        "user_id": user_id,
+        "month": month,
+        "total_days": total_days,
+        "present_days": present_days,
+        "half_days": half_days,
+        "absent_days": absent_days or 0,
+        "gross_salary": round(gross_salary, 2),
+        "net_salary": round(gross_salary, 2),
+        "generated_on": datetime.now().date(),
+    }
+
+
+def _payroll_source_query(db: Session, month_start):
+    """Summary ⋈ user ⋈ active salary structure — one row per payable user."""
+    return (
+        db.query(
+            Attendance.user_id,
+            Attendance.total_days,
+            Attendance.present_days,
+            Attendance.half_days,
+            Attendance.absent_days,
+            SalaryStructure.id.label("salary_structure_id"),
+            func.coalesce(SalaryStructure.total_annual, 0).label("total_annual"),
+        )
+        .join(User, User.id == Attendance.user_id)
+        .join(SalaryStructure, SalaryStructure.id == User.salary_structure_id)
+        # equality on the (user_id, month) key — index-friendly, unlike LIKE on a date
+        .filter(Attendance.month == month_start, SalaryStructure.is_active == True)
+    )
+
 
 def generate_attendance_based_salary(db: Session, user_id: int, month: str):
     """
     Calculates salary automatically based on attendance.
     Month format: 'YYYY-MM'
     """
+    row = _payroll_source_query(db, parse_month(month)).filter(
+        Attendance.user_id == user_id
+    ).first()
 
-    attendances = db.query(Attendance).filter(
-        Attendance.user_id == user_id,
-        Attendance.punch_in.like(f"{month}%")
-    ).all()
-
-    if not attendances:
+    if not row:
         return None
 
-    salary_structure = db.query(SalaryStructure).filter(
-        SalaryStructure.user_id == user_id,
-        SalaryStructure.is_active == True
-    ).first()
+    monthly_gross = monthly_gross_salaries(db, row.salary_structure_id, [row.total_annual])[0]
 
-    if not salary_structure:
-        return None
+    return payroll_values(
+        row.user_id, month, monthly_gross,
+        row.total_days, row.present_days, row.half_days, row.absent_days
+    )
+
+
+def generate_payroll_bulk(
+    db: Session,
+    month: str,
+    organization_id: Optional[int] = None,
+    branch_id: Optional[int] = None,
+    user_ids: Optional[Iterable[int]] = None,
+    overwrite: bool = False,
+):
+    """
+    PayrollAttendance rows for every user in scope with a summary and an active
+    salary structure: one joined read, batch compute, bulk insert (no commit).
+    overwrite=False keeps already generated rows untouched.
+    """
+    month_start = parse_month(month)
 
-    # Monthly gross from annual
-    basic = (salary_structure.basic_salary_annual or 0) / 12
-    allowances = (salary_structure.allowances_annual or 0) / 12
-    deductions = (salary_structure.deductions_annual or 0) / 12
-    bonus = (salary_structure.bonus_annual or 0) / 12
+    query = _payroll_source_query(db, month_start)
+    if organization_id is not None:
+        query = query.filter(User.organization_id == organization_id)
+    if branch_id is not None:
+        query = query.filter(User.branch_id == branch_id)
 
-    gross_salary = basic + allowances + bonus - deductions
+    if user_ids is None:
+        sources = query.all()
+    else:
+        sources = []
+        for id_chunk in chunked(list(user_ids)):
+            sources.extend(query.filter(Attendance.user_id.in_(id_chunk)).all())
 
-    # Apply formulas dynamically
-    calculated = calculate_salary_with_formulas(db, gross_salary)
-    gross_salary = sum(calculated.values()) if calculated else gross_salary
+    existing: Dict[int, int] = {}
+    for id_chunk in chunked([s.user_id for s in sources]):
+        existing.update({
+            row.user_id: row.id
+            for row in db.query(PayrollAttendance.id, PayrollAttendance.user_id).filter(
+                PayrollAttendance.user_id.in_(id_chunk),
+                PayrollAttendance.month == month
+            )
+        })
 
-    # Count attendance stats
-    total_days = len(attendances)
-    present_days = sum(1 for a in attendances if a.status == "Full Day")
-    half_days = sum(1 for a in attendances if a.status == "Half Day")
-    absent_days = total_days - (present_days + half_days)
+    to_insert: List[dict] = []
+    to_update: List[dict] = []
 
-    total_working_days = 30
-    per_day_salary = gross_salary / total_working_days
-    payable_days = present_days + (half_days * 0.5)
-    payable_salary = per_day_salary * payable_days
-    net_salary = round(payable_salary - deductions, 2)
+    # One formula pass per salary structure over all its employees
+    by_structure: Dict[int, list] = {}
+    for s in sources:
+        by_structure.setdefault(s.salary_structure_id, []).append(s)
+
+    monthly_gross: Dict[int, float] = {}
+    for structure_id, group in by_structure.items():
+        amounts = monthly_gross_salaries(db, structure_id, [s.total_annual for s in group])
+        monthly_gross.update(zip((s.user_id for s in group), amounts.tolist()))
+
+    for s in sources:
+        values = payroll_values(
+            s.user_id, month, monthly_gross[s.user_id],
+            s.total_days, s.present_days, s.half_days, s.absent_days
+        )
+        if s.user_id not in existing:
+            to_insert.append(dict(values, status="Generated"))
+        elif overwrite:
+            to_update.append(dict(values, id=existing[s.user_id]))
+
+    if to_insert:
+        db.bulk_insert_mappings(PayrollAttendance, to_insert)
+    if to_update:
+        db.bulk_update_mappings(PayrollAttendance, to_update)
 
     return {
-        "user_id": user_id,
         "month": month,
-        "total_days": total_days,
-        "present_days": present_days,
-        "half_days": half_days,
-        "absent_days": absent_days,
-        "gross_salary": round(gross_salary, 2),
-        "net_salary": net_salary,
-        "generated_on": datetime.now().date(),
+        "processed": len(sources),
+        "created": len(to_insert),
+        "updated": len(to_update),
+        "skipped": len(sources) - len(to_insert) - len(to_update),
     }
@@ -0,0 +1,389 @@
+# app/utils/punch_ingest_utils.py
+
+"""
+Streaming bulk ingestion of biometric device dumps (CSV / NDJSON).
+
+read → parse → batch → dedupe → insert, all generators, so memory stays
+bounded by batch_size regardless of the dump size. Repeats are dropped per
+batch; keys already stored (earlier batches, earlier dumps, a concurrent
+ingest) are skipped by the lookup and by the unique
+(bio_id, punch_date, punch_time) constraint.
+
+CLI:
+    python -m app.utils.punch_ingest_utils dump.csv
+    python -m app.utils.punch_ingest_utils dump.ndjson --batch-size 10000 --no-refresh
+"""
+
+import codecs
+import csv
+import io
+import json
+import time as clock
+from datetime import date, time
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.attendance_punch_m import AttendancePunch
+from app.utils.attendance_utils import chunked, refresh_attendance_for_punches
+
+
+DEFAULT_BATCH_SIZE = 5000
+MAX_REJECTED_SAMPLES = 100  # rejected rows echoed back in the report
+
+SUPPORTED_FORMATS = ("csv", "ndjson")
+PUNCH_COLUMNS = ("bio_id", "punch_date", "punch_time", "punch_type", "created_by")
+
+PunchKey = Tuple[str, date, time]
+
+
+class IngestReport:
+    """Counters for one ingestion run."""
+
+    def __init__(self):
+        self.started_at = clock.perf_counter()
+        self.rows_read = 0
+        self.inserted = 0
+        self.duplicates = 0      # repeated inside one batch
+        self.already_exists = 0  # already stored (incl. earlier batches of this dump)
+        self.rejected = 0
+        self.rejected_rows: List[dict] = []
+        self.batches = 0
+        self.summaries_refreshed = 0
+        self.bulk_path = None
+
+    def reject(self, line_no: int, reason: str, raw=None):
+        self.rejected += 1
+        if len(self.rejected_rows) < MAX_REJECTED_SAMPLES:
+            self.rejected_rows.append({"line": line_no, "reason": reason, "row": raw})
+
+    def as_dict(self) -> dict:
+        elapsed = clock.perf_counter() - self.started_at
+        return {
+            "rows_read": self.rows_read,
+            "inserted": self.inserted,
+            "duplicates": self.duplicates,
+            "already_exists": self.already_exists,
+            "rejected": self.rejected,
+            "rejected_rows": self.rejected_rows,
+            "batches": self.batches,
+            "summaries_refreshed": self.summaries_refreshed,
+            "bulk_path": self.bulk_path,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_sec": round(self.rows_read / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+
+
+# --------------------------------------------------
+# Format detection
+# --------------------------------------------------
+def detect_format(filename: Optional[str], fmt: Optional[str] = None) -> str:
+    if fmt:
+        fmt = fmt.lower()
+    elif filename and filename.lower().endswith((".ndjson", ".jsonl", ".json")):
+        fmt = "ndjson"
+    else:
+        fmt = "csv"
+
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}'. Allowed: {', '.join(SUPPORTED_FORMATS)}")
+    return fmt
+
+
+# --------------------------------------------------
+# Pipeline stages
+# --------------------------------------------------
+def _decoded_lines(stream: BinaryIO, position: List[int], report: IngestReport) -> Iterator[str]:
+    """
+    UTF-8 lines of a binary stream. A line that is not valid UTF-8 is rejected
+    on its own (the rest of the dump still loads); position[0] is the line
+    number of the last line yielded.
+    """
+    for line_no, raw in enumerate(stream, start=1):
+        if line_no == 1 and raw.startswith(codecs.BOM_UTF8):
+            raw = raw[len(codecs.BOM_UTF8):]
+        try:
+            line = raw.decode("utf-8")
+        except UnicodeDecodeError:
+            report.rows_read += 1
+            report.reject(line_no, "Not valid UTF-8", raw[:200].decode("utf-8", "replace"))
+            continue
+        position[0] = line_no
+        yield line
+
+
+def read_rows(stream: BinaryIO, fmt: str, report: IngestReport) -> Iterator[Tuple[int, dict]]:
+    """Yield (line_no, raw dict) from a binary stream without loading it whole."""
+    # The caller's stream is left open (UploadFile / open() handle)
+    position = [0]
+    lines = _decoded_lines(stream, position, report)
+
+    if fmt == "csv":
+        for row in csv.DictReader(lines):
+            report.rows_read += 1
+            yield position[0], row
+        return
+
+    for line in lines:
+        line_no = position[0]
+        line = line.strip()
+        if not line:
+            continue
+        report.rows_read += 1
+        try:
+            row = json.loads(line)
+        except ValueError:
+            report.reject(line_no, "Invalid JSON", line[:200])
+            continue
+        if not isinstance(row, dict):
+            report.reject(line_no, "Expected a JSON object", line[:200])
+            continue
+        yield line_no, row
+
+
+def parse_rows(rows: Iterable[Tuple[int, dict]], report: IngestReport) -> Iterator[dict]:
+    """Validate / normalize to AttendancePunchCreate fields."""
+    for line_no, row in rows:
+        bio_id = str(row.get("bio_id") or "").strip()
+        if not bio_id:
+            report.reject(line_no, "bio_id is required", row)
+            continue
+
+        try:
+            punch_date = date.fromisoformat(str(row.get("punch_date") or "").strip())
+            punch_time = time.fromisoformat(str(row.get("punch_time") or "").strip())
+        except ValueError:
+            report.reject(line_no, "Invalid punch_date / punch_time", row)
+            continue
+
+        punch_type = (str(row.get("punch_type") or "").strip() or None)
+
+        yield {
+            "bio_id": bio_id,
+            "punch_date": punch_date,
+            "punch_time": punch_time,
+            "punch_type": punch_type,
+        }
+
+
+def dedupe_batch(batch: List[dict], report: IngestReport) -> List[dict]:
+    """
+    Drop repeats of (bio_id, punch_date, punch_time) inside one batch. Repeats
+    in a later batch are caught by existing_keys (and the unique constraint),
+    so memory stays bounded by batch_size.
+    """
+    seen: Set[PunchKey] = set()
+    unique = []
+    for row in batch:
+        key = (row["bio_id"], row["punch_date"], row["punch_time"])
+        if key in seen:
+            report.duplicates += 1
+            continue
+        seen.add(key)
+        unique.append(row)
+    return unique
+
+
+def batched(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# --------------------------------------------------
+# Loading
+# --------------------------------------------------
+def existing_keys(db: Session, batch: List[dict]) -> Set[PunchKey]:
+    """Keys of this batch already stored (one range query per bio chunk)."""
+    bio_ids = list({r["bio_id"] for r in batch})
+    first_day = min(r["punch_date"] for r in batch)
+    last_day = max(r["punch_date"] for r in batch)
+
+    keys = set()
+    for bio_chunk in chunked(bio_ids):
+        keys.update(
+            (p.bio_id, p.punch_date, p.punch_time)
+            for p in db.query(
+                AttendancePunch.bio_id,
+                AttendancePunch.punch_date,
+                AttendancePunch.punch_time
+            ).filter(
+                AttendancePunch.bio_id.in_(bio_chunk),
+                AttendancePunch.punch_date >= first_day,
+                AttendancePunch.punch_date <= last_day
+            )
+        )
+    return keys
+
+
+def _copy_rows_postgres(db: Session, rows: List[dict]) -> bool:
+    """COPY ... FROM STDIN through the raw psycopg2 cursor. False if unavailable."""
+    dbapi_conn = db.connection().connection
+    cursor = dbapi_conn.cursor()
+    if not hasattr(cursor, "copy_expert"):
+        cursor.close()
+        return False
+
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for r in rows:
+        writer.writerow([r[c] if r[c] is not None else "" for c in PUNCH_COLUMNS])
+    buf.seek(0)
+
+    try:
+        cursor.copy_expert(
+            f"COPY {AttendancePunch.__tablename__} ({', '.join(PUNCH_COLUMNS)}) "
+            "FROM STDIN WITH (FORMAT csv, NULL '')",
+            buf
+        )
+    finally:
+        cursor.close()
+    return True
+
+
+def _insert_ignoring_duplicates(db: Session, rows: List[dict]) -> int:
+    """
+    Multi-row INSERT that skips rows hitting uq_attendance_punch_bio_date_time;
+    any other error (FK, NOT NULL, truncation) still raises.
+    """
+    dialect = db.bind.dialect.name
+    table = AttendancePunch.__table__
+
+    if dialect == "mysql":
+        # Not INSERT IGNORE: that downgrades every error to a warning
+        statement = mysql_insert(table)
+        statement = statement.on_duplicate_key_update(id=table.c.id)
+        db.execute(statement, rows)
+        # With CLIENT_FOUND_ROWS (SQLAlchemy's default) a skipped duplicate
+        # counts as an affected row too, so rowcount cannot tell them apart
+        return len(rows)
+
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        statement = dialect_insert(table).on_conflict_do_nothing()
+    else:
+        statement = insert(table)
+
+    result = db.execute(statement, rows)
+    # Some drivers cannot count executemany rows (-1)
+    return result.rowcount if result.rowcount is not None and result.rowcount >= 0 else len(rows)
+
+
+def insert_rows(db: Session, rows: List[dict], report: IngestReport) -> int:
+    """
+    Native bulk path where the driver has one; returns rows inserted.
+    - PostgreSQL (psycopg2): COPY FROM STDIN, or INSERT ... ON CONFLICT DO
+      NOTHING when a concurrent ingest stored some of the keys meanwhile
+    - MySQL (pymysql/mysqlclient): INSERT ... ON DUPLICATE KEY UPDATE id = id,
+      one multi-row statement
+    - SQLite: INSERT ... ON CONFLICT DO NOTHING
+    """
+    if db.bind.dialect.name == "postgresql":
+        try:
+            with db.begin_nested():
+                copied = _copy_rows_postgres(db, rows)
+        except db.bind.dialect.dbapi.IntegrityError:
+            copied = False
+        if copied:
+            report.bulk_path = "copy"
+            return len(rows)
+
+    report.bulk_path = "executemany"
+    return _insert_ignoring_duplicates(db, rows)
+
+
+def ingest_punches(
+    db: Session,
+    stream: BinaryIO,
+    fmt: str = "csv",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    created_by: str = "bulk_import",
+    refresh_summaries: bool = True,
+) -> dict:
+    """
+    Stream a device dump into attendance punches.
+    Each batch is committed on its own; generated monthly summaries for the
+    touched (bio_id, date) pairs are updated incrementally in the same commit.
+    """
+    report = IngestReport()
+
+    rows = parse_rows(read_rows(stream, fmt, report), report)
+
+    for batch in batched(rows, batch_size):
+        batch = dedupe_batch(batch, report)
+        stored = existing_keys(db, batch)
+        new_rows = [
+            dict(r, created_by=created_by)
+            for r in batch
+            if (r["bio_id"], r["punch_date"], r["punch_time"]) not in stored
+        ]
+        report.already_exists += len(batch) - len(new_rows)
+
+        inserted = 0
+        if new_rows:
+            inserted = insert_rows(db, new_rows, report)
+            # Stored by a concurrent ingest since existing_keys ran
+            report.already_exists += len(new_rows) - inserted
+            db.flush()
+
+            if refresh_summaries:
+                report.summaries_refreshed += refresh_attendance_for_punches(
+                    db, {(r["bio_id"], r["punch_date"]) for r in new_rows}
+                )
+
+        db.commit()
+        report.inserted += inserted
+        report.batches += 1
+
+    return report.as_dict()
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def main(argv=None):
+    import argparse
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Bulk-load biometric punch dumps (CSV / NDJSON)")
+    parser.add_argument("path", help="Device dump file")
+    parser.add_argument("--format", choices=SUPPORTED_FORMATS, default=None,
+                        help="Defaults to the file extension (.ndjson/.jsonl → ndjson, else csv)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--created-by", default="bulk_import")
+    parser.add_argument("--no-refresh", action="store_true",
+                        help="Skip incremental attendance summary maintenance")
+    args = parser.parse_args(argv)
+
+    fmt = detect_format(args.path, args.format)
+
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as fh:
+            result = ingest_punches(
+                db,
+                fh,
+                fmt=fmt,
+                batch_size=args.batch_size,
+                created_by=args.created_by,
+                refresh_summaries=not args.no_refresh,
+            )
+    finally:
+        db.close()
+
+    print(json.dumps(result, indent=2, default=str))
+    print(f"✅ {result['inserted']} punches inserted, {result['rejected']} rejected "
+          f"({result['rows_per_sec']} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
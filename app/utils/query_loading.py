@@ -0,0 +1,60 @@
+# app/utils/query_loading.py
+
+"""
+Eager loading driven by response schemas.
+
+A response schema lists the relationships it serializes:
+
+    class JobPostingResponse(BaseModel):
+        job_description: Optional[JobDescriptionBrief] = None
+        eager_load: ClassVar[Tuple[str, ...]] = ("job_description",)
+
+and every query feeding that schema gets the matching loader options, so
+serialization never lazy-loads row by row (N+1):
+- many-to-one / one-to-one → joinedload  (same SELECT)
+- collections              → selectinload (one extra SELECT ... IN)
+Dotted paths ("job_posting.job_description") chain the loaders.
+"""
+
+from functools import lru_cache
+from typing import Optional, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import Query, Session, joinedload, selectinload
+
+
+def _loader(parent_loader, relationship):
+    strategy = selectinload if relationship.uselist else joinedload
+    attribute = relationship.class_attribute
+    if parent_loader is None:
+        return strategy(attribute)
+    return getattr(parent_loader, strategy.__name__)(attribute)
+
+
+@lru_cache(maxsize=None)
+def loader_options(entity, schema: Type[BaseModel]) -> Tuple:
+    """Loader options for `entity` rows serialized through `schema`."""
+    options = []
+    for path in getattr(schema, "eager_load", ()):
+        mapper, loader = inspect(entity), None
+        for name in path.split("."):
+            relationship = mapper.relationships.get(name)
+            if relationship is None:
+                raise ValueError(f"{schema.__name__}.eager_load: {mapper.class_.__name__} has no relationship '{name}'")
+            loader = _loader(loader, relationship)
+            mapper = relationship.mapper
+        options.append(loader)
+    return tuple(options)
+
+
+def with_loaders(query: Query, schema: Type[BaseModel]) -> Query:
+    """Apply the schema's loaders to a query over a single mapped entity."""
+    entity = query.column_descriptions[0]["entity"]
+    options = loader_options(entity, schema)
+    return query.options(*options) if options else query
+
+
+def get_for_response(db: Session, entity, ident, schema: Type[BaseModel]) -> Optional[object]:
+    """Session.get + the schema's loaders, refreshing an instance already in the session."""
+    return db.get(entity, ident, options=loader_options(entity, schema), populate_existing=True)
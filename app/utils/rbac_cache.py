@@ -0,0 +1,251 @@
+# app/utils/rbac_cache.py
+
+"""
+In-process cache of the RBAC matrix: role_id → {menu_id → Rights}.
+
+require_view/create/edit/delete_permission(menu_id) resolve through
+role_rights_cache.allows(db, role_id, menu_id, action) instead of querying
+role_rights on every request. One miss loads every menu of the role, so a
+user browsing the app costs one query per role per TTL.
+
+Invalidation:
+- RoleRight inserts / updates / deletes through the ORM drop the role's
+  entry (at flush, and again after commit).
+- Writes that bypass the ORM (Query.update, raw SQL) must call
+  role_rights_cache.invalidate(role_id).
+- With RBAC_CACHE_REDIS_URL set, every invalidation also bumps a shared
+  generation counter; other workers notice it within
+  RBAC_CACHE_CHECK_INTERVAL seconds and drop their local copies.
+"""
+
+import os
+import threading
+import time as clock
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app.models.role_right_m import RoleRight
+
+
+RBAC_CACHE_SIZE = int(os.getenv("RBAC_CACHE_SIZE", 1024))               # roles kept
+RBAC_CACHE_TTL = int(os.getenv("RBAC_CACHE_TTL", 300))                  # seconds
+RBAC_CACHE_REDIS_URL = os.getenv("RBAC_CACHE_REDIS_URL")
+RBAC_CACHE_CHECK_INTERVAL = float(os.getenv("RBAC_CACHE_CHECK_INTERVAL", 1))  # seconds between generation reads
+
+ACTIONS = ("view", "create", "edit", "delete")
+
+
+class Rights(NamedTuple):
+    can_view: bool = False
+    can_create: bool = False
+    can_edit: bool = False
+    can_delete: bool = False
+
+    def allows(self, action: str) -> bool:
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action '{action}'. Allowed: {', '.join(ACTIONS)}")
+        return getattr(self, f"can_{action}")
+
+
+NO_RIGHTS = Rights()
+
+
+def load_role_rights(db: Session, role_id: int) -> Dict[int, Rights]:
+    """Every menu right of one role, one query."""
+    rows = db.query(
+        RoleRight.menu_id,
+        RoleRight.can_view,
+        RoleRight.can_create,
+        RoleRight.can_edit,
+        RoleRight.can_delete,
+    ).filter(RoleRight.role_id == role_id)
+
+    return {
+        row.menu_id: Rights(bool(row.can_view), bool(row.can_create), bool(row.can_edit), bool(row.can_delete))
+        for row in rows
+    }
+
+
+# ---------------------------------------------------
+# SHARED GENERATION (multi-worker coherence)
+# ---------------------------------------------------
+class MemoryGenerationBackend:
+    """Single-process stand-in for the Redis backend (tests, one worker)."""
+
+    def __init__(self):
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self) -> int:
+        return self._generation
+
+    def bump(self) -> int:
+        with self._lock:
+            self._generation += 1
+            return self._generation
+
+
+class RedisGenerationBackend:
+    """Generation counter in Redis; only the counter is shared, rights stay local."""
+
+    KEY = "rbac:role_rights:generation"
+
+    def __init__(self, url: str):
+        import redis  # optional dependency, only needed when RBAC_CACHE_REDIS_URL is set
+
+        self._client = redis.Redis.from_url(url, socket_timeout=0.2)
+
+    def get(self) -> int:
+        return int(self._client.get(self.KEY) or 0)
+
+    def bump(self) -> int:
+        return int(self._client.incr(self.KEY))
+
+
+# ---------------------------------------------------
+# CACHE
+# ---------------------------------------------------
+class RoleRightsCache:
+
+    def __init__(
+        self,
+        loader: Callable[[Session, int], Dict[int, Rights]] = load_role_rights,
+        max_size: int = RBAC_CACHE_SIZE,
+        ttl_seconds: float = RBAC_CACHE_TTL,
+        backend=None,
+        check_interval: float = RBAC_CACHE_CHECK_INTERVAL,
+    ):
+        self.loader = loader
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self.check_interval = check_interval
+
+        self._items: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0  # local: bumped by every invalidation / shared-generation clear
+        self.reset_stats()
+        self._generation = 0
+        self._generation_checked_at = float("-inf")
+        self._sync_generation()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.backend_errors = 0
+
+    # -------- lookups --------
+    def role_rights(self, db: Session, role_id: int) -> Dict[int, Rights]:
+        self._sync_generation()
+
+        with self._lock:
+            item = self._items.get(role_id)
+            if item is not None and clock.monotonic() - item[0] <= self.ttl_seconds:
+                self._items.move_to_end(role_id)
+                self.hits += 1
+                return item[1]
+            self.misses += 1
+            version = self._version
+
+        rights = self.loader(db, role_id)
+
+        with self._lock:
+            # Invalidated while loading (e.g. a revoke committed meanwhile) →
+            # the rights may be stale: serve them once, don't keep them
+            if version == self._version:
+                self._items[role_id] = (clock.monotonic(), rights)
+                self._items.move_to_end(role_id)
+                while len(self._items) > self.max_size:
+                    self._items.popitem(last=False)
+                    self.evictions += 1
+        return rights
+
+    def get(self, db: Session, role_id: int, menu_id: int) -> Rights:
+        return self.role_rights(db, role_id).get(menu_id, NO_RIGHTS)
+
+    def allows(self, db: Session, role_id: int, menu_id: int, action: str) -> bool:
+        return self.get(db, role_id, menu_id).allows(action)
+
+    # -------- invalidation --------
+    def invalidate(self, role_id: Optional[int] = None, broadcast: bool = True):
+        """Drop one role (or everything) here and, with a backend, in every worker."""
+        with self._lock:
+            if role_id is None:
+                self._items.clear()
+            else:
+                self._items.pop(role_id, None)
+            self._version += 1
+            self.invalidations += 1
+
+        if broadcast and self.backend is not None:
+            try:
+                self._generation = self.backend.bump()
+            except Exception:
+                self.backend_errors += 1
+
+    def _sync_generation(self):
+        if self.backend is None or clock.monotonic() - self._generation_checked_at < self.check_interval:
+            return
+        self._generation_checked_at = clock.monotonic()
+        try:
+            generation = self.backend.get()
+        except Exception:
+            # Backend down → TTL alone bounds staleness
+            self.backend_errors += 1
+            return
+        if generation != self._generation:
+            self._generation = generation
+            with self._lock:
+                self._items.clear()
+                self._version += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "pid": os.getpid(),
+            "roles_cached": len(self._items),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "shared_backend": type(self.backend).__name__ if self.backend else None,
+            "generation": self._generation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "backend_errors": self.backend_errors,
+        }
+
+
+role_rights_cache = RoleRightsCache(
+    backend=RedisGenerationBackend(RBAC_CACHE_REDIS_URL) if RBAC_CACHE_REDIS_URL else None
+)
+
+
+# Invalidate on flush, and again after commit so a reload that raced the
+# open transaction cannot keep the old rights
+def _queue_invalidation(mapper, connection, target):
+    # role_id itself may have been changed → the previous role too
+    role_ids = {target.role_id, *inspect(target).attrs.role_id.history.deleted}
+    for role_id in role_ids:
+        role_rights_cache.invalidate(role_id, broadcast=False)
+
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("role_rights_invalidations", set()).update(role_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session):
+    for role_id in session.info.pop("role_rights_invalidations", ()):
+        role_rights_cache.invalidate(role_id)
+
+
+event.listen(RoleRight, "after_insert", _queue_invalidation)
+event.listen(RoleRight, "after_update", _queue_invalidation)
+event.listen(RoleRight, "after_delete", _queue_invalidation)
@@ -1,12 +1,17 @@
 # app/utils/candidate_email.py
 
+from sqlalchemy.orm import Session
+
 from app.utils.email_templates_utils import render_email
-from app.utils.email_ses import send_email_ses  # ✅ SES instead of SMTP
+from app.services.email_outbox_service import candidate_status_keys, enqueue_email, normalize_status  # ✅ outbox instead of sending inline
 from app.config import settings
 
-def send_candidate_email(candidate, status, job_posting):
+def send_candidate_email(db: Session, candidate, status, job_posting, previous_status=None):
     """
-    Send acceptance / rejection email to candidate using Amazon SES.
+    Queue acceptance / rejection email to candidate (sent by the outbox worker
+    through Amazon SES). Part of the caller's transaction: commit to send.
+    At most one email per status transition: pass previous_status when
+    candidate.status was already changed (default: candidate.status).
     """
 
     context = {
@@ -18,7 +23,7 @@ def send_candidate_email(candidate, status, job_posting):
         "organization_logo": settings.ORGANIZATION_LOGO_URL
     }
 
-    if status.lower() == "accepted":
+    if normalize_status(status) == "accepted":
         template = "candidate_accepted.html"
         subject = f"Congratulations — {job_posting.job_description.title}"
     else:
@@ -27,5 +32,16 @@ def send_candidate_email(candidate, status, job_posting):
 
     html_body = render_email(template, context)
 
-    # ✅ Use SES to send email
-    send_email_ses(subject, html_body, candidate.email)
+    if previous_status is None:
+        previous_status = candidate.status
+    keys = candidate_status_keys(db, [(candidate.id, previous_status, status, template)])
+
+    # ✅ Stored in email_outbox; delivery retried with backoff
+    return enqueue_email(
+        db,
+        candidate.email,
+        subject,
+        html_body,
+        dedupe_key=keys[candidate.id],
+        candidate_id=candidate.id,
+    )
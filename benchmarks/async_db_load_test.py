@@ -0,0 +1,96 @@
+# benchmarks/async_db_load_test.py
+
+"""
+Concurrent load test for the routes moved to AsyncSession (subscriptions,
+candidate apply / update).
+
+Fires N requests at a fixed concurrency against a running server and prints
+p50 / p95 / p99 latency per path. Run it against the old revision and the new
+one with the same arguments to compare:
+
+    uvicorn main:app --workers 1 &
+    python -m benchmarks.async_db_load_test --base-url http://127.0.0.1:8000 \\
+        --path /subscription-plans/public --path /subscription-plans/compare \\
+        --concurrency 100 --requests 2000 --header "Authorization: Bearer <token>"
+
+A single worker makes event-loop blocking visible: with sync DB calls inside
+`async def` routes, p99 grows with concurrency while p50 stays flat.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time as clock
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_load(base_url: str, paths: List[str], concurrency: int, total: int, headers: Dict[str, str]):
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    counter = iter(range(total))
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+
+        async def worker():
+            for i in counter:
+                path = paths[i % len(paths)]
+                began = clock.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code >= 400:
+                        errors[path] += 1
+                except httpx.HTTPError:
+                    errors[path] += 1
+                latencies[path].append((clock.perf_counter() - began) * 1000)
+
+        began = clock.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = clock.perf_counter() - began
+
+    return latencies, errors, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="p50/p95/p99 latency under concurrency")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--path", action="append", dest="paths",
+                        help="GET path to hit (repeatable, round-robin)")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--header", action="append", default=[], metavar="'Name: value'")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or ["/subscription-plans/public"]
+    headers = dict(h.split(":", 1) for h in args.header)
+    headers = {k.strip(): v.strip() for k, v in headers.items()}
+
+    latencies, errors, elapsed = asyncio.run(
+        run_load(args.base_url, paths, args.concurrency, args.requests, headers)
+    )
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, "
+          f"{elapsed:.2f}s ({args.requests / elapsed:.1f} req/s)")
+    print(f"{'path':<40} {'n':>6} {'err':>5} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for path in paths:
+        values = latencies[path]
+        if not values:
+            continue
+        print(f"{path:<40} {len(values):>6} {errors[path]:>5} "
+              f"{statistics.mean(values):>7.1f}ms {percentile(values, 50):>7.1f}ms "
+              f"{percentile(values, 95):>7.1f}ms {percentile(values, 99):>7.1f}ms {max(values):>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+# benchmarks/attendance_query_plans.py
+
+"""
+Query plans + timings of the attendance hot queries, before and after the
+composite indexes from alembic revision a41c9e7d2b10.
+
+Seeds a throwaway database (never point this at a real one):
+
+    python -m benchmarks.attendance_query_plans --url sqlite:////tmp/attendance_bench.db
+    python -m benchmarks.attendance_query_plans --url mysql+pymysql://u:p@localhost/bench --users 5000
+"""
+
+import argparse
+import random
+import time as clock
+from datetime import date, time, timedelta
+
+from sqlalchemy import Index, create_engine, text
+
+from app.database import Base
+from app.models.attendance_punch_m import AttendancePunch
+from app.models.holiday_m import Holiday
+from app.models.leavemaster_m import LeaveMaster
+from app.models.permission_m import Permission
+from app.utils.attendance_utils import month_bounds
+
+
+YEAR, MONTH = 2025, 12
+SEED_MONTHS = 6  # history before YEAR/MONTH, so date-range predicates matter
+
+# Same names / columns as the migration
+COMPOSITE_INDEXES = [
+    (AttendancePunch, "idx_attendance_punch_bio_date", ["bio_id", "punch_date", "punch_time"]),
+    (LeaveMaster, "idx_leave_master_user_status_dates", ["user_id", "status", "start_date", "end_date"]),
+    (Permission, "idx_permission_user_date_status", ["user_id", "date", "status"]),
+    (Holiday, "idx_holiday_date", ["date"]),
+]
+
+
+def composite_indexes():
+    """Index objects, reusing the ones already declared on the models."""
+    indexes = []
+    for model, name, columns in COMPOSITE_INDEXES:
+        table = model.__table__
+        declared = next((ix for ix in table.indexes if ix.name == name), None)
+        indexes.append(declared or Index(name, *[table.c[c] for c in columns]))
+    return indexes
+
+
+start, end, _ = month_bounds(YEAR, MONTH)
+
+# Same predicates as load_month_contexts / refresh_attendance_days
+HOT_QUERIES = {
+    "punches (bio_id + month range)": (
+        f"SELECT bio_id, punch_date, punch_time FROM {AttendancePunch.__tablename__} "
+        "WHERE bio_id IN ('BIO17', 'BIO42', 'BIO99') AND punch_date >= :start AND punch_date <= :end"
+    ),
+    "leaves (user + status + overlap)": (
+        f"SELECT id FROM {LeaveMaster.__tablename__} "
+        "WHERE user_id IN (17, 42, 99) AND status = 'approved' AND start_date <= :end AND end_date >= :start"
+    ),
+    "permissions (user + date + status)": (
+        f"SELECT id FROM {Permission.__tablename__} "
+        "WHERE user_id IN (17, 42, 99) AND date >= :start AND date <= :end AND status = 'approved'"
+    ),
+    "holidays (month range)": (
+        f"SELECT date FROM {Holiday.__tablename__} WHERE date >= :start AND date <= :end"
+    ),
+}
+
+
+def seed(conn, n_users: int):
+    rng = random.Random(7)
+    first_day = start - timedelta(days=30 * SEED_MONTHS)
+    days = [first_day + timedelta(days=i) for i in range((end - first_day).days + 1)]
+
+    punches, leaves, permissions = [], [], []
+    for uid in range(1, n_users + 1):
+        for day in days:
+            if day.weekday() == 6:
+                continue
+            punches.append({"bio_id": f"BIO{uid}", "punch_date": day, "punch_time": time(9, rng.randrange(30)), "punch_type": "IN"})
+            punches.append({"bio_id": f"BIO{uid}", "punch_date": day, "punch_time": time(17, rng.randrange(60)), "punch_type": "OUT"})
+            if rng.random() < 0.03:
+                leaves.append({"user_id": uid, "leave_type_id": 1, "status": rng.choice(["approved", "pending"]),
+                               "leave_days": 1, "start_date": day, "end_date": day})
+            if rng.random() < 0.03:
+                permissions.append({"user_id": uid, "shift_id": 1, "date": day, "status": rng.choice(["approved", "pending"]),
+                                    "from_time": time(10, 0), "to_time": time(11, 0), "reason": "bench"})
+
+    conn.execute(AttendancePunch.__table__.insert(), punches)
+    conn.execute(LeaveMaster.__table__.insert(), leaves)
+    conn.execute(Permission.__table__.insert(), permissions)
+    conn.execute(Holiday.__table__.insert(), [{"date": d, "name": "bench"} for d in days if d.day == 1])
+
+    return len(punches)
+
+
+def explain(conn, sql: str):
+    dialect = conn.dialect.name
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    rows = conn.execute(text(prefix + sql), {"start": start, "end": end}).fetchall()
+    return [" | ".join(str(v) for v in row) for row in rows]
+
+
+def timed(conn, sql: str, repeat: int) -> float:
+    began = clock.perf_counter()
+    for _ in range(repeat):
+        conn.execute(text(sql), {"start": start, "end": end}).fetchall()
+    return (clock.perf_counter() - began) / repeat * 1000
+
+
+def report(conn, label: str, repeat: int):
+    print(f"\n==================== {label} ====================")
+    results = {}
+    for name, sql in HOT_QUERIES.items():
+        ms = timed(conn, sql, repeat)
+        results[name] = ms
+        print(f"\n-- {name}: {ms:.2f} ms")
+        for line in explain(conn, sql):
+            print("   " + line)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Attendance hot-query plans before / after composite indexes")
+    parser.add_argument("--url", default="sqlite:////tmp/attendance_bench.db", help="Throwaway database URL")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.url)
+    tables = [AttendancePunch.__table__, LeaveMaster.__table__, Permission.__table__, Holiday.__table__]
+
+    indexes = composite_indexes()
+
+    # Plain single-column schema first (composite indexes dropped)
+    Base.metadata.drop_all(engine, tables=tables)
+    Base.metadata.create_all(engine, tables=tables)
+    with engine.begin() as conn:
+        for index in indexes:
+            index.drop(conn)
+
+    with engine.begin() as conn:
+        n_punches = seed(conn, args.users)
+    print(f"Seeded {args.users} users / {n_punches} punches on {engine.dialect.name}")
+
+    with engine.connect() as conn:
+        before = report(conn, "BEFORE (single-column indexes)", args.repeat)
+
+    with engine.begin() as conn:
+        for index in indexes:
+            index.create(conn)
+        if engine.dialect.name in ("sqlite", "postgresql"):
+            conn.execute(text("ANALYZE"))
+
+    with engine.connect() as conn:
+        after = report(conn, "AFTER (composite indexes)", args.repeat)
+
+    print("\n==================== SUMMARY ====================")
+    for name in HOT_QUERIES:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(f"{name:40s} {before[name]:9.2f} ms → {after[name]:9.2f} ms  (x{speedup:.1f})")
+
+
+if __name__ == "__main__":
+    main()
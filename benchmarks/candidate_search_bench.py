@@ -0,0 +1,120 @@
+# benchmarks/candidate_search_bench.py
+
+"""
+Candidate search over synthetic candidates, 1M by default:
+
+- index build            add_many over every document
+- naive scan             per-row Python filter + substring match (what a
+                         LIKE '%skill%' query does), on a sample
+- keyword / facet /
+  combined queries       CandidateSearchIndex.search, p50 / p95 latency
+
+    python -m benchmarks.candidate_search_bench
+    python -m benchmarks.candidate_search_bench --candidates 200000 --queries 200
+"""
+
+import argparse
+import random
+import time as clock
+
+import numpy as np
+
+from app.utils.candidate_search import CandidateDoc, CandidateSearchIndex
+
+SKILLS = (
+    "python django flask fastapi sql mysql postgresql java spring kotlin c++ c# .net node.js react angular "
+    "vue typescript javascript html css aws azure gcp docker kubernetes terraform linux excel tally sap "
+    "salesforce tableau powerbi pandas numpy spark hadoop kafka redis mongodb go rust scala swift android"
+).split()
+CITIES = ("Hyderabad", "Bengaluru", "Chennai", "Pune", "Mumbai", "Delhi", "Vijayawada", "Warangal", "Kochi", "Noida")
+QUALIFICATIONS = ("B.Tech", "M.Tech", "B.Sc", "M.Sc", "BCA", "MCA", "MBA", "B.Com", "Diploma")
+LEVELS = ("Basic", "Intermediate", "Fluent", None)
+
+
+def synthetic_docs(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    # Zipf-ish skill popularity, as in real resumes
+    weights = [1 / (rank + 1) for rank in range(len(SKILLS))]
+    for candidate_id in range(1, count + 1):
+        experienced = rng.random() < 0.6
+        yield CandidateDoc(
+            id=candidate_id,
+            organization_id=rng.randint(1, 5),
+            job_posting_id=rng.randint(1, 200),
+            skills=", ".join(set(rng.choices(SKILLS, weights, k=rng.randint(2, 8)))),
+            total_experience=f"{rng.uniform(0.5, 15):.1f} years" if experienced else None,
+            candidate_type="experienced" if experienced else "fresher",
+            city=rng.choice(CITIES),
+            highest_qualification=rng.choice(QUALIFICATIONS),
+            telugu_level=rng.choice(LEVELS),
+            english_level=rng.choice(LEVELS),
+            hindi_level=rng.choice(LEVELS),
+        )
+
+
+def naive_search(docs, q, city=None):
+    terms = q.lower().split()
+    hits = []
+    for doc in docs:
+        if city and (doc.city or "").lower() != city.lower():
+            continue
+        skills = (doc.skills or "").lower()
+        score = sum(term in skills for term in terms)
+        if score:
+            hits.append((score, doc.id))
+    hits.sort(reverse=True)
+    return len(hits), [candidate_id for _, candidate_id in hits[:20]]
+
+
+def latency(label: str, index: CandidateSearchIndex, queries, **fixed):
+    samples = []
+    total = 0
+    for query in queries:
+        began = clock.perf_counter()
+        result = index.search(**{**query, **fixed})
+        samples.append(clock.perf_counter() - began)
+        total += result.total
+    p50, p95 = np.percentile(samples, [50, 95]) * 1000
+    print(f"{label:<24} p50 {p50:>7.2f}ms  p95 {p95:>7.2f}ms  avg hits {total // len(queries)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Candidate search latency")
+    parser.add_argument("--candidates", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--naive-sample", type=int, default=100_000, help="rows the naive scan is timed on")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(11)
+    print(f"{args.candidates} candidates")
+
+    docs = list(synthetic_docs(args.candidates))
+    index = CandidateSearchIndex(capacity=args.candidates)
+    began = clock.perf_counter()
+    index.add_many(docs)
+    print(f"{'index build':<24} {clock.perf_counter() - began:>8.2f}s  {index.stats()['tokens']} tokens")
+
+    keyword = [{"q": " ".join(rng.sample(SKILLS, rng.randint(1, 3)))} for _ in range(args.queries)]
+    facet = [
+        {"filters": {"city": rng.choice(CITIES), "candidate_type": rng.choice(("fresher", "experienced"))}}
+        for _ in range(args.queries)
+    ]
+    combined = [
+        {**k, **f, "min_experience": 2} for k, f in zip(keyword, facet)
+    ]
+
+    sample = docs[: args.naive_sample]
+    began = clock.perf_counter()
+    for query in keyword[:10]:
+        naive_search(sample, query["q"])
+    per_query = (clock.perf_counter() - began) / 10 * args.candidates / len(sample)
+    print(f"{'naive scan (projected)':<24} {per_query * 1000:>9.1f}ms/query")
+
+    latency("keyword", index, keyword)
+    latency("facets", index, facet)
+    latency("keyword + facets + exp", index, combined)
+    latency("keyword, page 5", index, keyword, offset=80)
+
+
+if __name__ == "__main__":
+    main()
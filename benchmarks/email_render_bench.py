@@ -0,0 +1,95 @@
+# benchmarks/email_render_bench.py
+
+"""
+Cost of rendering candidate emails, 10k messages by default:
+
+- compile per message   template parsed + compiled for every email (no cache)
+- registry.render       compiled once, looked up per message (render_email)
+- registry.render_many  one lookup, N renders (render_emails)
+- render once + fill    rendered once, name substituted (bulk status path)
+
+Uses a representative template in a temporary directory unless
+--templates-dir / --template point at the real ones:
+
+    python -m benchmarks.email_render_bench
+    python -m benchmarks.email_render_bench --messages 50000 --templates-dir app/templates --template accepted_email.html
+"""
+
+import argparse
+import html
+import os
+import tempfile
+import time as clock
+
+from app.utils.email_templates_utils import TemplateRegistry
+
+SAMPLE_TEMPLATE = """<!DOCTYPE html>
+<html>
+  <body style="font-family: Arial, sans-serif">
+    <table width="600" align="center">
+      <tr><td><h2>Dear {{ candidate_name }},</h2></td></tr>
+      <tr><td>
+        <p>We are pleased to inform you that you have been selected.</p>
+        {% if interview_datetime %}<p>Interview: {{ interview_datetime }}</p>{% endif %}
+        <p>Our HR team will contact you shortly with the next steps.</p>
+      </td></tr>
+      <tr><td><p>Regards,<br>{{ organization_name | default("HR Team") }}</p></td></tr>
+    </table>
+  </body>
+</html>
+"""
+
+NAME_SLOT = "__candidate_name_slot__"
+
+
+def timed(label: str, messages: int, fn):
+    began = clock.perf_counter()
+    output = fn()
+    elapsed = clock.perf_counter() - began
+    print(f"{label:<24} {elapsed * 1000:>9.1f}ms  {elapsed / messages * 1e6:>8.2f}µs/msg")
+    return output
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Email rendering throughput")
+    parser.add_argument("--messages", type=int, default=10_000)
+    parser.add_argument("--templates-dir", help="directory of the real templates")
+    parser.add_argument("--template", default="accepted_email.html")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        directory = args.templates_dir or scratch
+        if not args.templates_dir:
+            with open(os.path.join(scratch, args.template), "w") as f:
+                f.write(SAMPLE_TEMPLATE)
+
+        contexts = [
+            {"candidate_name": f"Candidate {i} <{i}@example.com>", "organization_name": "Acme"}
+            for i in range(args.messages)
+        ]
+        print(f"{args.messages} messages, template {args.template}")
+
+        registry = TemplateRegistry(directory)
+        # compile-per-message is ~1000× slower; a sample keeps the run short
+        sample = min(len(contexts), 500)
+        timed("compile per message", sample, lambda: [
+            TemplateRegistry(directory).render(args.template, context) for context in contexts[:sample]
+        ])
+        per_message = timed("registry.render", args.messages, lambda: [
+            registry.render(args.template, context) for context in contexts
+        ])
+        batched = timed("registry.render_many", args.messages, lambda: registry.render_many(args.template, contexts))
+
+        def fill():
+            rendered = registry.render(args.template, {"candidate_name": NAME_SLOT, "organization_name": "Acme"})
+            return [rendered.replace(NAME_SLOT, html.escape(context["candidate_name"])) for context in contexts]
+
+        filled = timed("render once + fill", args.messages, fill)
+
+        assert per_message == batched
+        assert per_message[0] == filled[0], "substitution must match a full render"
+        print(f"compiles: {registry.compiles}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# benchmarks/rbac_cache_bench.py
+
+"""
+Per-request cost of the permission check: one role_rights query per request
+(current behaviour) vs the in-process RoleRightsCache.
+
+Seeds a throwaway database (never point this at a real one):
+
+    python -m benchmarks.rbac_cache_bench --url sqlite:////tmp/rbac_bench.db
+    python -m benchmarks.rbac_cache_bench --url mysql+pymysql://u:p@localhost/bench --requests 20000
+"""
+
+import argparse
+import random
+import statistics
+import time as clock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.role_right_m import RoleRight
+from app.utils.rbac_cache import RoleRightsCache
+
+
+def seed(db, roles: int, menus: int):
+    RoleRight.__table__.drop(db.get_bind(), checkfirst=True)
+    RoleRight.__table__.create(db.get_bind())
+    db.bulk_insert_mappings(RoleRight, [
+        {
+            "role_id": role_id,
+            "menu_id": menu_id,
+            "can_view": True,
+            "can_create": menu_id % 2 == 0,
+            "can_edit": menu_id % 3 == 0,
+            "can_delete": False,
+        }
+        for role_id in range(1, roles + 1)
+        for menu_id in range(1, menus + 1)
+    ])
+    db.commit()
+
+
+def uncached_check(db, role_id, menu_id, action):
+    right = db.query(RoleRight).filter(
+        RoleRight.role_id == role_id,
+        RoleRight.menu_id == menu_id
+    ).first()
+    return bool(right and getattr(right, f"can_{action}"))
+
+
+def timed(check, db, requests):
+    samples = []
+    for role_id, menu_id, action in requests:
+        began = clock.perf_counter()
+        check(db, role_id, menu_id, action)
+        samples.append((clock.perf_counter() - began) * 1_000_000)
+    samples.sort()
+    return {
+        "mean_us": round(statistics.mean(samples), 2),
+        "p50_us": round(samples[len(samples) // 2], 2),
+        "p99_us": round(samples[int(len(samples) * 0.99) - 1], 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RBAC permission check overhead")
+    parser.add_argument("--url", default="sqlite:////tmp/rbac_bench.db")
+    parser.add_argument("--roles", type=int, default=10)
+    parser.add_argument("--menus", type=int, default=80)
+    parser.add_argument("--requests", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.url)
+    db = sessionmaker(bind=engine)()
+    seed(db, args.roles, args.menus)
+
+    rng = random.Random(7)
+    requests = [
+        (rng.randint(1, args.roles), rng.randint(1, args.menus), rng.choice(("view", "create", "edit", "delete")))
+        for _ in range(args.requests)
+    ]
+
+    cache = RoleRightsCache()
+    results = {
+        "uncached": timed(uncached_check, db, requests),
+        "cached": timed(cache.allows, db, requests),
+    }
+
+    for name, result in results.items():
+        print(f"{name:<9} mean={result['mean_us']}µs p50={result['p50_us']}µs p99={result['p99_us']}µs")
+    print(f"hit rate: {cache.stats()['hit_rate']:.2%}  "
+          f"speedup (mean): {results['uncached']['mean_us'] / results['cached']['mean_us']:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
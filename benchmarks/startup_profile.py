@@ -0,0 +1,126 @@
+# benchmarks/startup_profile.py
+
+"""
+Import-time profile of the application (what a worker pays before serving).
+
+Runs `python -X importtime -c "import <target>"` in a fresh interpreter,
+then reports the slowest modules by cumulative and self time and the cost
+per area (app.routes, app.models, each third-party package):
+
+    python -m benchmarks.startup_profile                   # app.main, top 25
+    python -m benchmarks.startup_profile --target app.s3_helper --top 10
+    python -m benchmarks.startup_profile --repeat 5        # median wall time
+    python -m benchmarks.startup_profile --json > profile.json
+
+Compare two revisions by running it on each with the same arguments.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time as clock
+from collections import defaultdict
+from typing import Dict, List, NamedTuple
+
+LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+class ImportRecord(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """`-X importtime` stderr → one record per imported module."""
+    records = []
+    for line in stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append(ImportRecord(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def area_of(module: str) -> str:
+    """app.routes.leave_routes → app.routes; botocore.client → botocore."""
+    parts = module.split(".")
+    return ".".join(parts[:2]) if parts[0] == "app" and len(parts) > 1 else parts[0]
+
+
+def by_area(records: List[ImportRecord]) -> Dict[str, int]:
+    """Self time summed per area; every module counted once."""
+    totals: Dict[str, int] = defaultdict(int)
+    for record in records:
+        totals[area_of(record.module)] += record.self_us
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def profile_import(target: str, python: str = sys.executable):
+    """One cold import in a child interpreter → (records, wall seconds)."""
+    began = clock.perf_counter()
+    completed = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+    )
+    wall = clock.perf_counter() - began
+
+    if completed.returncode != 0:
+        tail = completed.stderr.strip().splitlines()[-1:] or ["no output"]
+        raise SystemExit(f"import {target} failed: {tail[0]}")
+    return parse_importtime(completed.stderr), wall
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-module import cost of the app")
+    parser.add_argument("--target", default="app.main", help="module to import (default app.main)")
+    parser.add_argument("--top", type=int, default=25, help="rows per table")
+    parser.add_argument("--repeat", type=int, default=1, help="cold imports to run; the median is reported")
+    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    args = parser.parse_args(argv)
+
+    runs = [profile_import(args.target) for _ in range(max(1, args.repeat))]
+    walls = [wall for _, wall in runs]
+    records = runs[walls.index(sorted(walls)[len(walls) // 2])][0]
+
+    total_us = sum(record.self_us for record in records)
+    slowest = sorted(records, key=lambda record: record.cumulative_us, reverse=True)[:args.top]
+    heaviest = sorted(records, key=lambda record: record.self_us, reverse=True)[:args.top]
+    areas = list(by_area(records).items())[:args.top]
+
+    if args.json:
+        print(json.dumps({
+            "target": args.target,
+            "wall_seconds": round(statistics.median(walls), 4),
+            "import_ms": round(total_us / 1000, 1),
+            "modules": len(records),
+            "by_area_ms": {area: round(us / 1000, 1) for area, us in areas},
+            "slowest_cumulative": [record._asdict() for record in slowest],
+        }, indent=2))
+        return
+
+    print(f"import {args.target}: {len(records)} modules, {total_us / 1000:.1f}ms import time, "
+          f"{statistics.median(walls) * 1000:.0f}ms wall (median of {len(walls)})")
+
+    print(f"\n{'area':<40} {'self':>10} {'share':>7}")
+    for area, us in areas:
+        print(f"{area:<40} {us / 1000:>8.1f}ms {us / total_us:>7.1%}")
+
+    print(f"\n{'module (cumulative)':<60} {'cumulative':>12} {'self':>10}")
+    for record in slowest:
+        print(f"{record.module:<60} {record.cumulative_us / 1000:>10.1f}ms {record.self_us / 1000:>8.1f}ms")
+
+    print(f"\n{'module (self)':<60} {'self':>10}")
+    for record in heaviest:
+        print(f"{record.module:<60} {record.self_us / 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -53,3 +53,82 @@ def test_delete_summary(client):
 
     res = client.delete("/attendance-summary/delete/1")
     assert res.status_code == 200
+
+
+def test_generate_bulk_summaries(client):
+    create_sample_punch(client)
+
+    res = client.post("/attendance-summary/generate-bulk/2025/12?organization_id=1")
+    assert res.status_code == 200
+    assert res.json()["processed"] == res.json()["created"] + res.json()["updated"]
+
+    # Summary generated in bulk is readable through the per-user endpoint
+    res = client.get("/attendance-summary/1/2025/12")
+    assert res.status_code == 200
+
+
+def test_generate_bulk_requires_scope(client):
+    res = client.post("/attendance-summary/generate-bulk/2025/12")
+    assert res.status_code == 400
+
+
+COUNTER_FIELDS = [
+    "present_days", "half_days", "absent_days", "holidays", "sundays", "leaves",
+    "permissions", "total_work_minutes", "overtime_minutes", "late_minutes",
+    "early_exit_minutes",
+]
+
+
+def test_summary_updated_incrementally_on_permission(client):
+    create_sample_punch(client)
+    before = client.post("/attendance-summary/generate/1/2025/12").json()
+
+    client.post("/permissions/", json={
+        "user_id": 1,
+        "shift_id": 1,
+        "date": "2025-12-17",
+        "from_time": "16:00:00",
+        "to_time": "17:00:00",
+        "reason": "Incremental check",
+        "status": "approved"
+    })
+
+    incremental = client.get("/attendance-summary/1/2025/12").json()
+    assert incremental["permissions"] == before["permissions"] + 1
+
+    # Delta-maintained counters must equal a full recompute
+    regenerated = client.post("/attendance-summary/generate/1/2025/12").json()
+    for field in COUNTER_FIELDS:
+        assert incremental[field] == regenerated[field], field
+
+
+def test_daily_view_matches_summary(client):
+    create_sample_punch(client)
+    summary = client.post("/attendance-summary/generate/1/2025/12").json()
+
+    days = client.get("/attendance-summary/daily/1/2025/12").json()["days"]
+    statuses = [d["status"] for d in days]
+
+    # Both endpoints run the same per-day evaluator
+    assert statuses.count("Present") == summary["present_days"]
+    assert statuses.count("Half") + statuses.count("Half-Day Leave") == summary["half_days"]
+    assert statuses.count("Full-Day Leave") == summary["leaves"]
+    assert sum(d["worked_minutes"] for d in days) == summary["total_work_minutes"]
+    assert sum(d["late_minutes"] for d in days) == summary["late_minutes"]
+
+
+def test_generate_bulk_twice_keeps_one_summary_per_month(client):
+    create_sample_punch(client)
+
+    first = client.post("/attendance-summary/generate-bulk/2025/12?organization_id=1").json()
+    second = client.post("/attendance-summary/generate-bulk/2025/12?organization_id=1").json()
+
+    # Second run upserts onto uq_attendance_user_month instead of inserting
+    assert second["created"] == 0
+    assert second["updated"] == first["processed"]
+
+    summaries = [
+        s for s in client.get("/attendance-summary/").json()
+        if s["user_id"] == 1 and s["month"] == "2025-12-01"
+    ]
+    assert len(summaries) == 1
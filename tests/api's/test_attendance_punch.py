@@ -19,3 +19,66 @@ def create_sample_punch(client: TestClient):
 def test_create_punch(client: TestClient):
     create_sample_punch(client)
     # If API returns data, assert here
+
+
+def test_bulk_ingest_punches_csv(client: TestClient):
+    from io import BytesIO
+
+    dump = (
+        "bio_id,punch_date,punch_time,punch_type\n"
+        "BIO77,2025-12-18,09:00:00,IN\n"
+        "BIO77,2025-12-18,09:00:00,IN\n"      # duplicate inside the dump
+        "BIO77,2025-12-18,17:30:00,OUT\n"
+        ",2025-12-18,09:00:00,IN\n"           # missing bio_id
+        "BIO78,2025-02-30,09:00:00,IN\n"      # invalid date
+    ).encode()
+
+    response = client.post(
+        "/attendance-punch/bulk",
+        files={"file": ("device_dump.csv", BytesIO(dump), "text/csv")}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["rows_read"] == 5
+    assert data["inserted"] == 2
+    assert data["duplicates"] == 1
+    assert data["rejected"] == 2
+    assert [r["line"] for r in data["rejected_rows"]] == [5, 6]
+
+    # Re-uploading the same dump is idempotent
+    response = client.post(
+        "/attendance-punch/bulk",
+        files={"file": ("device_dump.csv", BytesIO(dump), "text/csv")}
+    )
+    assert response.json()["inserted"] == 0
+    assert response.json()["already_exists"] == 2
+
+
+def test_bulk_ingest_punches_invalid_utf8_line_rejected(client: TestClient):
+    from io import BytesIO
+
+    dump = (
+        b"bio_id,punch_date,punch_time,punch_type\n"
+        b"BIO79,2025-12-18,09:00:00,IN\n"
+        b"BIO\xff79,2025-12-18,12:00:00,IN\n"    # not UTF-8 (e.g. a Latin-1 export)
+        b"BIO79,2025-12-18,17:30:00,OUT\n"
+    )
+
+    response = client.post(
+        "/attendance-punch/bulk",
+        files={"file": ("device_dump.csv", BytesIO(dump), "text/csv")}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["rows_read"], data["inserted"], data["rejected"]) == (3, 2, 1)
+    assert data["rejected_rows"][0]["line"] == 3
+
+
+def test_bulk_ingest_punches_unsupported_format(client: TestClient):
+    from io import BytesIO
+
+    response = client.post(
+        "/attendance-punch/bulk?format=xml",
+        files={"file": ("dump.xml", BytesIO(b"<punches/>"), "text/xml")}
+    )
+    assert response.status_code == 400
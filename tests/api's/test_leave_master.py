@@ -36,3 +36,39 @@ def test_cancel_leave(client, applied_leave):
 
     # ✅ Endpoint not implemented yet
     assert res.status_code == 404
+
+
+def test_list_leaves_keyset_pages(client, applied_leave, leave_types):
+    client.post("/leaves/", json={
+        "user_id": 1,
+        "leave_type_id": leave_types[0]["id"],
+        "start_date": "2025-12-10",
+        "end_date": "2025-12-10",
+        "leave_days": 1,
+        "is_half_day": False
+    })
+
+    first = client.get("/leaves/?limit=1")
+    assert first.status_code == 200
+    assert len(first.json()) == 1
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get(f"/leaves/?limit=1&cursor={cursor}")
+    assert second.status_code == 200
+    assert second.json()[0]["id"] < first.json()[0]["id"]   # newest first, no overlap
+
+
+def test_list_leaves_ndjson_stream(client, applied_leave):
+    import json
+
+    res = client.get("/leaves/?format=ndjson")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+
+    rows = [json.loads(line) for line in res.text.splitlines()]
+    assert applied_leave["id"] in {row["id"] for row in rows}
+
+
+def test_list_leaves_invalid_cursor(client):
+    res = client.get("/leaves/?limit=1&cursor=not-a-cursor")
+    assert res.status_code == 400
@@ -0,0 +1,43 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.database import PoolMetrics, instrument_pool, pool_options
+
+
+def test_db_pool_metrics(client: TestClient):
+    res = client.get("/metrics/db-pool")
+    assert res.status_code == 200
+
+    sync = res.json()["sync"]
+    # the test session holds a checked-out connection
+    assert sync["checkouts"] >= 1
+    assert sync["in_use"] >= 1
+    for key in ("wait_ms_avg", "overflow_checkouts", "timeouts", "peak_in_use"):
+        assert key in sync
+
+
+def test_pool_wait_and_overflow_are_recorded(tmp_path):
+    metrics = PoolMetrics("test")
+    options = pool_options("mysql+pymysql://", metrics, QueuePool)
+    options.update(pool_size=1, max_overflow=1, pool_timeout=1)
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", **options)
+    instrument_pool(engine, metrics)
+
+    first, second = engine.connect(), engine.connect()
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+
+    snapshot = metrics.snapshot(engine.pool)
+    assert snapshot["checkouts"] == 2
+    assert snapshot["overflow_checkouts"] == 1
+    assert snapshot["in_use"] == 2
+    assert snapshot["timeouts"] == 1
+    assert snapshot["wait_ms_max"] >= 900
+
+    first.close()
+    second.close()
+    engine.dispose()
@@ -0,0 +1,87 @@
+from fastapi.testclient import TestClient
+
+
+def create_sample_punch(client: TestClient):
+    client.post("/attendance-punch/", json={
+        "bio_id": "BIO12",
+        "punch_date": "2025-12-17",
+        "punch_time": "09:00:00",
+        "punch_type": "IN"
+    })
+    client.post("/attendance-punch/", json={
+        "bio_id": "BIO12",
+        "punch_date": "2025-12-17",
+        "punch_time": "17:00:00",
+        "punch_type": "OUT"
+    })
+
+
+def test_month_close_runs_all_shards(client: TestClient):
+    create_sample_punch(client)
+
+    res = client.post("/month-close/2025/12?organization_id=1&workers=1&shard_size=50")
+    assert res.status_code == 202
+    job = res.json()
+    assert job["total_shards"] == -(-job["total_users"] // 50)
+
+    # Background task has run by the time TestClient returns
+    report = client.get(f"/month-close/{job['job_id']}").json()
+    assert report["status"] == "completed"
+    assert report["processed_users"] == report["total_users"]
+    assert all(s["status"] == "done" for s in report["shards"])
+    assert all(s["attendance_seconds"] is not None for s in report["shards"])
+
+
+def test_month_close_resume_completed_job(client: TestClient):
+    job = client.post("/month-close/2025/12?organization_id=1&workers=1").json()
+
+    res = client.post(f"/month-close/{job['job_id']}/resume?workers=1")
+    assert res.status_code == 400
+
+
+def test_month_close_resume_running_job_conflicts(client: TestClient, db_session):
+    from app.models.month_close_m import MonthCloseJob
+
+    job = client.post("/month-close/2025/12?organization_id=1&workers=1").json()
+    db_session.query(MonthCloseJob).filter(MonthCloseJob.id == job["job_id"]).update({"status": "running"})
+    db_session.commit()
+
+    res = client.post(f"/month-close/{job['job_id']}/resume?workers=1")
+    assert res.status_code == 409
+
+    # Left "running" by a dead process → explicit takeover
+    res = client.post(f"/month-close/{job['job_id']}/resume?workers=1&force=true")
+    assert res.status_code == 202
+
+
+def test_month_close_runner_claims_the_job(client: TestClient, db_session):
+    import pytest
+    from sqlalchemy.orm import sessionmaker
+
+    from app.models.month_close_m import MonthCloseJob
+    from app.services.month_close_service import MonthCloseBusy, run_month_close
+
+    job = client.post("/month-close/2025/12?organization_id=1&workers=1").json()
+    db_session.query(MonthCloseJob).filter(MonthCloseJob.id == job["job_id"]).update({"status": "running"})
+    db_session.commit()
+
+    # CLI resume path: same claim as the API
+    session_factory = sessionmaker(bind=db_session.get_bind())
+    with pytest.raises(MonthCloseBusy):
+        run_month_close(job["job_id"], workers=1, session_factory=session_factory)
+
+    # No second job for the same month / scope while one is open
+    res = client.post("/month-close/2025/12?organization_id=1&workers=1")
+    assert res.status_code == 409
+
+    assert run_month_close(job["job_id"], workers=1, session_factory=session_factory, force=True)["status"] == "completed"
+
+
+def test_month_close_requires_scope(client: TestClient):
+    res = client.post("/month-close/2025/12")
+    assert res.status_code == 400
+
+
+def test_month_close_job_not_found(client: TestClient):
+    res = client.get("/month-close/999999")
+    assert res.status_code == 404
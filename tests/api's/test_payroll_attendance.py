@@ -0,0 +1,33 @@
+from fastapi.testclient import TestClient
+
+
+def test_generate_payroll_bulk(client: TestClient):
+    client.post("/attendance-summary/generate-bulk/2025/12?organization_id=1")
+
+    res = client.post("/payroll-attendance/generate-bulk?month=2025-12&organization_id=1")
+    assert res.status_code == 200
+    first = res.json()
+    assert first["processed"] == first["created"] + first["updated"] + first["skipped"]
+
+    # Already generated rows are kept unless overwrite is requested
+    second = client.post("/payroll-attendance/generate-bulk?month=2025-12&organization_id=1").json()
+    assert second["created"] == 0
+    assert second["skipped"] == first["processed"]
+
+    third = client.post("/payroll-attendance/generate-bulk?month=2025-12&organization_id=1&overwrite=true").json()
+    assert third["updated"] == first["processed"]
+
+
+def test_generate_payroll_bulk_invalid_month(client: TestClient):
+    res = client.post("/payroll-attendance/generate-bulk?month=2025-13&organization_id=1")
+    assert res.status_code == 400
+
+
+def test_generate_payroll_bulk_requires_scope(client: TestClient):
+    res = client.post("/payroll-attendance/generate-bulk?month=2025-12")
+    assert res.status_code == 400
+
+
+def test_create_payroll_invalid_month(client: TestClient):
+    res = client.post("/payroll-attendance/?user_id=1&month=december")
+    assert res.status_code in (400, 404)
@@ -1,14 +1,17 @@
 # tests/conftest_base.py
 import pytest
+from contextlib import contextmanager
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from types import SimpleNamespace
 from collections import defaultdict
 from dotenv import load_dotenv
 
 from app.main import app
-from app.database import Base, engine, SessionLocal, get_db
+from app.database import Base, engine, SessionLocal, get_db, get_async_db, get_read_db
 from app.dependencies import get_current_user
 from app.models.test_report_m import TestReport
+from app.utils.job_posting_cache import job_filter_cache
 
 load_dotenv(".env.test")
 
@@ -54,6 +57,85 @@ def db_session():
         session.close()
         transaction.rollback()   # 👈 removes ALL dummy data
         connection.close()
+        job_filter_cache.clear()  # may hold rows that were just rolled back
+
+# ======================================================
+# ASYNC ROUTES ON THE SAME TEST TRANSACTION
+# ======================================================
+class SyncBackedAsyncSession:
+    """
+    AsyncSession API over the per-test sync session, so `async def` routes
+    (get_async_db) see fixture data and are rolled back like everything else.
+    Covers the subset the routes use.
+    """
+
+    def __init__(self, session):
+        self.sync_session = session
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    async def execute(self, statement, *args, **kwargs):
+        return self.sync_session.execute(statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        return self.sync_session.scalar(statement, *args, **kwargs)
+
+    async def scalars(self, statement, *args, **kwargs):
+        return self.sync_session.scalars(statement, *args, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return self.sync_session.get(entity, ident, **kwargs)
+
+    async def delete(self, instance):
+        self.sync_session.delete(instance)
+
+    async def flush(self, objects=None):
+        self.sync_session.flush(objects)
+
+    async def refresh(self, instance, attribute_names=None):
+        self.sync_session.refresh(instance, attribute_names)
+
+    async def commit(self):
+        self.sync_session.commit()
+
+    async def rollback(self):
+        self.sync_session.rollback()
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return fn(self.sync_session, *args, **kwargs)
+
+# ======================================================
+# SQL STATEMENT BUDGET (N+1 guard)
+# ======================================================
+@pytest.fixture
+def sql_budget():
+    """
+    Fail the test when the block issues more SQL statements than budgeted:
+
+        with sql_budget(3) as statements:
+            client.get("/job-postings/")
+    """
+    @contextmanager
+    def budget(max_statements: int):
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+
+        if len(statements) > max_statements:
+            pytest.fail(
+                f"{len(statements)} SQL statements, budget {max_statements}:\n"
+                + "\n".join(f"  {i}. {sql.splitlines()[0][:150]}" for i, sql in enumerate(statements, 1))
+            )
+
+    return budget
 
 # ======================================================
 # FAKE AUTH USER
@@ -78,7 +160,12 @@ def client(db_session):
     def override_get_db():
         yield db_session
 
+    async def override_get_async_db():
+        yield SyncBackedAsyncSession(db_session)
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_read_db] = override_get_db   # replica routing has its own tests
     app.dependency_overrides[get_current_user] = lambda: fake_super_admin_user()
 
     with TestClient(app) as c:
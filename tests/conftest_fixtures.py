@@ -94,3 +94,12 @@ def mock_s3_upload(monkeypatch):
         "app.s3_helper.upload_file_to_s3",
         fake_upload
     )
+
+    async def fake_async_upload(file, folder="candidate_docs", allowed=None):
+        return fake_upload(file, folder)
+
+    # Candidate routes upload through the async service
+    monkeypatch.setattr(
+        "app.services.s3_upload_service.upload_file",
+        fake_async_upload
+    )
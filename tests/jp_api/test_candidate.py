@@ -237,3 +237,109 @@ def test_get_all_candidates_with_data(client, patch_aws_settings):
 
 # The key update is adding `patch_aws_settings` as a fixture argument
 # so AWS attributes are available for tests needing resume upload.
+
+
+# ====================================
+# BULK STATUS: one UPDATE, templates rendered once (+ one check), batched outbox
+# ====================================
+def test_bulk_status_update(client, db_session, organization, branch, job_description, monkeypatch):
+    from datetime import date
+
+    from markupsafe import escape
+
+    import app.utils.candidate_status_utils as status_utils
+    from app.models.candidate_m import Candidate
+    from app.models.email_outbox_m import EmailOutbox
+    from app.utils.job_dashboard_utils import job_dashboard_rows
+
+    renders = []
+    monkeypatch.setattr(
+        status_utils, "render_email",
+        lambda template, context: renders.append(template) or f"<p>Dear {escape(context['candidate_name'])}</p>"
+    )
+
+    job = client.post("/job-postings/", json={
+        "organization_id": organization.id, "branch_id": branch.id,
+        "job_description_id": job_description.id, "job_type": "fresher",
+        "number_of_positions": 5, "employment_type": "Full Time",
+        "location": "Bangalore", "salary": 50000, "posting_date": date.today().isoformat(),
+    }).json()
+    candidates = [
+        Candidate(job_posting_id=job["id"], first_name=f"Cand{i}", last_name="<Test>",
+                  email=f"bulk{i}@example.com", phone_number="9876543210",
+                  candidate_type="fresher", status="Pending")
+        for i in range(5)
+    ]
+    db_session.add_all(candidates)
+    db_session.flush()
+    ids = [candidate.id for candidate in candidates]
+
+    response = client.post("/candidates/status/bulk", json={"candidate_ids": ids + [999999], "status": "Accepted"})
+    assert response.status_code == 200
+    assert response.json() == {"updated": 5, "unchanged": 0, "not_found": [999999], "emails_queued": 5}
+    # Slot render + the first candidate's reference render, not one per candidate
+    assert renders == ["accepted_email.html"] * 2
+
+    bodies = {row.candidate_id: row.html_body for row in db_session.query(EmailOutbox).filter(EmailOutbox.candidate_id.in_(ids))}
+    assert bodies[ids[0]] == "<p>Dear Cand0 &lt;Test&gt;</p>"
+
+    db_session.expire_all()
+    assert {c.status for c in db_session.query(Candidate).filter(Candidate.id.in_(ids))} == {"Accepted"}
+    counters = job_dashboard_rows(db_session, job_posting_id=job["id"], use_counters=True)[0]
+    assert (counters["pending"], counters["accepted"]) == (0, 5)
+
+    # Repeat call: nothing changes, nothing re-sent
+    again = client.post("/candidates/status/bulk", json={"candidate_ids": ids, "status": "Accepted"}).json()
+    assert (again["updated"], again["unchanged"], again["emails_queued"]) == (0, 5, 0)
+
+    # Accepted → Rejected → Accepted: every transition emails again
+    for status in ("Rejected", "Accepted"):
+        result = client.post("/candidates/status/bulk", json={"candidate_ids": ids, "status": status}).json()
+        assert result["emails_queued"] == 5
+    assert db_session.query(EmailOutbox).filter(EmailOutbox.candidate_id == ids[0]).count() == 3
+
+
+# ====================================
+# SEARCH: ranked skill match + facet filters
+# ====================================
+def test_search_candidates(client, db_session, organization, branch, job_description):
+    from datetime import date
+
+    from app.models.candidate_m import Candidate
+    from app.utils.candidate_search import candidate_search_index
+
+    job = client.post("/job-postings/", json={
+        "organization_id": organization.id, "branch_id": branch.id,
+        "job_description_id": job_description.id, "job_type": "both",
+        "number_of_positions": 5, "employment_type": "Full Time",
+        "location": "Bangalore", "salary": 50000, "posting_date": date.today().isoformat(),
+    }).json()
+    db_session.add_all([
+        Candidate(job_posting_id=job["id"], first_name="Asha", last_name="R", email="asha@example.com",
+                  phone_number="9876543210", candidate_type="experienced", skills="Python, Django, SQL",
+                  total_experience="3 years", city="Hyderabad", english_level="Fluent"),
+        Candidate(job_posting_id=job["id"], first_name="Ravi", last_name="K", email="ravi@example.com",
+                  phone_number="9876543211", candidate_type="fresher", skills="Python, Excel",
+                  city="Pune", english_level="Basic"),
+        Candidate(job_posting_id=job["id"], first_name="Meena", last_name="S", email="meena@example.com",
+                  phone_number="9876543212", candidate_type="fresher", skills="Java",
+                  city="Hyderabad"),
+    ])
+    db_session.flush()
+    candidate_search_index.invalidate()  # rebuilt from this session on the next search
+
+    response = client.get("/candidates/search", params={"q": "python django", "job_posting_id": job["id"]})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2
+    assert [hit["first_name"] for hit in data["results"]] == ["Asha", "Ravi"]
+    assert data["results"][0]["score"] > data["results"][1]["score"]
+    assert data["facets"]["candidate_type"] == {"experienced": 1, "fresher": 1}
+
+    filtered = client.get("/candidates/search", params={
+        "city": "hyderabad", "candidate_type": "fresher", "job_posting_id": job["id"],
+    }).json()
+    assert [hit["first_name"] for hit in filtered["results"]] == ["Meena"]
+
+    experienced = client.get("/candidates/search", params={"min_experience": 2, "job_posting_id": job["id"]}).json()
+    assert [hit["first_name"] for hit in experienced["results"]] == ["Asha"]
@@ -138,6 +138,33 @@ def test_filter_by_location(
     assert len(response.json()) >= 1
 
 
+# ---------------------------------------------------
+# FILTER: "contains" location match, cached until a posting changes
+# ---------------------------------------------------
+def test_filter_cached_and_invalidated(
+    client, sql_budget, organization, branch, job_description
+):
+    payload = get_job_payload(organization, branch, job_description)
+    first = client.post("/job-postings/", json={**payload, "location": "New Delhi"}).json()
+    client.post("/job-postings/", json={**payload, "location": "Pune", "salary": 20000})
+
+    response = client.get("/job-postings/filters?location=  DELHI ")
+    assert [p["id"] for p in response.json()] == [first["id"]]
+    assert client.get("/job-postings/filters?location=chennai").json() == []
+
+    # Same filters (after normalizing) → served from the cache
+    with sql_budget(0):
+        cached = client.get("/job-postings/filters?location=delhi")
+    assert cached.json() == response.json()
+
+    client.put(f"/job-postings/{first['id']}", json={"salary": 90000})
+    updated = client.get("/job-postings/filters?location=delhi").json()
+    assert [p["salary"] for p in updated] == [90000]
+
+    client.delete(f"/job-postings/{first['id']}")
+    assert client.get("/job-postings/filters?location=delhi").json() == []
+
+
 # ---------------------------------------------------
 # DASHBOARD
 # ---------------------------------------------------
@@ -155,3 +182,65 @@ def test_dashboard(
     dashboard = response.json()[0]
     assert "job_id" in dashboard
     assert "total_candidates" in dashboard
+
+
+# ---------------------------------------------------
+# DASHBOARD COUNTS (live aggregate == counter table)
+# ---------------------------------------------------
+def test_dashboard_counts_match_counters(
+    client, db_session, organization, branch, job_description
+):
+    from app.models.candidate_m import Candidate
+    from app.utils.job_dashboard_utils import job_dashboard_rows
+
+    job = client.post(
+        "/job-postings/", json=get_job_payload(organization, branch, job_description)
+    ).json()
+
+    for status in ["Pending", "Pending", "Accepted", "Rejected"]:
+        db_session.add(Candidate(
+            job_posting_id=job["id"], first_name="A", last_name="B",
+            email="a@test.com", phone_number="9876543210",
+            candidate_type="fresher", status=status
+        ))
+    db_session.flush()
+
+    moved = db_session.query(Candidate).filter(
+        Candidate.job_posting_id == job["id"], Candidate.status == "Pending"
+    ).first()
+    moved.status = "Accepted"
+    db_session.flush()
+
+    response = client.get(f"/job-postings/dashboard?job_posting_id={job['id']}")
+    row = response.json()[0]
+
+    assert row["role"] == job_description.title
+    assert (row["total_candidates"], row["pending"], row["accepted"], row["rejected"]) == (4, 1, 2, 1)
+
+    counters = job_dashboard_rows(db_session, job_posting_id=job["id"], use_counters=True)[0]
+    assert counters["total_candidates"] == 4
+    assert (counters["pending"], counters["accepted"], counters["rejected"]) == (1, 2, 1)
+
+
+# ---------------------------------------------------
+# NO N+1: statements do not grow with the number of postings
+# ---------------------------------------------------
+def test_list_job_postings_statement_budget(
+    client, sql_budget, organization, branch, job_description
+):
+    payload = get_job_payload(organization, branch, job_description)
+    client.post("/job-postings/", json=payload)
+
+    with sql_budget(10) as one_posting:
+        client.get("/job-postings/")
+
+    for location in ["Chennai", "Pune", "Delhi"]:
+        client.post("/job-postings/", json={**payload, "location": location})
+
+    with sql_budget(len(one_posting)):
+        response = client.get("/job-postings/")
+
+    posting = response.json()[0]
+    assert posting["job_description"]["title"] == job_description.title
+    assert posting["branch"]["id"] == branch.id
+    assert posting["organization"]["id"] == organization.id
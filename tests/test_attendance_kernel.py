@@ -0,0 +1,124 @@
+# tests/test_attendance_kernel.py
+"""
+Differential tests: NumPy kernel (attendance_kernel) vs scalar rules
+(attendance_utils.evaluate_day) on randomly generated months.
+"""
+import random
+from datetime import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.utils.attendance_utils import (
+    AttendanceMonthContext,
+    PermissionWindow,
+    ShiftWindow,
+    SUMMARY_COUNTERS,
+)
+from app.utils.attendance_kernel import (
+    build_day_arrays,
+    day_counters_vectorized,
+    evaluate_days,
+    month_counters_vectorized,
+)
+
+
+def random_time(rng):
+    return time(rng.randrange(24), rng.randrange(60), rng.randrange(60), rng.choice([0, 0, 0, rng.randrange(10**6)]))
+
+
+def random_shift(rng):
+    return ShiftWindow(
+        start_time=random_time(rng),
+        end_time=random_time(rng),
+        lag_minutes=rng.choice([0, 5, 10, 15, 30]),
+        working_minutes=rng.choice([240, 480, 540]),
+    )
+
+
+def random_context(rng, user_id, year, month, holiday_dates, shifts):
+    user = SimpleNamespace(id=user_id, biometric_id=f"BIO{user_id}", shift_roster_id=1)
+    ctx = AttendanceMonthContext(user, year, month, holiday_dates)
+
+    # Roster: isoweekday → shift id (some days without a roster entry)
+    ctx.set_roster({wd: rng.choice(list(shifts)) for wd in range(1, 8) if rng.random() < 0.8}, shifts)
+
+    for day in ctx.days():
+        n_punches = rng.choice([0, 1, 2, 2, 3, 4])
+        if n_punches:
+            ctx.punch_map[day] = [random_time(rng) for _ in range(n_punches)]
+
+        if rng.random() < 0.1:
+            ctx.leave_map[day] = rng.choice([True, False, None])
+
+        if rng.random() < 0.15:
+            ctx.permission_map[day] = PermissionWindow(
+                random_time(rng), random_time(rng), "random"
+            )
+
+    return ctx
+
+
+def make_contexts(seed, n_users=40, year=2025, month=12):
+    rng = random.Random(seed)
+    base = AttendanceMonthContext(SimpleNamespace(id=0, biometric_id="X"), year, month)
+    holiday_dates = {d for d in base.days() if rng.random() < 0.1}
+    shifts = {sid: random_shift(rng) for sid in range(1, 5)}
+    return [random_context(rng, uid, year, month, holiday_dates, shifts) for uid in range(1, n_users + 1)]
+
+
+# ------------------------------
+# PER DAY: every cell must match
+# ------------------------------
+@pytest.mark.parametrize("seed", range(10))
+def test_kernel_matches_scalar_per_day(seed):
+    contexts = make_contexts(seed)
+    per_day = evaluate_days(build_day_arrays(contexts))
+
+    for u, ctx in enumerate(contexts):
+        for d, day in enumerate(ctx.days()):
+            expected = ctx.day_counters(day)
+            actual = {key: int(per_day[key][u, d]) for key in SUMMARY_COUNTERS}
+            assert actual == expected, (ctx.user_id, day)
+
+
+# ------------------------------
+# MONTH TOTALS
+# ------------------------------
+@pytest.mark.parametrize("year,month", [(2024, 2), (2025, 1), (2025, 12)])
+def test_kernel_matches_scalar_month_totals(year, month):
+    contexts = make_contexts(seed=year * 100 + month, year=year, month=month)
+    vectorized = month_counters_vectorized(contexts)
+
+    for ctx in contexts:
+        assert vectorized[ctx.user_id] == ctx.month_counters()
+
+
+def test_kernel_default_shift_without_roster():
+    ctx = AttendanceMonthContext(SimpleNamespace(id=1, biometric_id="BIO1"), 2025, 12)
+    day = next(d for d in ctx.days() if d.weekday() == 0)
+    ctx.punch_map[day] = [time(9, 20), time(18, 0)]
+
+    per_day = evaluate_days(build_day_arrays([ctx]))
+    d = day.day - 1
+
+    assert per_day["late_minutes"][0, d] == 20
+    assert per_day["overtime_minutes"][0, d] == 60
+    assert per_day["present_days"][0, d] == 1
+    assert np.array_equal(
+        per_day["absent_days"][0],
+        np.array([ctx.day_counters(x)["absent_days"] for x in ctx.days()])
+    )
+
+
+def test_kernel_empty_input():
+    assert month_counters_vectorized([]) == {}
+
+
+def test_kernel_day_map_matches_scalar():
+    contexts = make_contexts(seed=99, n_users=5)
+    vectorized = day_counters_vectorized(contexts)
+
+    for ctx in contexts:
+        assert vectorized[ctx.user_id] == ctx.day_counters_map()
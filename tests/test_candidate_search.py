@@ -0,0 +1,97 @@
+# tests/test_candidate_search.py
+"""
+In-process candidate search index: tokenizing, ranked skill match, facet
+filters and counts, experience range, org scoping, upserts and removals.
+"""
+from datetime import datetime
+
+from app.utils.candidate_search import CandidateDoc, CandidateSearchIndex, parse_experience, tokenize
+
+
+def doc(id, skills, candidate_type="fresher", city="Hyderabad", qualification="B.Tech",
+        experience=None, organization_id=1, english="Fluent"):
+    return CandidateDoc(
+        id=id, organization_id=organization_id, job_posting_id=10, skills=skills,
+        total_experience=experience, candidate_type=candidate_type, city=city,
+        highest_qualification=qualification, telugu_level=None, english_level=english, hindi_level=None,
+    )
+
+
+def build():
+    index = CandidateSearchIndex(capacity=2)  # forces growth
+    index.add_many([
+        doc(1, "Python, Django, SQL"),
+        doc(2, "Java; Spring", candidate_type="experienced", experience="4 years", city="Pune"),
+        doc(3, "python, C++, Node.js", candidate_type="experienced", experience="1.5", organization_id=2),
+        doc(4, "Excel", city="hyderabad ", english="Basic"),
+        doc(5, "Rust, Python, Django, Kubernetes", candidate_type="experienced", experience="7"),
+    ])
+    return index
+
+
+def test_tokenize_and_experience():
+    assert tokenize("Python, Django; C++ / Node.js.") == ["python", "django", "c++", "node.js"]
+    assert parse_experience("2.5 years") == 2.5
+    assert parse_experience("fresher") is None
+
+
+def test_ranked_skill_match():
+    result = build().search(q="python django")
+
+    assert result.total == 3
+    # Both terms beat one term; ties broken by newest id
+    assert result.ids == [5, 1, 3]
+    assert result.scores[0] == result.scores[1] > result.scores[2]
+
+
+def test_facet_filters_are_case_insensitive_and_counted():
+    result = build().search(filters={"city": "HYDERABAD"})
+
+    assert sorted(result.ids) == [1, 3, 4, 5]
+    assert result.facets["city"] == {"Hyderabad": 4}
+    assert result.facets["candidate_type"] == {"fresher": 2, "experienced": 2}
+    assert result.facets["english_level"] == {"Fluent": 3, "Basic": 1}
+
+    assert build().search(filters={"city": "Atlantis"}).total == 0
+
+
+def test_experience_range_and_organization_scope():
+    index = build()
+
+    assert index.search(min_experience=2).ids == [5, 2]
+    assert index.search(min_experience=1, max_experience=5, organization_id=1).ids == [2]
+    assert index.search(q="python", organization_id=2).ids == [3]
+
+
+def test_upsert_and_remove():
+    index = build()
+    index.add_many([doc(1, "Go, Kubernetes", city="Chennai")])
+    index.remove([5])
+
+    assert index.search(q="python").ids == [3]
+    assert index.search(q="kubernetes").ids == [1]
+    assert index.search(filters={"city": "Chennai"}).total == 1
+    assert index.stats()["live"] == 4
+
+
+def test_pagination_over_ranked_results():
+    index = CandidateSearchIndex()
+    index.add_many([doc(i, "python" if i % 2 else "python sql") for i in range(1, 101)])
+
+    first = index.search(q="python sql", limit=10)
+    second = index.search(q="python sql", limit=10, offset=10)
+
+    assert first.total == 100
+    assert first.ids == list(range(100, 80, -2))  # both terms first, newest first
+    assert second.ids[:5] == list(range(80, 70, -2))
+    assert not set(first.ids) & set(second.ids)
+
+
+def test_dirty_ids_only_collected_once_built():
+    index = CandidateSearchIndex()
+    index.mark_dirty([1, 2, 3])
+    assert not index._dirty
+
+    index.watermark = datetime(2026, 1, 1)
+    index.mark_dirty([1, 2, 3])
+    assert index._dirty == {1, 2, 3}
@@ -0,0 +1,147 @@
+# tests/test_email_outbox.py
+"""
+Email outbox: dedupe per key, batched draining with a concurrency limit,
+retry with backoff and the max-attempts cut-off. The sender is a local
+stand-in recording what SES would have received.
+"""
+import threading
+import time as clock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (every mapper, incl. candidates for the FK)
+import app.services.email_outbox_service as outbox
+from app.database import Base
+from app.models.email_outbox_m import EmailOutbox
+from app.services.email_outbox_service import (
+    backoff_seconds, candidate_status_key, candidate_status_keys, drain_outbox, enqueue_email,
+)
+
+
+@pytest.fixture
+def Session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'outbox.db'}")
+    Base.metadata.create_all(bind=engine, tables=[EmailOutbox.__table__])
+    return sessionmaker(bind=engine)
+
+
+class FakeSES:
+    def __init__(self, fail_times=0, delay=0.0):
+        self.fail_times = fail_times
+        self.delay = delay
+        self.sent = []
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, message):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            failing = self.calls <= self.fail_times
+        try:
+            clock.sleep(self.delay)
+            if failing:
+                raise ConnectionError("SES throttled")
+            with self._lock:
+                self.sent.append(message.to_email)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def queue(Session, count, key=None):
+    with Session() as db:
+        for i in range(count):
+            enqueue_email(db, f"c{i}@example.com", "Update", "<p>hi</p>", dedupe_key=key)
+        db.commit()
+
+
+def test_dedupe_per_candidate_and_status(Session):
+    with Session() as db:
+        key = candidate_status_key(7, 0, "Pending", "Accepted", "accepted_email.html")
+        first = enqueue_email(db, "a@example.com", "S", "B", dedupe_key=key)
+        again = enqueue_email(db, "a@example.com", "S", "B", dedupe_key=key)
+        other = enqueue_email(db, "a@example.com", "S", "B",
+                              dedupe_key=candidate_status_key(7, 0, "Pending", "Rejected", "rejected_email.html"))
+        db.commit()
+
+        assert first.id == again.id != other.id
+        assert db.query(EmailOutbox).count() == 2
+
+
+def test_status_keys_follow_transitions(Session):
+    def transition(db, previous, status):
+        key = candidate_status_keys(db, [(7, previous, status, "t.html")])[7]
+        enqueue_email(db, "a@example.com", "S", "B", dedupe_key=key, candidate_id=7)
+        return key
+
+    with Session() as db:
+        accepted = transition(db, "Pending", "Accepted")
+        # Case does not matter
+        assert candidate_status_keys(db, [(7, "pending", "ACCEPTED", "t.html")])[7] != accepted
+        assert candidate_status_key(7, 0, "pending", "ACCEPTED", "t.html") == accepted
+
+        transition(db, "Accepted", "Rejected")
+        accepted_again = transition(db, "Rejected", "Accepted")
+        db.commit()
+
+        assert accepted_again != accepted
+        assert db.query(EmailOutbox).filter(EmailOutbox.candidate_id == 7).count() == 3
+
+
+def test_drains_in_batches_with_concurrency_limit(Session):
+    queue(Session, 12)
+    ses = FakeSES(delay=0.01)
+
+    totals = drain_outbox(Session, ses, batch_size=5, concurrency=3)
+
+    assert totals["batches"] == 3 and totals["sent"] == 12
+    assert len(ses.sent) == 12
+    assert ses.max_in_flight <= 3
+    with Session() as db:
+        assert {row.status for row in db.query(EmailOutbox)} == {"sent"}
+
+
+def test_failures_retried_with_backoff(Session, monkeypatch):
+    queue(Session, 1)
+
+    totals = drain_outbox(Session, FakeSES(fail_times=1), max_batches=1)
+    assert totals["retried"] == 1
+
+    with Session() as db:
+        row = db.query(EmailOutbox).one()
+        assert row.status == "pending" and row.attempts == 1
+        assert "SES throttled" in row.last_error
+
+    # Not due yet → nothing claimed
+    assert drain_outbox(Session, FakeSES())["claimed"] == 0
+
+    monkeypatch.setattr(outbox, "EMAIL_OUTBOX_BACKOFF_SECONDS", 0)
+    with Session() as db:
+        db.query(EmailOutbox).update({"next_attempt_at": outbox._now()})
+        db.commit()
+    assert drain_outbox(Session, FakeSES())["sent"] == 1
+
+
+def test_gives_up_after_max_attempts(Session, monkeypatch):
+    monkeypatch.setattr(outbox, "EMAIL_OUTBOX_BACKOFF_SECONDS", 0)
+    queue(Session, 1)
+
+    totals = drain_outbox(Session, FakeSES(fail_times=10), max_attempts=3)
+
+    assert totals == {"batches": 3, "claimed": 3, "sent": 0, "retried": 2, "failed": 1}
+    with Session() as db:
+        row = db.query(EmailOutbox).one()
+        assert row.status == "failed" and row.attempts == 3
+
+
+def test_backoff_doubles_and_caps(monkeypatch):
+    monkeypatch.setattr(outbox, "EMAIL_OUTBOX_BACKOFF_SECONDS", 30)
+    monkeypatch.setattr(outbox, "EMAIL_OUTBOX_MAX_BACKOFF_SECONDS", 100)
+
+    assert [backoff_seconds(n) for n in (1, 2, 3, 4)] == [30, 60, 100, 100]
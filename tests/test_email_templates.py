@@ -0,0 +1,77 @@
+# tests/test_email_templates.py
+"""
+Email template registry: compiled once, recompiled when the file changes,
+autoescaped, and batch rendering equal to one-by-one rendering (also for the
+candidate status emails).
+"""
+import os
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("jinja2")
+
+from app.utils.email_templates_utils import TemplateRegistry
+
+
+@pytest.fixture
+def templates(tmp_path):
+    (tmp_path / "accepted_email.html").write_text("<p>Dear {{ candidate_name }}</p>")
+    return tmp_path
+
+
+def test_compiled_once(templates):
+    registry = TemplateRegistry(str(templates), check_interval=0)
+
+    for _ in range(5):
+        assert registry.render("accepted_email.html", {"candidate_name": "Asha"}) == "<p>Dear Asha</p>"
+    assert registry.compiles == 1 and registry.hits == 4
+
+
+def test_edited_template_is_recompiled(templates):
+    registry = TemplateRegistry(str(templates), check_interval=0)
+    registry.render("accepted_email.html", {"candidate_name": "Asha"})
+
+    path = templates / "accepted_email.html"
+    path.write_text("<p>Hello {{ candidate_name }}!</p>")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert registry.render("accepted_email.html", {"candidate_name": "Asha"}) == "<p>Hello Asha!</p>"
+    assert registry.compiles == 2
+
+
+def test_check_interval_skips_stat(templates):
+    registry = TemplateRegistry(str(templates), check_interval=3600)
+    registry.render("accepted_email.html", {"candidate_name": "Asha"})
+
+    (templates / "accepted_email.html").unlink()
+    # Within the interval the compiled template is served without touching disk
+    assert registry.render("accepted_email.html", {"candidate_name": "Ravi"}) == "<p>Dear Ravi</p>"
+
+
+def test_autoescape_and_render_many(templates):
+    registry = TemplateRegistry(str(templates))
+    contexts = [{"candidate_name": name} for name in ("Asha", "<script>")]
+
+    assert registry.render_many("accepted_email.html", contexts) == [
+        registry.render("accepted_email.html", context) for context in contexts
+    ]
+    assert "&lt;script&gt;" in registry.render_many("accepted_email.html", contexts)[1]
+    assert registry.compiles == 1
+
+
+@pytest.mark.parametrize("body", ["<p title='{{ candidate_name }}'>Dear {{ candidate_name }}</p>",
+                                  "<p>Dear {{ candidate_name | upper }}</p>"])
+def test_status_emails_batch_matches_single(templates, monkeypatch, body):
+    import app.utils.candidate_status_utils as status_utils
+
+    (templates / "accepted_email.html").write_text(body)
+    registry = TemplateRegistry(str(templates))
+    monkeypatch.setattr(status_utils, "render_email", registry.render)
+
+    candidates = [SimpleNamespace(id=i, first_name=f"A&B <{i}>", last_name="O'Neil \"Jr\"") for i in range(3)]
+    batch = status_utils.render_status_emails(candidates, "Accepted")
+
+    assert batch == {c.id: status_utils.render_status_email(c, "Accepted") for c in candidates}
+    assert "&#39;" in batch[0] and "&#34;" in batch[0]     # quotes escaped as Jinja does
@@ -0,0 +1,132 @@
+# tests/test_formula_engine.py
+"""
+Compiled salary formulas: vectorized evaluation vs per-employee evaluation,
+dependency ordering, rejection of unsafe expressions and cache invalidation.
+"""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.utils.formula_engine import (
+    FormulaCache,
+    FormulaError,
+    compile_formulas,
+)
+
+
+def formula(code, expression, formula_type="earning"):
+    return SimpleNamespace(component_code=code, formula_expression=expression, formula_type=formula_type)
+
+
+STRUCTURE = [
+    formula("HRA", "BASIC * 0.5"),                        # declared before its dependency
+    formula("BASIC", "gross * 0.4"),
+    formula("SPECIAL", "max(gross - BASIC - HRA, 0)"),
+    formula("PF", "min(BASIC * 0.12, 1800)", "deduction"),
+    formula("PT", "where(gross > 15000, 200, 0)", "deduction"),
+]
+
+
+def test_vectorized_matches_scalar():
+    compiled = compile_formulas(STRUCTURE)
+    gross = np.random.default_rng(1).uniform(5_000, 250_000, size=1_000)
+
+    vectorized = compiled.evaluate(gross)
+
+    for i in range(0, len(gross), 97):
+        scalar = compiled.evaluate(gross[i])
+        for code in vectorized:
+            assert vectorized[code][i] == pytest.approx(float(scalar[code]))
+
+
+def test_components_and_net():
+    compiled = compile_formulas(STRUCTURE)
+    result = compiled.evaluate([50_000.0])
+
+    assert result["BASIC"][0] == 20_000
+    assert result["HRA"][0] == 10_000
+    assert result["SPECIAL"][0] == 20_000
+    assert result["PF"][0] == 1_800
+    assert result["PT"][0] == 200
+    assert compiled.net_amounts([50_000.0])[0] == 50_000 - 1_800 - 200
+
+
+def test_constant_formula_broadcasts():
+    compiled = compile_formulas([formula("CONVEYANCE", "1600")])
+    assert compiled.evaluate(np.array([1.0, 2.0, 3.0]))["CONVEYANCE"].tolist() == [1600, 1600, 1600]
+
+
+def test_no_formulas_means_no_redistribution():
+    assert compile_formulas([]).net_amounts([1000.0]) is None
+
+
+@pytest.mark.parametrize("expression", [
+    "__import__('os').system('id')",
+    "gross.__class__",
+    "[gross]",
+    "lambda: 1",
+    "'a' * 3",
+    "open('x')",
+])
+def test_unsafe_expressions_rejected(expression):
+    with pytest.raises(FormulaError):
+        compile_formulas([formula("X", expression)])
+
+
+@pytest.mark.parametrize("expression", ["2 ** 10 ** 10", "gross ** BASIC", "gross ** 11", "9 ** (5 * 5)"])
+def test_unbounded_power_rejected(expression):
+    with pytest.raises(FormulaError):
+        compile_formulas([formula("BASIC", "gross * 0.4"), formula("X", expression)])
+
+
+def test_power_overflow_raises_instead_of_hanging():
+    assert compile_formulas([formula("SQUARE", "gross ** 2")]).evaluate([3.0])["SQUARE"][0] == 9
+
+    with pytest.raises(FormulaError):
+        compile_formulas([formula("HUGE", "((((9 ** 10) ** 10) ** 10) ** 10) ** 10")]).evaluate([1.0])
+
+
+def test_round_with_decimals():
+    compiled = compile_formulas([formula("BASIC", "round(gross * 0.4, 2)"), formula("ROUNDED", "round(gross / 3)")])
+    result = compiled.evaluate([1000.1234, 100.0])
+
+    assert result["BASIC"].tolist() == [400.05, 40.0]
+    assert result["ROUNDED"].tolist() == [333.0, 33.0]
+
+
+@pytest.mark.parametrize("expression", ["gross / 0", "gross / (gross - gross)", "gross % 0", "1 / 0", "round(gross, gross)"])
+def test_evaluation_errors_raise_formula_error(expression):
+    with pytest.raises(FormulaError):
+        compile_formulas([formula("X", expression)]).evaluate([1000.0, 0.0])
+
+
+def test_unknown_name_and_cycle_rejected():
+    with pytest.raises(FormulaError):
+        compile_formulas([formula("A", "gross * RATE")])
+
+    with pytest.raises(FormulaError):
+        compile_formulas([formula("A", "B + 1"), formula("B", "A + 1")])
+
+
+def test_cache_invalidation():
+    cache = FormulaCache(ttl_seconds=60)
+    compiled = compile_formulas(STRUCTURE)
+
+    cache.put(1, compiled)
+    cache.put(2, compiled)
+    assert cache.get(1) is compiled
+
+    cache.invalidate(1)
+    assert cache.get(1) is None
+    assert cache.get(2) is compiled
+
+    # A structure-less formula affects every structure
+    cache.invalidate(None)
+    assert cache.get(2) is None
+
+
+def test_cache_ttl_expiry():
+    cache = FormulaCache(ttl_seconds=0)
+    cache.put(1, compile_formulas(STRUCTURE))
+    assert cache.get(1) is None
@@ -0,0 +1,105 @@
+# tests/test_job_posting_cache.py
+"""
+Job posting filter cache: key normalization, TTL, LRU eviction, per-org
+invalidation and the guards against caching stale or uncommitted results.
+"""
+from types import SimpleNamespace
+
+import app.utils.job_posting_cache as job_cache
+from app.utils.job_posting_cache import JobFilterCache, SESSION_KEY, filter_key
+
+
+class FakeSession:
+    def __init__(self):
+        self.info = {}
+
+
+class CountingLoader:
+    def __init__(self, on_load=None):
+        self.calls = 0
+        self.on_load = on_load
+
+    def __call__(self, db, key):
+        self.calls += 1
+        if self.on_load:
+            self.on_load()
+        return [f"{key.organization_id}:{key.location}:{self.calls}"]
+
+
+def test_equivalent_filters_share_an_entry():
+    assert filter_key(1, "  New   DELHI ") == filter_key(1, "new delhi")
+    assert filter_key(1, "", SimpleNamespace(value="fresher"), 0) == (1, None, "fresher", None, None, None)
+
+    loader = CountingLoader()
+    cache = JobFilterCache()
+    db = FakeSession()
+
+    first = cache.get_or_load(db, filter_key(1, "Delhi"), loader)
+    assert cache.get_or_load(db, filter_key(1, "delhi "), loader) is first
+    assert loader.calls == 1
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_ttl_and_lru(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(job_cache.clock, "monotonic", lambda: now[0])
+
+    loader = CountingLoader()
+    cache = JobFilterCache(max_size=2, ttl_seconds=30)
+    db = FakeSession()
+
+    cache.get_or_load(db, filter_key(1, "a"), loader)
+    now[0] += 31
+    cache.get_or_load(db, filter_key(1, "a"), loader)
+    assert loader.calls == 2
+
+    cache.get_or_load(db, filter_key(1, "b"), loader)
+    cache.get_or_load(db, filter_key(1, "a"), loader)   # a most recent
+    cache.get_or_load(db, filter_key(1, "c"), loader)   # evicts b
+    cache.get_or_load(db, filter_key(1, "a"), loader)
+    assert loader.calls == 4
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_drops_org_and_all_org_entries():
+    loader = CountingLoader()
+    cache = JobFilterCache()
+    db = FakeSession()
+
+    for organization_id in (1, 2, None):
+        cache.get_or_load(db, filter_key(organization_id), loader)
+
+    cache.invalidate(1)
+    assert loader.calls == 3
+    for organization_id in (1, 2, None):
+        cache.get_or_load(db, filter_key(organization_id), loader)
+    assert loader.calls == 5    # org 1 and super_admin reloaded, org 2 kept
+
+
+def test_no_fill_from_uncommitted_or_raced_loads():
+    cache = JobFilterCache()
+
+    dirty = FakeSession()
+    dirty.info[SESSION_KEY] = {1}
+    loader = CountingLoader()
+    cache.get_or_load(dirty, filter_key(1), loader)
+    cache.get_or_load(FakeSession(), filter_key(1), loader)
+    assert loader.calls == 2
+
+    # A posting changed while this load was running → result not kept
+    raced = CountingLoader(on_load=lambda: cache.invalidate(3))
+    cache.get_or_load(FakeSession(), filter_key(3), raced)
+    cache.get_or_load(FakeSession(), filter_key(3), raced)
+    assert raced.calls == 2
+
+
+def test_blank_stored_locations_do_not_break_matching():
+    class Query:
+        def group_by(self, *_):
+            return self
+
+        def __iter__(self):
+            return iter([("New Delhi",), ("   ",), ("",), (None,)])
+
+    db = SimpleNamespace(query=lambda *_: Query())
+    assert job_cache.matching_locations(db, None, "delhi") == ["New Delhi"]
@@ -0,0 +1,92 @@
+# tests/test_month_context_cache.py
+"""
+Month context cache: invalidation of months without a summary, re-invalidation
+after commit, whole-month drops for holidays and the guard against storing a
+context loaded across an invalidation.
+"""
+from datetime import date
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import app.utils.attendance_utils as attendance_utils
+from app.utils.attendance_utils import (
+    CONTEXT_INVALIDATIONS_KEY,
+    AttendanceMonthContext,
+    MonthContextCache,
+    queue_context_invalidation,
+    refresh_attendance_days,
+)
+
+
+def context(user_id, year=2025, month=12):
+    return AttendanceMonthContext(SimpleNamespace(id=user_id, biometric_id=None), year, month)
+
+
+class NoSummaries:
+    """Session stand-in whose summary query finds nothing."""
+
+    def __init__(self):
+        self.info = {}
+
+    def query(self, *_):
+        return self
+
+    def filter(self, *_):
+        return self
+
+    order_by = with_for_update = populate_existing = filter
+
+    def __iter__(self):
+        return iter(())
+
+    def flush(self):
+        pass
+
+
+def test_month_without_summary_is_invalidated(monkeypatch):
+    cache = MonthContextCache()
+    monkeypatch.setattr(attendance_utils, "month_context_cache", cache)
+    cache.put(context(1))
+
+    db = NoSummaries()
+    assert refresh_attendance_days(db, [1], [date(2025, 12, 5)]) == 0
+
+    assert cache.get(1, 2025, 12) is None
+    assert db.info[CONTEXT_INVALIDATIONS_KEY] == [(frozenset({1}), 2025, 12)]
+
+
+def test_invalidated_again_after_commit(monkeypatch):
+    cache = MonthContextCache()
+    monkeypatch.setattr(attendance_utils, "month_context_cache", cache)
+
+    with Session(create_engine("sqlite://")) as db:
+        queue_context_invalidation(db, [1], date(2025, 12, 1))
+
+        # A reader re-cached the pre-commit state in the meantime
+        cache.put(context(1))
+        db.commit()
+
+        assert cache.get(1, 2025, 12) is None
+        assert CONTEXT_INVALIDATIONS_KEY not in db.info
+
+
+def test_whole_month_and_raced_load():
+    cache = MonthContextCache()
+    for user_id in (1, 2):
+        cache.put(context(user_id))
+    cache.put(context(1, month=11))
+
+    cache.invalidate(None, 2025, 12)
+    assert cache.get(1, 2025, 12) is None and cache.get(2, 2025, 12) is None
+    assert cache.get(1, 2025, 11) is not None
+
+    # Loaded before an invalidation → not stored
+    generation = cache.generation
+    cache.invalidate([3], 2025, 12)
+    cache.put(context(3), generation)
+    assert cache.get(3, 2025, 12) is None
+
+    cache.put(context(3), cache.generation)
+    assert cache.get(3, 2025, 12) is not None
@@ -0,0 +1,87 @@
+# tests/test_pagination.py
+"""
+Keyset pages are disjoint and complete, and NDJSON streaming yields every row.
+"""
+import json
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException, Response
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.utils.pagination import PageParams, decode_cursor, encode_cursor, paginate
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+    id = Column(Integer, primary_key=True)
+    name = Column(String(20))
+
+
+class ItemResponse(BaseModel):
+    id: int
+    name: str
+    model_config = ConfigDict(from_attributes=True)
+
+
+engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+Base.metadata.create_all(engine)
+Session = sessionmaker(bind=engine)
+
+with Session() as seed:
+    seed.add_all([Item(id=i, name=f"item-{i}") for i in range(1, 251)])
+    seed.commit()
+
+api = FastAPI()
+
+
+def get_session():
+    with Session() as db:
+        yield db
+
+
+@api.get("/items")
+def list_items(response: Response, page: PageParams = Depends(), db=Depends(get_session)):
+    return paginate(db.query(Item), Item.id, page, response, ItemResponse, descending=True)
+
+
+client = TestClient(api)
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(12345)) == 12345
+
+
+@pytest.mark.parametrize("value", [{"id": 1}, [1], "1", 1.5, True, None])
+def test_non_integer_cursor_rejected(value):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(encode_cursor(value))
+    assert exc.value.status_code == 400
+
+
+def test_keyset_pages_cover_table_once():
+    seen, cursor = [], None
+    while True:
+        url = "/items?limit=100" + (f"&cursor={cursor}" if cursor else "")
+        res = client.get(url)
+        seen.extend(row["id"] for row in res.json())
+        cursor = res.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert seen == list(range(250, 0, -1))
+
+
+def test_without_pagination_returns_full_list():
+    assert len(client.get("/items").json()) == 250
+
+
+def test_ndjson_stream_yields_every_row():
+    res = client.get("/items?format=ndjson")
+    rows = [json.loads(line) for line in res.text.splitlines()]
+    assert [r["id"] for r in rows] == list(range(250, 0, -1))
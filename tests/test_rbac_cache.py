@@ -0,0 +1,132 @@
+# tests/test_rbac_cache.py
+"""
+RBAC rights cache: hits / misses, TTL, LRU eviction, explicit invalidation
+and cross-worker invalidation through a shared generation backend.
+"""
+import pytest
+
+import app.utils.rbac_cache as rbac
+from app.utils.rbac_cache import MemoryGenerationBackend, Rights, RoleRightsCache
+
+MATRIX = {
+    1: {10: Rights(True, True, True, True), 11: Rights(True, False, False, False)},
+    2: {10: Rights(True, False, False, False)},
+}
+
+
+class CountingLoader:
+    def __init__(self, matrix):
+        self.matrix = matrix
+        self.calls = 0
+
+    def __call__(self, db, role_id):
+        self.calls += 1
+        return dict(self.matrix.get(role_id, {}))
+
+
+def test_role_loaded_once_and_reused():
+    loader = CountingLoader(MATRIX)
+    cache = RoleRightsCache(loader=loader)
+
+    assert cache.allows(None, 1, 10, "delete")
+    assert cache.allows(None, 1, 11, "view")
+    assert not cache.allows(None, 1, 11, "edit")
+    assert not cache.allows(None, 1, 99, "view")     # unknown menu → no rights
+
+    assert loader.calls == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+    assert stats["hit_rate"] == 0.75
+
+
+def test_unknown_action_rejected():
+    cache = RoleRightsCache(loader=CountingLoader(MATRIX))
+    with pytest.raises(ValueError):
+        cache.allows(None, 1, 10, "approve")
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rbac.clock, "monotonic", lambda: now[0])
+
+    loader = CountingLoader(MATRIX)
+    cache = RoleRightsCache(loader=loader, ttl_seconds=60)
+
+    cache.get(None, 1, 10)
+    now[0] += 59
+    cache.get(None, 1, 10)
+    now[0] += 2
+    cache.get(None, 1, 10)
+
+    assert loader.calls == 2
+
+
+def test_lru_eviction():
+    loader = CountingLoader(MATRIX)
+    cache = RoleRightsCache(loader=loader, max_size=1)
+
+    cache.get(None, 1, 10)
+    cache.get(None, 2, 10)
+    cache.get(None, 1, 10)
+
+    assert loader.calls == 3
+    assert cache.stats()["evictions"] == 2
+
+
+def test_invalidate_reloads_changed_rights():
+    matrix = {1: {10: Rights(True)}}
+    loader = CountingLoader(matrix)
+    cache = RoleRightsCache(loader=loader)
+
+    assert not cache.allows(None, 1, 10, "edit")
+    matrix[1][10] = Rights(True, False, True, False)
+    assert not cache.allows(None, 1, 10, "edit")     # still cached
+
+    cache.invalidate(1)
+    assert cache.allows(None, 1, 10, "edit")
+
+
+def test_load_racing_an_invalidation_is_not_kept():
+    matrix = {1: {10: Rights(True, True, True, True)}}
+    cache = RoleRightsCache(loader=None)
+
+    def revoked_during_load(db, role_id):
+        rights = dict(matrix[role_id])          # read before the revoke commits
+        matrix[1][10] = Rights(True)
+        cache.invalidate(1)                     # after_commit of the revoke
+        return rights
+
+    cache.loader = revoked_during_load
+    assert cache.allows(None, 1, 10, "delete")  # this request saw the old rights
+
+    cache.loader = CountingLoader(matrix)
+    assert not cache.allows(None, 1, 10, "delete")
+    assert cache.loader.calls == 1
+
+
+def test_shared_backend_invalidates_other_workers():
+    backend = MemoryGenerationBackend()
+    matrix = {1: {10: Rights(True)}}
+    worker_a = RoleRightsCache(loader=CountingLoader(matrix), backend=backend, check_interval=0)
+    worker_b = RoleRightsCache(loader=CountingLoader(matrix), backend=backend, check_interval=0)
+
+    assert not worker_b.allows(None, 1, 10, "create")
+
+    matrix[1][10] = Rights(True, True, False, False)
+    worker_a.invalidate(1)
+
+    assert worker_b.allows(None, 1, 10, "create")
+
+
+def test_backend_failure_falls_back_to_ttl():
+    class DownBackend:
+        def get(self):
+            raise ConnectionError("redis down")
+
+        def bump(self):
+            raise ConnectionError("redis down")
+
+    cache = RoleRightsCache(loader=CountingLoader(MATRIX), backend=DownBackend(), check_interval=0)
+    assert cache.allows(None, 1, 10, "view")
+    cache.invalidate(1)
+    assert cache.stats()["backend_errors"] >= 2
@@ -0,0 +1,81 @@
+# tests/test_read_replica.py
+"""
+get_read_db routing: replica when configured and healthy, primary otherwise,
+and no writes through a read session.
+"""
+import pytest
+from sqlalchemy import create_engine, text
+
+import app.database as database
+
+
+@pytest.fixture
+def fresh_replica_state(monkeypatch):
+    monkeypatch.setitem(database._replica_state, "checked_at", None)
+    monkeypatch.setitem(database._replica_state, "available", False)
+    monkeypatch.setitem(database._replica_state, "probing", False)
+
+
+def open_read_session():
+    dependency = database.get_read_db()
+    return dependency, next(dependency)
+
+
+def test_without_replica_reads_go_to_primary(monkeypatch, fresh_replica_state):
+    monkeypatch.setattr(database, "read_engine", None)
+
+    dependency, db = open_read_session()
+    assert db.get_bind() is database.engine
+    dependency.close()
+
+
+def test_healthy_replica_serves_reads(monkeypatch, fresh_replica_state, tmp_path):
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    with replica.begin() as conn:
+        conn.execute(text("CREATE TABLE marker (source TEXT)"))
+        conn.execute(text("INSERT INTO marker VALUES ('replica')"))
+    monkeypatch.setattr(database, "read_engine", replica)
+
+    dependency, db = open_read_session()
+    assert db.get_bind() is replica
+    assert db.execute(text("SELECT source FROM marker")).scalar() == "replica"
+    dependency.close()
+
+
+def test_unreachable_replica_falls_back_to_primary(monkeypatch, fresh_replica_state, tmp_path):
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    monkeypatch.setattr(database, "read_engine", broken)
+
+    dependency, db = open_read_session()
+    assert db.get_bind() is database.engine
+    assert database._replica_state["error"]
+    dependency.close()
+
+    # Result is cached for READ_REPLICA_CHECK_INTERVAL seconds
+    checked_at = database._replica_state["checked_at"]
+    assert database.replica_available() is False
+    assert database._replica_state["checked_at"] == checked_at
+
+
+def test_requests_during_a_probe_get_the_last_state(monkeypatch, fresh_replica_state):
+    monkeypatch.setattr(database, "read_engine", object())
+    monkeypatch.setitem(database._replica_state, "available", True)
+    monkeypatch.setitem(database._replica_state, "probing", True)
+
+    def probe():
+        raise AssertionError("second probe while one is running")
+
+    monkeypatch.setattr(database, "_probe_replica", probe)
+    assert database.replica_available() is True
+
+
+def test_read_session_rejects_writes(monkeypatch, fresh_replica_state):
+    from app.models.month_close_m import MonthCloseJob
+
+    monkeypatch.setattr(database, "read_engine", None)
+    dependency, db = open_read_session()
+
+    db.add(MonthCloseJob())
+    with pytest.raises(RuntimeError):
+        db.flush()
+    dependency.close()
@@ -0,0 +1,171 @@
+# tests/test_resume_upload_service.py
+"""
+Presigned resume uploads: signed upload tokens, the policy handed to the
+client, confirm (checks + move out of pending/) and the lifecycle rule.
+"""
+import io
+import time as clock
+
+import pytest
+from fastapi import HTTPException
+
+import app.services.resume_upload_service as resume_uploads
+from app.services.resume_upload_service import (
+    LIFECYCLE_RULE_ID, PENDING_PREFIX, RESUME_PREFIX,
+    ResumeUploadService, read_upload_token, sign_upload_token,
+)
+
+PDF = b"%PDF-1.7\n" + b"x" * 100
+
+
+class ClientError(Exception):
+    pass
+
+
+class FakeS3:
+    """In-memory subset of the boto3 S3 client used by the service."""
+
+    class exceptions:
+        ClientError = ClientError
+
+    def __init__(self):
+        self.objects = {}
+        self.lifecycle = None
+        self.presign_kwargs = None
+
+    def generate_presigned_post(self, **kwargs):
+        self.presign_kwargs = kwargs
+        return {"url": "https://test-bucket.s3.amazonaws.com/", "fields": {"key": kwargs["Key"], "policy": "p"}}
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise ClientError("404")
+        return {"ContentLength": len(self.objects[Key])}
+
+    def get_object(self, Bucket, Key, Range):
+        end = int(Range.split("-")[1])
+        return {"Body": io.BytesIO(self.objects[Key][:end + 1])}
+
+    def copy_object(self, Bucket, Key, CopySource, ContentType, MetadataDirective):
+        self.objects[Key] = self.objects[CopySource["Key"]]
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+    def get_bucket_lifecycle_configuration(self, Bucket):
+        if self.lifecycle is None:
+            raise ClientError("NoSuchLifecycleConfiguration")
+        return self.lifecycle
+
+    def put_bucket_lifecycle_configuration(self, Bucket, LifecycleConfiguration):
+        self.lifecycle = LifecycleConfiguration
+
+
+@pytest.fixture(autouse=True)
+def secret_key(monkeypatch):
+    monkeypatch.setattr(resume_uploads, "SECRET_KEY", "test-secret")
+
+
+def make_service(client):
+    return ResumeUploadService(client_factory=lambda: client, bucket="test-bucket", region="eu-north-1", max_bytes=1000)
+
+
+def test_upload_token_round_trip_and_tamper():
+    key = f"{PENDING_PREFIX}abc.pdf"
+    token = sign_upload_token(key, int(clock.time()) + 60)
+    assert read_upload_token(token) == key
+
+    payload, signature = token.split(".")
+    forged = sign_upload_token(f"{RESUME_PREFIX}someone-else.pdf", int(clock.time()) + 60).split(".")[0]
+    with pytest.raises(HTTPException):
+        read_upload_token(f"{forged}.{signature}")
+    with pytest.raises(HTTPException):
+        read_upload_token("garbage")
+
+
+def test_expired_token_rejected(monkeypatch):
+    monkeypatch.setattr(resume_uploads, "RESUME_PENDING_EXPIRE_DAYS", 0)
+    token = sign_upload_token(f"{PENDING_PREFIX}abc.pdf", int(clock.time()) - 1)
+
+    with pytest.raises(HTTPException) as exc:
+        read_upload_token(token)
+    assert exc.value.detail == "Upload token expired"
+
+
+def test_policy_scoped_to_pending_prefix():
+    client = FakeS3()
+    upload = make_service(client).create_upload("PDF")
+
+    assert upload["key"].startswith(PENDING_PREFIX) and upload["key"].endswith(".pdf")
+    conditions = client.presign_kwargs["Conditions"]
+    assert ["starts-with", "$key", PENDING_PREFIX] in conditions
+    assert ["content-length-range", 1, 1000] in conditions
+    assert {"Content-Type": "application/pdf"} in conditions
+
+    with pytest.raises(HTTPException):
+        make_service(client).create_upload("exe")
+
+
+def test_confirm_moves_object_out_of_pending():
+    client = FakeS3()
+    service = make_service(client)
+    upload = service.create_upload("pdf")
+    client.objects[upload["key"]] = PDF
+
+    url = service.confirm_upload(upload["upload_token"])
+
+    final_key = upload["key"].replace(PENDING_PREFIX, RESUME_PREFIX)
+    assert url == f"https://test-bucket.s3.eu-north-1.amazonaws.com/{final_key}"
+    assert list(client.objects) == [final_key]
+
+
+def test_confirm_rejects_missing_and_mismatched_content():
+    client = FakeS3()
+    service = make_service(client)
+    upload = service.create_upload("pdf")
+
+    with pytest.raises(HTTPException) as exc:
+        service.confirm_upload(upload["upload_token"])
+    assert exc.value.status_code == 404
+
+    client.objects[upload["key"]] = b"MZ\x90\x00 not a pdf"
+    with pytest.raises(HTTPException) as exc:
+        service.confirm_upload(upload["upload_token"])
+    assert exc.value.status_code == 400
+    assert client.objects == {}
+
+
+def test_confirm_rejects_empty_object():
+    client = FakeS3()
+    service = make_service(client)
+    upload = service.create_upload("pdf")
+    client.objects[upload["key"]] = b""
+
+    with pytest.raises(HTTPException) as exc:
+        service.confirm_upload(upload["upload_token"])
+    assert exc.value.status_code == 400
+
+
+def test_missing_secret_key_fails_closed(monkeypatch):
+    service = make_service(FakeS3())
+    token = service.create_upload("pdf")["upload_token"]
+    monkeypatch.setattr(resume_uploads, "SECRET_KEY", None)
+
+    for call in (lambda: service.create_upload("pdf"), lambda: service.confirm_upload(token)):
+        with pytest.raises(HTTPException) as exc:
+            call()
+        assert exc.value.status_code == 503
+
+
+def test_lifecycle_rule_keeps_other_rules():
+    client = FakeS3()
+    client.lifecycle = {"Rules": [{"ID": "archive-videos", "Status": "Enabled"}]}
+    service = make_service(client)
+
+    service.apply_lifecycle_rule(days=2)
+    service.apply_lifecycle_rule(days=1)
+
+    rules = {rule["ID"]: rule for rule in client.lifecycle["Rules"]}
+    assert set(rules) == {"archive-videos", LIFECYCLE_RULE_ID}
+    assert rules[LIFECYCLE_RULE_ID]["Filter"] == {"Prefix": PENDING_PREFIX}
+    assert rules[LIFECYCLE_RULE_ID]["Expiration"] == {"Days": 1}
@@ -0,0 +1,116 @@
+# tests/test_s3_upload_service.py
+"""
+Async S3 upload service: type from magic bytes, single put vs multipart,
+size limit enforced while streaming (multipart aborted), and a round trip
+against moto when it is installed.
+"""
+import asyncio
+from io import BytesIO
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.services.s3_upload_service import S3UploadService, sniff_file_type
+
+PDF = b"%PDF-1.7\n" + b"x" * 30
+
+
+class FakeS3:
+    """Records calls; enough of the boto3 S3 client surface for the service."""
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = {}
+        self.aborted = []
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        self.objects[Key] = (Body, ContentType)
+
+    def create_multipart_upload(self, Bucket, Key, ContentType):
+        self.uploads["u1"] = {}
+        return {"UploadId": "u1"}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.uploads[UploadId][PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        parts = self.uploads.pop(UploadId)
+        self.objects[Key] = (b"".join(parts[p["PartNumber"]] for p in MultipartUpload["Parts"]), None)
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId, None)
+        self.aborted.append(UploadId)
+
+
+def make_upload(content: bytes, filename="resume.pdf"):
+    return UploadFile(file=BytesIO(content), filename=filename)
+
+
+def make_service(client, **kwargs):
+    return S3UploadService(client_factory=lambda: client, bucket="test-bucket", region="eu-north-1", **kwargs)
+
+
+def test_sniff_file_type():
+    assert sniff_file_type(PDF) == ("pdf", "application/pdf")
+    assert sniff_file_type(b"\xff\xd8\xff\xe0rest") == ("jpg", "image/jpeg")
+    assert sniff_file_type(b"MZ\x90\x00") is None
+
+
+def test_small_file_single_put():
+    client = FakeS3()
+    url = asyncio.run(make_service(client).upload(make_upload(PDF), "candidate_resumes"))
+
+    [(key, (body, content_type))] = client.objects.items()
+    assert url == f"https://test-bucket.s3.eu-north-1.amazonaws.com/{key}"
+    assert key.startswith("candidate_resumes/") and key.endswith(".pdf")
+    assert body == PDF and content_type == "application/pdf"
+
+
+def test_extension_is_not_trusted():
+    client = FakeS3()
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(make_service(client).upload(make_upload(b"MZ\x90\x00binary", "resume.pdf"), "x"))
+
+    assert exc.value.status_code == 400
+    assert client.objects == {}
+
+
+def test_large_file_multipart_in_order():
+    client = FakeS3()
+    service = make_service(client, part_size=8, max_parts_in_flight=2)
+    asyncio.run(service.upload(make_upload(PDF), "candidate_resumes"))
+
+    [(body, _)] = client.objects.values()
+    assert body == PDF
+    assert client.aborted == []
+
+
+def test_oversized_file_aborted():
+    client = FakeS3()
+    service = make_service(client, part_size=8, max_bytes=20)
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(service.upload(make_upload(PDF), "candidate_resumes"))
+
+    assert exc.value.status_code == 413
+    assert client.aborted == ["u1"]
+    assert client.objects == {} and client.uploads == {}
+
+
+def test_round_trip_against_moto():
+    moto = pytest.importorskip("moto")
+    import boto3
+
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="test-bucket")
+
+        content = PDF + b"y" * (6 * 1024 * 1024)  # two parts of the 5 MiB minimum
+        service = make_service(client, part_size=5 * 1024 * 1024)
+        url = asyncio.run(service.upload(make_upload(content), "candidate_resumes"))
+
+        key = url.split(".amazonaws.com/", 1)[1]
+        stored = client.get_object(Bucket="test-bucket", Key=key)
+        assert stored["Body"].read() == content
+        assert stored["ContentType"] == "application/pdf"
@@ -0,0 +1,85 @@
+# tests/test_seed_version.py
+"""
+Startup seeding runs once per SEED_VERSION: later boots skip it, a version
+bump re-runs it, and a failed step leaves the marker unset.
+"""
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models.seed_version_m import SeedVersion
+from app.seeders.startup_seeder import SEED_NAME, run_startup_seeding, seeded_version
+
+
+def make_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'seed.db'}")
+    SeedVersion.__table__.create(bind=engine)
+    return engine
+
+
+def test_first_boot_runs_and_marks(tmp_path):
+    engine = make_engine(tmp_path)
+    calls = []
+
+    assert run_startup_seeding(lambda: calls.append("a"), engine=engine, version=1, force=False)
+    assert calls == ["a"]
+    assert seeded_version(engine) == 1
+
+    with Session(engine) as db:
+        assert db.get(SeedVersion, SEED_NAME).seconds >= 0
+
+
+def test_later_boots_skip(tmp_path):
+    engine = make_engine(tmp_path)
+    calls = []
+    step = lambda: calls.append("a")
+
+    run_startup_seeding(step, engine=engine, version=1, force=False)
+    assert not run_startup_seeding(step, engine=engine, version=1, force=False)
+    assert calls == ["a"]
+
+
+def test_version_bump_and_force_rerun(tmp_path):
+    engine = make_engine(tmp_path)
+    calls = []
+    step = lambda: calls.append("a")
+
+    run_startup_seeding(step, engine=engine, version=1, force=False)
+    assert run_startup_seeding(step, engine=engine, version=2, force=False)
+    assert seeded_version(engine) == 2
+    assert run_startup_seeding(step, engine=engine, version=2, force=True)
+    assert len(calls) == 3
+
+
+def test_failed_step_is_retried(tmp_path):
+    engine = make_engine(tmp_path)
+
+    run_startup_seeding(lambda: False, engine=engine, version=1, force=False)
+    assert seeded_version(engine) is None
+
+    calls = []
+    run_startup_seeding(lambda: calls.append("a"), engine=engine, version=1, force=False)
+    assert calls == ["a"]
+    assert seeded_version(engine) == 1
+
+
+def test_missing_table_reads_as_unseeded(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+    assert seeded_version(engine) is None
+
+
+def test_lock_timeout_skips_seeding(tmp_path, monkeypatch):
+    from contextlib import contextmanager
+
+    import app.seeders.startup_seeder as startup_seeder
+
+    @contextmanager
+    def held_elsewhere(engine):
+        yield False
+
+    monkeypatch.setattr(startup_seeder, "seed_lock", held_elsewhere)
+    engine = make_engine(tmp_path)
+    calls = []
+
+    assert not run_startup_seeding(lambda: calls.append("a"), engine=engine, version=1, force=False)
+    assert calls == []
+    assert seeded_version(engine) is None
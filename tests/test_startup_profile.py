@@ -0,0 +1,45 @@
+# tests/test_startup_profile.py
+"""
+Import-time profile parsing, and the heavy clients (boto3, fastapi_mail)
+staying out of the import graph until first use.
+"""
+import subprocess
+import sys
+
+from benchmarks.startup_profile import area_of, by_area, parse_importtime
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       900 |       1500 |     botocore.client
+import time:       300 |       1800 |   boto3
+import time:        50 |         50 |     app.routes.leave_routes
+import time:        70 |       1920 | app.main
+"""
+
+
+def test_parse_importtime():
+    records = parse_importtime(SAMPLE)
+
+    assert [record.module for record in records] == [
+        "_io", "botocore.client", "boto3", "app.routes.leave_routes", "app.main",
+    ]
+    assert records[1].self_us == 900 and records[1].cumulative_us == 1500
+    assert records[1].depth == 2 and records[-1].depth == 0
+
+
+def test_areas():
+    assert area_of("app.routes.leave_routes") == "app.routes"
+    assert area_of("botocore.client") == "botocore"
+    assert by_area(parse_importtime(SAMPLE))["botocore"] == 900
+
+
+def test_heavy_clients_not_imported_at_startup():
+    code = (
+        "import sys, app.config, app.s3_helper; "
+        "print(sorted(m for m in ('boto3', 'botocore', 'fastapi_mail') if m in sys.modules))"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == "[]"